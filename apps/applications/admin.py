@@ -1,6 +1,11 @@
-from django.contrib import admin
-from django.utils.translation import gettext_lazy as _
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.db import transaction
+from django.template.response import TemplateResponse
+from django.utils.decorators import method_decorator
+from django.utils.translation import gettext_lazy as _, ngettext
 from apps.applications import models, forms
+from apps.applications.services import migrate_applications_plan
 
 
 @admin.register(models.Plan)
@@ -9,6 +14,38 @@ class PlanAdmin(admin.ModelAdmin):
     ordering = ['price', ]
     search_fields = ('pk', 'name',)
     list_display = ('name', 'price', 'active')
+    actions = ('migrate_applications',)
+
+    # Out of the request transaction, in which the migration would commit its chunks as
+    # savepoints, holding the locks of every chunk until the end of the request
+    @method_decorator(transaction.non_atomic_requests)
+    def changelist_view(self, request, extra_context=None):
+        return super().changelist_view(request, extra_context)
+
+    @admin.action(description=_('Migrate applications to another plan'))
+    def migrate_applications(self, request, queryset):
+        form = forms.PlanMigrationForm(request.POST if 'apply' in request.POST else None)
+        applications = models.Application.objects.filter(plan__in=queryset)
+
+        if form.is_bound and form.is_valid():
+            migrated = migrate_applications_plan(applications, form.cleaned_data['plan'])
+            self.message_user(request, ngettext(
+                '%d application was migrated.',
+                '%d applications were migrated.',
+                migrated,
+            ) % migrated, messages.SUCCESS)
+            return None
+
+        context = dict(
+            self.admin_site.each_context(request),
+            title=_('Migrate applications to another plan'),
+            opts=self.model._meta,
+            queryset=queryset,
+            applications=applications.count(),
+            form=form,
+            action_checkbox_name=helpers.ACTION_CHECKBOX_NAME,
+        )
+        return TemplateResponse(request, 'admin/applications/plan/migrate_applications.html', context)
 
 
 @admin.register(models.Application)
@@ -19,7 +56,8 @@ class ApplicationAdmin(admin.ModelAdmin):
     list_filter = ('user',)
 
     def price(self, obj):
-        return obj.plan.price if obj.plan else 'Free'
+        plan = obj.get_plan()
+        return plan.price if plan else 'Free'
 
     price.name = _('Price')
 
@@ -0,0 +1,22 @@
+from django.utils.translation import gettext_lazy as _
+from django_filters import rest_framework as filters
+
+from ..models import SubscriptionHistory
+
+
+class SubscriptionHistoryFilterSet(filters.FilterSet):
+    # Bounds on created_at, the partition column, so only the matching months are read
+    since = filters.IsoDateTimeFilter(
+        field_name='created_at',
+        lookup_expr='gte',
+        help_text=_('Histories created at or after this date and time.'),
+    )
+    until = filters.IsoDateTimeFilter(
+        field_name='created_at',
+        lookup_expr='lt',
+        help_text=_('Histories created before this date and time.'),
+    )
+
+    class Meta:
+        model = SubscriptionHistory
+        fields = ('since', 'until', 'action_type')
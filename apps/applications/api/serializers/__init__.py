@@ -1,3 +1,9 @@
-from .plan_serializers import PlanSerializer, SimplePlanSerializer
-from .application_serializers import ApplicationSerializer
+from .plan_serializers import PlanSerializer, SimplePlanSerializer, PlanMigrationSerializer
+from .application_serializers import ApplicationSerializer, ApplicationBulkSerializer
 from .subscription_history import SubscriptionHistorySerializer
+from .analytics import (
+    AnalyticsQuerySerializer,
+    AnalyticsSummarySerializer,
+    PlanTotalsSerializer,
+    SubscriptionRollupSerializer,
+)
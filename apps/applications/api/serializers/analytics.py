@@ -0,0 +1,80 @@
+import datetime
+
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from ...constants import ANALYTICS_DEFAULT_DAYS, ANALYTICS_MAX_DAYS
+from ...models import Plan, SubscriptionRollup
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    since = serializers.DateField(required=False, help_text=f'First day, {ANALYTICS_DEFAULT_DAYS} days ago by default.')
+    until = serializers.DateField(required=False, help_text='Last day, today by default.')
+    plan = serializers.UUIDField(required=False, help_text='Only the rollups of this plan.')
+
+    def validate(self, attrs):
+        until = attrs.setdefault('until', timezone.localdate())
+        since = attrs.setdefault('since', until - datetime.timedelta(days=ANALYTICS_DEFAULT_DAYS))
+
+        if since > until:
+            raise serializers.ValidationError({'since': _('Must not be after until.')})
+        if (until - since).days >= ANALYTICS_MAX_DAYS:
+            raise serializers.ValidationError({'since': _('At most %d days can be requested.') % ANALYTICS_MAX_DAYS})
+
+        return attrs
+
+
+class PlanNameMixin:
+    @property
+    def plan_names(self):
+        # Deleted plans are not in the catalog, looking them up one by one would reload it
+        if 'plan_names' not in self.context:
+            self.context['plan_names'] = {plan.pk: plan.name for plan in Plan.catalog.all()}
+        return self.context['plan_names']
+
+    def get_plan_name(self, obj):
+        return self.plan_names.get(obj['plan'] if isinstance(obj, dict) else obj.plan_id)
+
+
+class SubscriptionRollupSerializer(PlanNameMixin, serializers.ModelSerializer):
+    plan = serializers.UUIDField(source='plan_id')
+    plan_name = serializers.SerializerMethodField()
+    total_subscribers = serializers.IntegerField(help_text='Subscribers at the end of the day.')
+    total_revenue = serializers.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        help_text='Monthly recurring revenue at the end of the day.',
+    )
+
+    class Meta:
+        model = SubscriptionRollup
+        fields = (
+            'day',
+            'plan',
+            'plan_name',
+            'subscribes',
+            'unsubscribes',
+            'upgrades',
+            'downgrades',
+            'switches',
+            'subscribers',
+            'revenue',
+            'total_subscribers',
+            'total_revenue',
+        )
+        read_only_fields = fields
+
+
+class PlanTotalsSerializer(PlanNameMixin, serializers.Serializer):
+    plan = serializers.UUIDField()
+    plan_name = serializers.SerializerMethodField()
+    subscribers = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class AnalyticsSummarySerializer(serializers.Serializer):
+    day = serializers.DateField()
+    subscribers = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    plans = PlanTotalsSerializer(many=True)
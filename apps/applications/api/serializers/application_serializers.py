@@ -1,9 +1,16 @@
+import uuid
+
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from apps.users.api.serializers import SimpleUserSerializer
 from core.serializers import FormSerializerMixin
 from .plan_serializers import SimplePlanSerializer
 from ... import forms
+from ...models import Plan
+from ...services import build_subscription_history, record_subscription_histories
 
 
 class ApplicationSerializer(FormSerializerMixin, serializers.ModelSerializer):
@@ -33,13 +40,158 @@ class ApplicationSerializer(FormSerializerMixin, serializers.ModelSerializer):
             data.update({'user': self.user})
         return super().get_form(data=data, files=files, **kwargs)
 
+    @cached_property
+    def user_serializer(self):
+        # Built once and reused for every row of a list
+        return SimpleUserSerializer()
+
+    @cached_property
+    def plan_serializer(self):
+        return SimplePlanSerializer()
+
+    @cached_property
+    def plan_representations(self):
+        # Apps of a list share a handful of plans, each one is rendered once
+        return dict()
+
+    def get_plan_representation(self, instance):
+        plan = instance.get_plan()
+        if plan is None:
+            return self.plan_serializer.get_initial()
+
+        if plan.pk not in self.plan_representations:
+            self.plan_representations[plan.pk] = self.plan_serializer.to_representation(plan)
+        return dict(self.plan_representations[plan.pk])
+
     def to_representation(self, instance):
         rep = super().to_representation(instance)
 
         if self.is_requested_field('user'):
-            rep['user'] = SimpleUserSerializer(instance=instance.user).data
+            rep['user'] = self.user_serializer.to_representation(instance.user)
 
         if self.is_requested_field('plan'):
-            rep['plan'] = SimplePlanSerializer(instance=instance.plan).data
+            rep['plan'] = self.get_plan_representation(instance)
 
         return rep
+
+
+class ApplicationBulkSerializer(serializers.BaseSerializer):
+    """
+    Creates and updates a list of applications at once. Items with an `id` update that
+    application, the others are created. Applications and plans are fetched with one
+    query each, rows are written with bulk_create/bulk_update and their subscription
+    histories in one more insert.
+
+    Nothing is saved unless every item is valid; errors are returned as a list in the
+    request order, with an empty dict for valid items.
+    """
+    form = forms.ApplicationBulkForm
+    model = forms.ApplicationBulkForm.Meta.model
+    max_items = 500
+
+    default_error_messages = {
+        'not_a_list': _('Expected a list of items but got type "{input_type}".'),
+        'empty': _('This list may not be empty.'),
+        'max_items': _('Ensure this list has at most {max_items} items.'),
+        'not_a_dict': _('Expected a dictionary of items but got type "{input_type}".'),
+        'invalid_pk': _('“{value}” is not a valid UUID.'),
+        'does_not_exist': _('Application “{value}” does not exist.'),
+        'invalid_plan': _('Select a valid choice. That choice is not one of the available choices.'),
+    }
+
+    def __init__(self, *args, **kwargs):
+        self.user = kwargs.pop('user') if 'user' in kwargs else None
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def get_pk(value):
+        """ Accepts a pk or a nested object, like FormSerializerMixin.normalize_data. """
+        if isinstance(value, dict):
+            value = next((value[k] for k in FormSerializerMixin.pk_possible_keys if value.get(k)), None)
+        return uuid.UUID(str(value)) if value else None
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not data:
+            self.fail('empty')
+        if len(data) > self.max_items:
+            self.fail('max_items', max_items=self.max_items)
+
+        errors = [dict() for _ in data]
+        app_ids, plan_ids = list(), list()
+        for i, item in enumerate(data):
+            if not isinstance(item, dict):
+                errors[i]['non_field_errors'] = [
+                    self.error_messages['not_a_dict'].format(input_type=type(item).__name__)
+                ]
+                app_ids.append(None)
+                plan_ids.append(None)
+                continue
+
+            for field_name, ids in (('id', app_ids), ('plan', plan_ids)):
+                try:
+                    ids.append(self.get_pk(item.get(field_name)))
+                except ValueError:
+                    ids.append(None)
+                    errors[i][field_name] = [self.error_messages['invalid_pk'].format(value=item[field_name])]
+
+        applications = self.model.objects.in_bulk([pk for pk in app_ids if pk])
+        old_plan_ids = [a.plan_id for a in applications.values() if a.plan_id]
+        self.plans = Plan.objects.in_bulk({pk for pk in plan_ids + old_plan_ids if pk})
+
+        items = list()
+        for i, (item, app_id, plan_id) in enumerate(zip(data, app_ids, plan_ids)):
+            if errors[i]:
+                continue
+
+            if app_id and app_id not in applications:
+                errors[i]['id'] = [self.error_messages['does_not_exist'].format(value=app_id)]
+                continue
+
+            if plan_id and plan_id not in self.plans:
+                errors[i]['plan'] = [self.error_messages['invalid_plan']]
+
+            instance = applications[app_id] if app_id else self.model()
+            old_plan_id = instance.plan_id
+
+            form = self.form(data=item, instance=instance)
+            if not form.is_valid():
+                errors[i].update(form.errors)
+            if errors[i]:
+                continue
+
+            instance.plan = self.plans[plan_id] if plan_id else None
+            instance.user = self.user
+            items.append((instance, old_plan_id, app_id is None))
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return items
+
+    def save(self, **_):
+        assert hasattr(self, '_validated_data'), 'You must call `.is_valid()` before calling `.save()`.'
+
+        created = [app for app, _, is_new in self.validated_data if is_new]
+        updated = [app for app, _, is_new in self.validated_data if not is_new]
+
+        if created:
+            self.model.objects.bulk_create(created)
+
+        if updated:
+            # bulk_update() does not run auto_now
+            now = timezone.now()
+            for app in updated:
+                app.updated_at = now
+            fields = self.form.Meta.fields + ('plan', 'user', 'updated_at')
+            self.model.objects.bulk_update(updated, fields=fields)
+
+        histories = (
+            build_subscription_history(app.pk, old_plan_id, self.plans.get(old_plan_id), app.plan)
+            for app, old_plan_id, _ in self.validated_data
+        )
+        record_subscription_histories(h for h in histories if h is not None)
+
+        self.instance = [app for app, _, _ in self.validated_data]
+        return self.instance
@@ -23,3 +23,11 @@ class PlanSerializer(SimplePlanSerializer):
             'created_at',
             'updated_at',
         )
+
+
+class PlanMigrationSerializer(serializers.Serializer):
+    plan = serializers.PrimaryKeyRelatedField(
+        queryset=forms.PlanForm.Meta.model.objects.get_queryset(),
+        allow_null=True,
+        help_text='Plan the applications move to, null to unsubscribe them.',
+    )
@@ -6,6 +6,7 @@ router = routers.DefaultRouter()
 
 router.register('plans', viewsets.PlanViewSet)
 router.register('apps', viewsets.ApplicationViewSet)
+router.register('analytics', viewsets.AnalyticsViewSet, basename='analytics')
 
 app_router = routers.NestedSimpleRouter(parent_router=router, parent_prefix='apps', lookup='app')
 app_router.register(r'subscriptions', viewsets.SubscriptionHistoryViewSet, basename='app-subscriptions')
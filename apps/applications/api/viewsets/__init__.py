@@ -1,3 +1,4 @@
 from .plan_viewsets import PlanViewSet
 from .application_viewsets import ApplicationViewSet
 from .subscription_history_viewsets import SubscriptionHistoryViewSet
+from .analytics_viewsets import AnalyticsViewSet
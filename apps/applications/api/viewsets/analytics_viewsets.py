@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from rest_framework import authentication
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from core.viewsets import NonAtomicViewsetMixin, ReplicaReadViewsetMixin
+from .. import serializers
+from ...services import get_plan_rollups, get_plan_totals
+
+
+class AnalyticsViewSet(NonAtomicViewsetMixin, ReplicaReadViewsetMixin, GenericViewSet):
+    """
+    Subscriber counts and monthly recurring revenue per plan, read from the
+    subscription rollups only.
+    """
+    serializer_class = serializers.SubscriptionRollupSerializer
+    queryset = serializers.SubscriptionRollupSerializer.Meta.model.objects.all()
+    permission_classes = (IsAdminUser,)
+    authentication_classes = (
+        authentication.TokenAuthentication,
+        authentication.BasicAuthentication,
+        authentication.SessionAuthentication,
+    )
+    pagination_class = None
+    non_atomic_actions = ('list', 'summary')
+    replica_actions = ('list', 'summary')
+
+    def get_query_params(self):
+        serializer = serializers.AnalyticsQuerySerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def list(self, request, *args, **kwargs):
+        """
+        The daily rollups of each plan from `since` to `until`, with the subscribers
+        and revenue of the plan at the end of each day.
+        """
+        params = self.get_query_params()
+        rollups = get_plan_rollups(params['since'], params['until'], params.get('plan'))
+        return Response(self.get_serializer(rollups, many=True).data)
+
+    @action(methods=['get'], detail=False)
+    def summary(self, request, *args, **kwargs):
+        """
+        The subscribers and revenue of each plan, and in total, at the end of `until`.
+        """
+        params = self.get_query_params()
+        totals = get_plan_totals(params['until'], params.get('plan'))
+
+        plans = [
+            {'plan': plan, 'subscribers': subscribers, 'revenue': revenue}
+            for plan, (subscribers, revenue) in totals.items()
+            if subscribers or revenue
+        ]
+        summary = {
+            'day': params['until'],
+            'subscribers': sum(p['subscribers'] for p in plans),
+            'revenue': sum((p['revenue'] for p in plans), Decimal(0)),
+            'plans': sorted(plans, key=lambda p: -p['revenue']),
+        }
+        serializer = serializers.AnalyticsSummarySerializer(summary, context=self.get_serializer_context())
+        return Response(serializer.data)
@@ -1,15 +1,35 @@
-from rest_framework import authentication
+from rest_framework import authentication, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from core.viewsets import FieldRequestViewsetMixin
+from core.pagination import KeysetOrLimitOffsetPagination
+from core.viewsets import (
+    AsyncReadViewsetMixin,
+    ConditionalGetViewsetMixin,
+    FieldRequestViewsetMixin,
+    NonAtomicViewsetMixin,
+    ReplicaReadViewsetMixin,
+    StreamingExportViewsetMixin,
+)
 from .. import serializers
 
 
-class ApplicationViewSet(FieldRequestViewsetMixin, ModelViewSet):
+class ApplicationViewSet(NonAtomicViewsetMixin,
+                         ReplicaReadViewsetMixin,
+                         ConditionalGetViewsetMixin,
+                         StreamingExportViewsetMixin,
+                         FieldRequestViewsetMixin,
+                         AsyncReadViewsetMixin,
+                         ModelViewSet):
     serializer_class = serializers.ApplicationSerializer
     queryset = serializers.ApplicationSerializer.Meta.model.objects.get_queryset()
     filterset_fields = ('plan', 'active', 'plan__active',)
+    # Plans are rendered from Plan.catalog, they are not joined
+    related_fields = {
+        'user': ('user',),
+    }
     permission_classes = (IsAuthenticated,)
     authentication_classes = (
         authentication.TokenAuthentication,
@@ -17,8 +37,30 @@ class ApplicationViewSet(FieldRequestViewsetMixin, ModelViewSet):
         authentication.SessionAuthentication,
     )
     lookup_url_kwarg = 'id'
+    pagination_class = KeysetOrLimitOffsetPagination
+    cursor_ordering = ('name', 'id')
+    # The nested user and plan are rendered too, so their changes must change the ETag
+    conditional_fields = ('updated_at', 'user__updated_at', 'plan__updated_at')
+    async_actions = ('retrieve',)
+    non_atomic_actions = ('list', 'retrieve')
 
     def get_serializer(self, *args, **kwargs):
         if hasattr(self.request, 'user') and kwargs.get('many', False) is False:
             kwargs.update({'user': self.request.user})
         return super().get_serializer(*args, **kwargs)
+
+    @action(methods=['post'], detail=False)
+    def bulk(self, request, *args, **kwargs):
+        """
+        Creates or updates (items with an `id`) a list of applications in one request.
+        """
+        serializer = serializers.ApplicationBulkSerializer(
+            data=request.data,
+            user=request.user,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        applications = serializer.save()
+
+        data = self.get_serializer(applications, many=True).data
+        return Response(data, status=status.HTTP_201_CREATED)
@@ -1,12 +1,31 @@
 from rest_framework import authentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from core.viewsets import FieldRequestViewsetMixin
+from core.pagination import KeysetOrLimitOffsetPagination
+from core.viewsets import (
+    AsyncReadViewsetMixin,
+    CachedResponseViewsetMixin,
+    ConditionalGetViewsetMixin,
+    FieldRequestViewsetMixin,
+    NonAtomicViewsetMixin,
+    ReplicaReadViewsetMixin,
+)
 from .. import serializers
+from ...constants import PLAN_CACHE_NAMESPACE
+from ...models import Application
+from ...services import migrate_applications_plan
 
 
-class PlanViewSet(FieldRequestViewsetMixin, ModelViewSet):
+class PlanViewSet(NonAtomicViewsetMixin,
+                  ReplicaReadViewsetMixin,
+                  ConditionalGetViewsetMixin,
+                  CachedResponseViewsetMixin,
+                  FieldRequestViewsetMixin,
+                  AsyncReadViewsetMixin,
+                  ModelViewSet):
     serializer_class = serializers.PlanSerializer
     queryset = serializers.PlanSerializer.Meta.model.objects.get_queryset()
     permission_classes = (IsAuthenticated,)
@@ -16,3 +35,22 @@ class PlanViewSet(FieldRequestViewsetMixin, ModelViewSet):
         authentication.SessionAuthentication,
     )
     lookup_url_kwarg = 'id'
+    pagination_class = KeysetOrLimitOffsetPagination
+    cursor_ordering = ('name', 'id')
+    cache_namespace = PLAN_CACHE_NAMESPACE
+    # The migration commits chunk by chunk, reads need no transaction
+    non_atomic_actions = ('migrate', 'list', 'retrieve')
+
+    @action(methods=['post'], detail=True, permission_classes=(IsAdminUser,))
+    def migrate(self, request, *args, **kwargs):
+        """
+        Moves every application of this plan to another plan, recording their
+        subscription histories. Staff only, it changes the applications of every user.
+        """
+        source = self.get_object()
+        serializer = serializers.PlanMigrationSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+
+        queryset = Application.objects.filter(plan=source)
+        migrated = migrate_applications_plan(queryset, serializer.validated_data['plan'])
+        return Response({'migrated': migrated})
@@ -1,17 +1,31 @@
 import uuid
 
 from django.utils.translation import gettext_lazy as _
-from rest_framework import authentication, status
+from rest_framework import authentication
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
+from core.pagination import KeysetOrLimitOffsetPagination
+from core.viewsets import (
+    AsyncReadViewsetMixin,
+    NonAtomicViewsetMixin,
+    ReplicaReadViewsetMixin,
+    StreamingExportViewsetMixin,
+)
 from .. import serializers
+from ..filters import SubscriptionHistoryFilterSet
 
 
-class SubscriptionHistoryViewSet(ReadOnlyModelViewSet):
+class SubscriptionHistoryViewSet(NonAtomicViewsetMixin,
+                                 ReplicaReadViewsetMixin,
+                                 StreamingExportViewsetMixin,
+                                 AsyncReadViewsetMixin,
+                                 ReadOnlyModelViewSet):
     serializer_class = serializers.SubscriptionHistorySerializer
-    queryset = serializers.SubscriptionHistorySerializer.Meta.model.objects.get_queryset().select_related('app')
+    # The serializer renders no field of the app, it is not joined
+    queryset = serializers.SubscriptionHistorySerializer.Meta.model.objects.get_queryset().order_by('created_at', 'id')
+    filterset_class = SubscriptionHistoryFilterSet
     permission_classes = (IsAuthenticated,)
     authentication_classes = (
         authentication.TokenAuthentication,
@@ -19,19 +33,22 @@ class SubscriptionHistoryViewSet(ReadOnlyModelViewSet):
         authentication.SessionAuthentication,
     )
     lookup_url_kwarg = 'id'
+    pagination_class = KeysetOrLimitOffsetPagination
+    # Follows the (app, created_at, id) index
+    cursor_ordering = ('created_at', 'id')
+    async_actions = ('list',)
+    non_atomic_actions = ('list', 'retrieve')
 
     def get_queryset(self):
         queryset = super().get_queryset()
         app_pk = self.kwargs.get('app_id')
 
+        if not app_pk:
+            return queryset.none()
+
         try:
             uuid.UUID(app_pk)
         except ValueError:
-            content = {'detail': [_('Invalid application.')]}
-            return Response(data=content, status=status.HTTP_400_BAD_REQUEST)
-
-        if app_pk:
-            queryset = queryset.filter(app_id=app_pk)
-        else:
-            queryset = queryset.none()
-        return queryset
+            raise ValidationError({'detail': [_('Invalid application.')]})
+
+        return queryset.filter(app_id=app_pk)
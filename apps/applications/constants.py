@@ -14,3 +14,14 @@ PLAN_ACTION_TYPE_SWITCH = 'switch'
 PLAN_ACTION_TYPE_UNSUBSCRIBE = 'unsubscribe'
 PLAN_ACTION_TYPE_UPGRADE = 'upgrade'
 PLAN_ACTION_TYPE_DOWNGRADE = 'downgrade'
+
+PLAN_CACHE_NAMESPACE = 'plans'
+PLAN_CATALOG_TTL = 60
+
+HISTORY_PARTITION_COLUMN = 'created_at'
+# Ahead of the last run of create_history_partitions, which runs on every deploy, on
+# server start and daily (see .cloudbuild/create_history_partitions.yaml)
+HISTORY_PARTITION_MONTHS_AHEAD = 12
+
+ANALYTICS_DEFAULT_DAYS = 30
+ANALYTICS_MAX_DAYS = 366
@@ -1,6 +1,7 @@
 from decimal import Decimal
 
 from django import forms
+from django.utils.translation import gettext_lazy as _
 
 from apps.applications import models
 
@@ -31,3 +32,25 @@ class ApplicationForm(forms.ModelForm):
             'plan',
             'user',
         )
+
+
+class ApplicationBulkForm(ApplicationForm):
+    """
+    ApplicationForm for bulk writes. Foreign keys are resolved by the caller for the
+    whole batch instead of one query per form.
+    """
+    class Meta(ApplicationForm.Meta):
+        fields = tuple(f for f in ApplicationForm.Meta.fields if f not in ('plan', 'user'))
+
+    def validate_unique(self):
+        # The only unique field is the generated uuid4 primary key
+        pass
+
+
+class PlanMigrationForm(forms.Form):
+    plan = forms.ModelChoiceField(
+        queryset=models.Plan.objects.get_queryset(),
+        required=False,
+        empty_label=_('No plan (unsubscribe)'),
+        label=_('New plan'),
+    )
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from core.db.partitioning import add_months, create_monthly_partitions, is_partitioned
+from ...constants import HISTORY_PARTITION_COLUMN, HISTORY_PARTITION_MONTHS_AHEAD
+from ...models import SubscriptionHistory
+
+
+class Command(BaseCommand):
+    help = (
+        'Creates the monthly partitions of the subscription history table up to the given '
+        'number of months ahead. Safe to run repeatedly. Run it at least monthly, e.g. '
+        'daily, the rows past the last partition going to the DEFAULT partition.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=HISTORY_PARTITION_MONTHS_AHEAD,
+            help='Number of months after the current one to create partitions for.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to create the partitions in.')
+
+    def handle(self, *args, months, database, verbosity, **options):
+        table = SubscriptionHistory._meta.db_table
+
+        if connections[database].vendor != 'postgresql' or not is_partitioned(table, using=database):
+            if verbosity:
+                self.stdout.write(f'{table} is not partitioned, nothing to do.')
+            return
+
+        today = timezone.now().date()
+        created = create_monthly_partitions(
+            table,
+            HISTORY_PARTITION_COLUMN,
+            since=today,
+            until=add_months(today, months),
+            using=database,
+        )
+
+        if verbosity:
+            for name in created:
+                self.stdout.write(self.style.SUCCESS(f'Created {name}'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from ...services import rebuild_subscription_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the subscription rollups from the subscription histories and the current '
+        'applications. New changes wait until the rollups are rebuilt.'
+    )
+
+    def handle(self, *args, verbosity, **options):
+        written = rebuild_subscription_rollups()
+
+        if verbosity:
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} subscription rollups'))
@@ -0,0 +1,74 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection
+
+from ...services import SeedDataset, load_seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds the database with generated users, plans, applications and subscription histories, '
+        'consistent with each other and the same for the same seed, loaded with COPY. '
+        'For local environments and benchmarks; the tables are locked during the load.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='Number of users.')
+        parser.add_argument('--applications', type=int, default=100000, help='Number of applications.')
+        parser.add_argument('--histories', type=int, default=1000000, help='Number of subscription histories.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated rows.')
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Empty the users, plans, applications, histories and rollups tables first, '
+                 'with the rows referencing them (tokens, sessions, admin log, ...).',
+        )
+        parser.add_argument(
+            '--noinput',
+            '--no-input',
+            action='store_false',
+            dest='interactive',
+            help='Do not ask to confirm --clear.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Allow --clear with DEBUG off.',
+        )
+
+    def handle(self, *args, users, applications, histories, seed, clear, interactive, force, verbosity, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Seeding with COPY needs PostgreSQL.')
+        if histories and not applications or applications and not users:
+            raise CommandError('Histories need applications, and applications need users.')
+        if clear and not self.confirm_clear(interactive, force):
+            raise CommandError('Seeding cancelled.')
+
+        started = time.monotonic()
+        dataset = SeedDataset(seed, users=users, applications=applications, histories=histories)
+        try:
+            loaded = load_seed_dataset(dataset, clear=clear)
+        except IntegrityError as e:
+            raise CommandError(f'{e}\nRows of this seed may be in the database already, see --clear.')
+
+        if verbosity:
+            for table, count in loaded.items():
+                self.stdout.write(f'{table}: {count} rows')
+            self.stdout.write(self.style.SUCCESS(f'Seeded in {time.monotonic() - started:.1f} s'))
+
+    def confirm_clear(self, interactive, force):
+        if not settings.DEBUG and not force:
+            raise CommandError('--clear empties the users tables, it needs DEBUG on or --force.')
+        if not interactive:
+            return True
+
+        confirm = input(
+            f'You have requested to clear the "{connection.settings_dict["NAME"]}" database before seeding.\n'
+            'This will IRREVERSIBLY DESTROY every user, plan, application and subscription history,\n'
+            'and the rows referencing them.\n'
+            'Are you sure you want to do this?\n\n'
+            "    Type 'yes' to continue, or 'no' to cancel: "
+        )
+        return confirm == 'yes'
@@ -0,0 +1,21 @@
+# Generated by Django 4.1.13 on 2026-10-18 08:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['name', 'id'], name='application_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(fields=['name', 'id'], name='plan_name_id_idx'),
+        ),
+    ]
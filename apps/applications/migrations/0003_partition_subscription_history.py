@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from core.db.partitioning import partition_table, unpartition_table
+
+PARTITION_COLUMN = 'created_at'
+
+
+def partition_subscription_history(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    partition_table(schema_editor, apps.get_model('applications', 'SubscriptionHistory'), PARTITION_COLUMN)
+
+
+def unpartition_subscription_history(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    unpartition_table(schema_editor, apps.get_model('applications', 'SubscriptionHistory'), PARTITION_COLUMN)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_name_id_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_subscription_history, unpartition_subscription_history),
+    ]
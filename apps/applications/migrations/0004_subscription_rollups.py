@@ -0,0 +1,52 @@
+# Generated by Django 4.1.13 on 2026-10-18 09:04
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_partition_subscription_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubscriptionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('plan_id', models.UUIDField(verbose_name='plan')),
+                ('day', models.DateField(verbose_name='day')),
+                ('subscribes', models.PositiveIntegerField(default=0, verbose_name='subscribes')),
+                ('unsubscribes', models.PositiveIntegerField(default=0, verbose_name='unsubscribes')),
+                ('upgrades', models.PositiveIntegerField(default=0, verbose_name='upgrades')),
+                ('downgrades', models.PositiveIntegerField(default=0, verbose_name='downgrades')),
+                ('switches', models.PositiveIntegerField(default=0, verbose_name='switches')),
+                ('subscribers', models.IntegerField(default=0, verbose_name='subscribers change')),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=14, verbose_name='monthly recurring revenue change')),
+            ],
+            options={
+                'verbose_name': 'subscription rollup',
+                'verbose_name_plural': 'subscription rollups',
+                'ordering': ['day', 'plan_id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='subscriptionhistory',
+            name='current_plan_id',
+            field=models.UUIDField(blank=True, editable=False, null=True, verbose_name='current plan'),
+        ),
+        migrations.AddField(
+            model_name='subscriptionhistory',
+            name='old_plan_id',
+            field=models.UUIDField(blank=True, editable=False, null=True, verbose_name='old plan'),
+        ),
+        migrations.AddIndex(
+            model_name='subscriptionrollup',
+            index=models.Index(fields=['day', 'plan_id'], name='subscription_rollup_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='subscriptionrollup',
+            constraint=models.UniqueConstraint(fields=('plan_id', 'day'), name='subscription_rollup_plan_day_uniq'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.1.13 on 2026-10-18 09:07
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_subscription_rollups'),
+    ]
+
+    operations = [
+        # Only the index is dropped, AlterField would also drop and validate again the
+        # foreign key constraint
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='subscriptionhistory',
+                    name='app',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='histories', to='applications.application', verbose_name='application'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    'DROP INDEX IF EXISTS "applications_subscriptionhistory_app_id_5ceb6764"',
+                    'CREATE INDEX "applications_subscriptionhistory_app_id_5ceb6764" '
+                    'ON "applications_subscriptionhistory" ("app_id")',
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='subscriptionhistory',
+            index=models.Index(fields=['app', 'created_at', 'id'], name='history_app_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscriptionhistory',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='history_created_brin'),
+        ),
+    ]
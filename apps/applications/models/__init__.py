@@ -1,3 +1,4 @@
 from .plan import Plan
 from .application import Application
 from .subscription_history import SubscriptionHistory
+from .subscription_rollup import SubscriptionRollup
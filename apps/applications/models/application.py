@@ -4,6 +4,7 @@ from django.utils.translation import gettext_lazy as _
 
 from core.models import mixins, track_data
 from ..enums import AppType, AppFramework
+from .plan import Plan
 
 
 @track_data('plan_id')
@@ -21,6 +22,10 @@ class Application(mixins.UUIDPkMixin,
         verbose_name = _('application')
         verbose_name_plural = _('applications')
         ordering = ['name']
+        indexes = [
+            # Keyset pagination position, see core.pagination.KeysetPagination
+            models.Index(fields=['name', 'id'], name='application_name_id_idx'),
+        ]
 
     name = models.CharField(
         max_length=50,
@@ -86,9 +91,22 @@ class Application(mixins.UUIDPkMixin,
 
     @property
     def free(self) -> bool:
-        if not self.plan_id:
+        plan = self.get_plan()
+        if plan is None:
             return True
-        return not self.plan.price
+        return not plan.price
+
+    def get_plan(self):
+        """
+        The plan of the app as an entry of the plan catalog, i.e. a read-only named tuple
+        of the `Plan.catalog` fields, or None. A plan that is already loaded is used
+        instead of the catalog.
+        """
+        if not self.plan_id:
+            return None
+        if type(self).plan.is_cached(self):
+            return Plan.catalog.make_entry(self.plan)
+        return Plan.catalog.get(self.plan_id)
 
     def __str__(self):
         return self.name
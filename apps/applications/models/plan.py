@@ -3,9 +3,12 @@ from decimal import Decimal
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from core.models import mixins
+from core.cache import LocalCatalog
+from core.models import mixins, track_data
+from ..constants import PLAN_CATALOG_TTL
 
 
+@track_data('price')
 class Plan(mixins.UUIDPkMixin,
            mixins.ActivableMixin,
            mixins.DateTimeManagementMixin,
@@ -20,6 +23,10 @@ class Plan(mixins.UUIDPkMixin,
         verbose_name = _('plan')
         verbose_name_plural = _('plans')
         ordering = ['name']
+        indexes = [
+            # Keyset pagination position, see core.pagination.KeysetPagination
+            models.Index(fields=['name', 'id'], name='plan_name_id_idx'),
+        ]
 
     name = models.CharField(
         max_length=50,
@@ -43,6 +50,9 @@ class Plan(mixins.UUIDPkMixin,
         verbose_name=_('price'),
     )
 
+    # Read-only copy of the plans kept by each process, see signals.plan for invalidation
+    catalog = LocalCatalog(fields=('id', 'name', 'price', 'active'), ttl=PLAN_CATALOG_TTL)
+
     def clean(self):
         self.price = self.price if self.price >= 0 else Decimal(0)
         super().clean()
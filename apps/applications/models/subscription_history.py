@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -29,7 +30,12 @@ class SubscriptionHistory(mixins.UUIDPkMixin, mixins.DomainRuleMixin, models.Mod
         verbose_name = _('subscription history')
         verbose_name_plural = _('subscription histories')
         ordering = ['created_at']
-
+        indexes = [
+            # The history of an app by date, also used for keyset pagination
+            models.Index(fields=['app', 'created_at', 'id'], name='history_app_created_idx'),
+            # Tiny index for scans by date across apps, rows are inserted in created_at order
+            BrinIndex(fields=['created_at'], name='history_created_brin'),
+        ]
 
     app = models.ForeignKey(
         'applications.application',
@@ -38,6 +44,23 @@ class SubscriptionHistory(mixins.UUIDPkMixin, mixins.DomainRuleMixin, models.Mod
         null=False,
         on_delete=models.CASCADE,
         related_name='histories',
+        # Covered by the (app, created_at, id) index
+        db_index=False,
+    )
+
+    # Plain ids rather than foreign keys, the history outlives the plans
+    old_plan_id = models.UUIDField(
+        verbose_name=_('old plan'),
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    current_plan_id = models.UUIDField(
+        verbose_name=_('current plan'),
+        null=True,
+        blank=True,
+        editable=False,
     )
 
     old_plan_name = models.CharField(
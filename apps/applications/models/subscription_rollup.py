@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SubscriptionRollup(models.Model):
+    """
+    Daily changes of the subscriptions of a plan, maintained as subscription histories
+    are recorded (see services.subscription_rollup). Counters hold the events of the
+    day, `subscribers` and `revenue` the net change of the subscriber count and of the
+    monthly recurring revenue, so their running sum gives the value at any day.
+
+    The plan is stored by id, not as a foreign key, so the rollups of deleted plans
+    are kept.
+    """
+
+    class Meta:
+        verbose_name = _('subscription rollup')
+        verbose_name_plural = _('subscription rollups')
+        ordering = ['day', 'plan_id']
+        constraints = [
+            models.UniqueConstraint(fields=['plan_id', 'day'], name='subscription_rollup_plan_day_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'plan_id'], name='subscription_rollup_day_idx'),
+        ]
+
+    plan_id = models.UUIDField(
+        verbose_name=_('plan'),
+        null=False,
+        blank=False,
+    )
+
+    day = models.DateField(
+        verbose_name=_('day'),
+        null=False,
+        blank=False,
+    )
+
+    subscribes = models.PositiveIntegerField(verbose_name=_('subscribes'), default=0)
+    unsubscribes = models.PositiveIntegerField(verbose_name=_('unsubscribes'), default=0)
+    upgrades = models.PositiveIntegerField(verbose_name=_('upgrades'), default=0)
+    downgrades = models.PositiveIntegerField(verbose_name=_('downgrades'), default=0)
+    switches = models.PositiveIntegerField(verbose_name=_('switches'), default=0)
+
+    subscribers = models.IntegerField(
+        verbose_name=_('subscribers change'),
+        default=0,
+    )
+
+    revenue = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        verbose_name=_('monthly recurring revenue change'),
+        default=Decimal(0),
+    )
+
+    def __str__(self):
+        return f'{self.plan_id} {self.day}'
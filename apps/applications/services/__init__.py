@@ -0,0 +1,12 @@
+from .subscription_rollup import (  # noqa
+    apply_rollup_deltas,
+    get_plan_rollups,
+    get_plan_totals,
+    get_rollup_deltas,
+    rebuild_subscription_rollups,
+    record_plan_price_change,
+    update_subscription_rollups,
+)
+from .subscription_history import build_subscription_history, record_subscription_histories  # noqa
+from .plan_migration import migrate_applications_plan  # noqa
+from .bulk_seeding import SeedDataset, load_seed_dataset  # noqa
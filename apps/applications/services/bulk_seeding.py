@@ -0,0 +1,227 @@
+import datetime
+import random
+from decimal import Decimal
+from itertools import islice
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+
+from core.db.bulk_load import copy_rows, deferred_indexes_and_foreign_keys
+from core.db.partitioning import create_monthly_partitions, is_partitioned
+from ..constants import HISTORY_PARTITION_COLUMN
+from ..enums import AppFramework, AppType, PlanActionType
+from ..models import Application, Plan, SubscriptionHistory, SubscriptionRollup
+from .subscription_rollup import apply_rollup_deltas, get_rollup_deltas
+
+COPY_CHUNK_SIZE = 50000
+
+# The seeds end here rather than when they are loaded, so that a seed always gives the same rows
+SEED_END = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+# Users join over the year before the first application, applications are created and
+# change plans over the last one, as (most, least) days before SEED_END
+SEED_USER_DAYS = (730, 400)
+SEED_APPLICATION_DAYS = (395, 1)
+
+SEED_PLAN_TIERS = (
+    ('Free', 0), ('Starter', 5), ('Basic', 10), ('Standard', 20), ('Plus', 35),
+    ('Pro', 50), ('Team', 100), ('Business', 250), ('Scale', 500), ('Enterprise', 1000),
+)
+# Part of the applications left without a plan, unsubscribed after at least two histories
+SEED_UNSUBSCRIBED = 0.05
+
+SEED_FIRST_NAMES = ('Ana', 'Ben', 'Chloe', 'David', 'Emma', 'Felix', 'Grace', 'Hugo', 'Iris', 'Jon')
+SEED_LAST_NAMES = ('Garcia', 'Smith', 'Muller', 'Rossi', 'Dubois', 'Silva', 'Kowalski', 'Jensen', 'Novak', 'Tanaka')
+SEED_APP_WORDS = ('Task', 'Shop', 'Chat', 'Fit', 'Note', 'Pay', 'Photo', 'Travel', 'Recipe', 'Budget')
+
+
+def _random_uuid(rng) -> str:
+    # The text of a version 4 UUID, without building a UUID, the cost of millions of ids
+    value = rng.getrandbits(128) & ~(0xf000 << 64 | 0xc000 << 48) | (0x4000 << 64 | 0x8000 << 48)
+    text = '%032x' % value
+    return f'{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}'
+
+
+def _random_datetime(rng, days) -> datetime.datetime:
+    most, least = days
+    return SEED_END - datetime.timedelta(seconds=rng.uniform(least * 86400, most * 86400))
+
+
+class SeedDataset:
+    """
+    Users, plans, the applications of the users and the subscription histories of the
+    applications, consistent with each other: the last history of an application leaves
+    it on its plan, applications without histories have no plan. The rows are the same
+    for the same seed and volumes, each table being generated by a random generator of
+    its own.
+    """
+
+    def __init__(self, seed: int = 0, users: int = 10000, applications: int = 100000, histories: int = 1000000):
+        self.seed = seed
+        self.volumes = {'users': users, 'applications': applications, 'histories': histories}
+
+        rng = self.get_random('ids')
+        self.user_ids = [_random_uuid(rng) for _ in range(users)]
+        self.plans = [
+            (_random_uuid(rng), f'{tier} {period}', Decimal(price * months).quantize(Decimal('0.01')))
+            for period, months in (('Monthly', 1), ('Yearly', 10))
+            for tier, price in SEED_PLAN_TIERS
+        ]
+        self.application_ids = [_random_uuid(rng) for _ in range(applications)]
+        self.application_dates = [_random_datetime(rng, SEED_APPLICATION_DAYS) for _ in range(applications)]
+
+        base, extra = divmod(histories, applications) if applications else (0, 0)
+        self.history_counts = [base + (index < extra) for index in range(applications)]
+        self.application_plans = [
+            None if not count or (count >= 2 and rng.random() < SEED_UNSUBSCRIBED) else rng.randrange(len(self.plans))
+            for count in self.history_counts
+        ]
+
+    def get_random(self, name: str) -> random.Random:
+        # String seeds do not depend on PYTHONHASHSEED
+        return random.Random(f'{self.seed}:{name}')
+
+    def get_tables(self) -> list:
+        """ [(model, rows)], the rows being iterators of {attname: value} """
+        return [
+            (get_user_model(), self.get_users()),
+            (Plan, self.get_plans()),
+            (Application, self.get_applications()),
+            (SubscriptionHistory, self.get_histories()),
+        ]
+
+    def get_users(self):
+        rng = self.get_random('users')
+        for index, user_id in enumerate(self.user_ids):
+            first_name, last_name = rng.choice(SEED_FIRST_NAMES), rng.choice(SEED_LAST_NAMES)
+            date_joined = _random_datetime(rng, SEED_USER_DAYS)
+            yield {
+                'id': user_id,
+                'password': '!',
+                'last_login': None,
+                'is_superuser': False,
+                'username': f'user{index}',
+                'first_name': first_name,
+                'last_name': last_name,
+                'email': f'user{index}@example.com',
+                'is_staff': False,
+                'is_active': True,
+                'date_joined': date_joined,
+                'updated_at': date_joined,
+            }
+
+    def get_plans(self):
+        rng = self.get_random('plans')
+        for plan_id, name, price in self.plans:
+            created_at = _random_datetime(rng, SEED_USER_DAYS)
+            yield {
+                'id': plan_id,
+                'active': True,
+                'created_at': created_at,
+                'updated_at': created_at,
+                'name': name,
+                'description': f'{name} plan, billed {price} per period',
+                'price': price,
+            }
+
+    def get_applications(self):
+        rng = self.get_random('applications')
+        applications = zip(self.application_ids, self.application_dates, self.application_plans)
+        for index, (app_id, created_at, plan) in enumerate(applications):
+            domain_name = f'app-{index}.example.com'
+            yield {
+                'id': app_id,
+                'active': True,
+                'created_at': created_at,
+                'updated_at': created_at,
+                'name': f'{rng.choice(SEED_APP_WORDS)} {rng.choice(SEED_APP_WORDS)} {index}',
+                'description': f'Application {index}',
+                'type': rng.choice(AppType.values),
+                'framework': rng.choice(AppFramework.values),
+                'domain_name': domain_name,
+                'screenshot': f'https://{domain_name}/screenshot.png',
+                'user_id': self.user_ids[rng.randrange(len(self.user_ids))],
+                'plan_id': self.plans[plan][0] if plan is not None else None,
+            }
+
+    def get_histories(self):
+        rng = self.get_random('histories')
+        no_plan = (None, None, None)
+        applications = zip(self.application_ids, self.application_dates, self.history_counts, self.application_plans)
+        for app_id, app_created_at, count, last_plan in applications:
+            # Plans the application went through backwards, a different one each time
+            plans = [last_plan]
+            for _ in range(count - 1):
+                plan = rng.randrange(len(self.plans) - (plans[-1] is not None))
+                plans.append(plan + 1 if plans[-1] is not None and plan >= plans[-1] else plan)
+            plans.reverse()
+
+            since = (SEED_END - app_created_at).total_seconds() / 86400
+            dates = sorted(_random_datetime(rng, (since, 0)) for _ in range(count))
+
+            old_plan = no_plan
+            for plan, created_at in zip(plans, dates):
+                current_plan = self.plans[plan] if plan is not None else no_plan
+                if plan is None:
+                    action_type = PlanActionType.UNSUBSCRIBE
+                elif old_plan is no_plan:
+                    action_type = PlanActionType.SUBSCRIBE
+                elif current_plan[2] > old_plan[2]:
+                    action_type = PlanActionType.UPGRADE
+                elif current_plan[2] < old_plan[2]:
+                    action_type = PlanActionType.DOWNGRADE
+                else:
+                    action_type = PlanActionType.SWITCH
+
+                yield {
+                    'id': _random_uuid(rng),
+                    'app_id': app_id,
+                    'old_plan_id': old_plan[0],
+                    'current_plan_id': current_plan[0],
+                    'old_plan_name': old_plan[1],
+                    'current_plan_name': current_plan[1],
+                    'action_type': action_type,
+                    'old_price': old_plan[2],
+                    'current_price': current_plan[2],
+                    'created_at': created_at,
+                }
+                old_plan = current_plan
+
+
+def load_seed_dataset(dataset: SeedDataset, clear: bool = False, chunk_size: int = COPY_CHUNK_SIZE) -> dict:
+    """
+    Loads `dataset` with COPY by chunks of `chunk_size` rows, in one transaction, and
+    adds its histories to the subscription rollups. With `clear`, the seeded tables are
+    emptied first, with the rows referencing them. Their indexes and foreign keys are
+    built after the load, the tables are locked until it ends. Returns the rows loaded
+    by table.
+    """
+    tables = dataset.get_tables()
+    models = [model for model, _ in tables]
+    loaded = dict()
+    deltas = None
+
+    history_table = SubscriptionHistory._meta.db_table
+    if is_partitioned(history_table):
+        since = SEED_END - datetime.timedelta(days=SEED_APPLICATION_DAYS[0])
+        create_monthly_partitions(history_table, HISTORY_PARTITION_COLUMN, since.date(), SEED_END.date())
+
+    with transaction.atomic():
+        if clear:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'TRUNCATE {", ".join(connection.ops.quote_name(model._meta.db_table) for model in models)}, '
+                    f'{connection.ops.quote_name(SubscriptionRollup._meta.db_table)} CASCADE'
+                )
+
+        with deferred_indexes_and_foreign_keys(models):
+            for model, rows in tables:
+                loaded[model._meta.db_table] = 0
+                while chunk := list(islice(rows, chunk_size)):
+                    loaded[model._meta.db_table] += copy_rows(model, chunk)
+                    if model is SubscriptionHistory:
+                        deltas = get_rollup_deltas((SimpleNamespace(**row) for row in chunk), deltas)
+
+        apply_rollup_deltas(deltas or dict())
+
+    return loaded
@@ -0,0 +1,52 @@
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from ..models import Application, Plan
+from .subscription_history import build_subscription_history, record_subscription_histories
+
+MIGRATION_CHUNK_SIZE = 1000
+
+
+def migrate_applications_plan(queryset: QuerySet,
+                              plan: Optional[Plan],
+                              chunk_size: int = MIGRATION_CHUNK_SIZE) -> int:
+    """
+    Moves every application of `queryset` to `plan` (None unsubscribes them) and
+    records their subscription histories, without loading or saving the apps one by
+    one. Each chunk is locked, updated with a single UPDATE and its histories written
+    with a single INSERT, in its own transaction. Returns the number of apps moved.
+    """
+    plan_id = plan.pk if plan else None
+    pending = queryset.exclude(plan=plan_id).order_by('pk')
+
+    old_plans = dict()
+    migrated = 0
+    last_pk = None
+
+    while True:
+        with transaction.atomic():
+            chunk = pending.filter(pk__gt=last_pk) if last_pk else pending
+            rows = list(chunk.select_for_update(of=('self',)).values_list('pk', 'plan_id')[:chunk_size])
+            if not rows:
+                break
+
+            missing = {old_plan_id for _, old_plan_id in rows if old_plan_id and old_plan_id not in old_plans}
+            if missing:
+                old_plans.update(Plan.objects.in_bulk(missing))
+
+            app_ids = [app_id for app_id, _ in rows]
+            Application.objects.filter(pk__in=app_ids).update(plan=plan_id, updated_at=timezone.now())
+
+            histories = (
+                build_subscription_history(app_id, old_plan_id, old_plans.get(old_plan_id), plan)
+                for app_id, old_plan_id in rows
+            )
+            record_subscription_histories(h for h in histories if h is not None)
+
+        migrated += len(rows)
+        last_pk = app_ids[-1]
+
+    return migrated
@@ -0,0 +1,75 @@
+from typing import Iterable, List, Optional
+
+from ..constants import PLAN_NAME_UNKNOWN_ALIAS
+from ..enums import PlanActionType
+from ..models import Plan, SubscriptionHistory
+from .subscription_rollup import update_subscription_rollups
+
+
+def build_subscription_history(app_id,
+                               old_plan_id,
+                               old_plan: Optional[Plan],
+                               plan: Optional[Plan]) -> Optional[SubscriptionHistory]:
+    """
+    Builds, without saving, the history record of app `app_id` moving from `old_plan_id` to
+    `plan`. `old_plan` is the plan loaded for `old_plan_id`, None when it no longer
+    exists. Returns None when there is nothing to record.
+    """
+    plan_id = plan.pk if plan else None
+
+    if not old_plan_id and not plan_id:
+        # Plan changed, there is no current plan and old plan is not found
+        # do nothing
+        return None
+
+    if old_plan_id and old_plan_id == plan_id:
+        # False positive
+        return None
+
+    history = SubscriptionHistory(app_id=app_id, old_plan_id=old_plan_id, current_plan_id=plan_id)
+
+    if old_plan_id:
+        if old_plan is not None:
+            history.old_plan_name = old_plan.name
+            history.old_price = old_plan.price
+        else:
+            # current plan exists, old plan is present but no longer found in persistence
+            # Let's consider it as subscription switch.
+            history.action_type = PlanActionType.SWITCH
+            history.old_plan_name = PLAN_NAME_UNKNOWN_ALIAS
+    else:
+        # Plan changed and there no previous plan
+        history.action_type = PlanActionType.SUBSCRIBE
+
+    if plan:
+        history.current_plan_name = plan.name
+        history.current_price = plan.price
+
+        if old_plan:
+            if plan.price < old_plan.price:
+                history.action_type = PlanActionType.DOWNGRADE
+            elif plan.price == old_plan.price:
+                history.action_type = PlanActionType.SWITCH
+            elif plan.price > old_plan.price:
+                history.action_type = PlanActionType.UPGRADE
+
+    elif old_plan_id:
+        # Plan changed, there is no current plan and old plan exists
+        history.action_type = PlanActionType.UNSUBSCRIBE
+
+    return history
+
+
+def record_subscription_histories(histories: Iterable[SubscriptionHistory]) -> List[SubscriptionHistory]:
+    """
+    Validates the domain rules of every record, inserts them in one statement and
+    adds them to the subscription rollups. Apps and plans are expected to be persisted
+    already, so the model is not full_clean()'ed, which would query every foreign key.
+    """
+    histories = list(histories)
+    for history in histories:
+        history.validate(full_clean=False)
+
+    histories = SubscriptionHistory.objects.bulk_create(histories)
+    update_subscription_rollups(histories)
+    return histories
@@ -0,0 +1,266 @@
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import Count, Exists, OuterRef, Sum
+from django.utils import timezone
+
+from ..enums import PlanActionType
+from ..models import Application, Plan, SubscriptionHistory, SubscriptionRollup
+
+ROLLUP_FIELDS = ('subscribes', 'unsubscribes', 'upgrades', 'downgrades', 'switches', 'subscribers', 'revenue')
+ROLLUP_BATCH_SIZE = 1000
+ROLLUP_REBUILD_CHUNK_SIZE = 2000
+
+# The event counter of the plan an app moves to, unsubscribes are counted on the plan it leaves
+EVENT_COUNTERS = {
+    PlanActionType.SUBSCRIBE: 'subscribes',
+    PlanActionType.UPGRADE: 'upgrades',
+    PlanActionType.DOWNGRADE: 'downgrades',
+    PlanActionType.SWITCH: 'switches',
+}
+
+
+def _new_deltas():
+    return defaultdict(lambda: dict.fromkeys(ROLLUP_FIELDS, 0))
+
+
+def get_rollup_deltas(histories: Iterable[SubscriptionHistory], deltas=None) -> dict:
+    """
+    Adds the changes of `histories` to `deltas`, {(plan id, day): {rollup field: change}}.
+    The plan an app leaves loses a subscriber and its price of revenue, the plan it
+    moves to gains them. Histories not saved yet are counted today.
+    """
+    deltas = _new_deltas() if deltas is None else deltas
+    # Looked up once rather than for every history, on rebuilds of millions of them
+    current_timezone = timezone.get_current_timezone()
+    today = timezone.localdate(timezone=current_timezone)
+
+    for history in histories:
+        day = timezone.localdate(history.created_at, current_timezone) if history.created_at else today
+
+        if history.old_plan_id:
+            row = deltas[(history.old_plan_id, day)]
+            row['subscribers'] -= 1
+            row['revenue'] -= history.old_price or 0
+            if history.action_type == PlanActionType.UNSUBSCRIBE:
+                row['unsubscribes'] += 1
+
+        if history.current_plan_id:
+            row = deltas[(history.current_plan_id, day)]
+            row['subscribers'] += 1
+            row['revenue'] += history.current_price or 0
+            counter = EVENT_COUNTERS.get(history.action_type)
+            if counter:
+                row[counter] += 1
+
+    return deltas
+
+
+def apply_rollup_deltas(deltas: dict, batch_size: int = ROLLUP_BATCH_SIZE) -> None:
+    """
+    Adds `deltas` to the stored rollups with INSERT ... ON CONFLICT DO UPDATE, so
+    concurrent writers add up instead of overwriting each other. Rows are written in
+    key order, which keeps concurrent transactions from deadlocking on each other.
+    """
+    if not deltas:
+        return
+
+    table = SubscriptionRollup._meta.db_table
+    qn = connection.ops.quote_name
+    plan_field = SubscriptionRollup._meta.get_field('plan_id')
+    day_field = SubscriptionRollup._meta.get_field('day')
+
+    columns = ', '.join(qn(c) for c in ('plan_id', 'day') + ROLLUP_FIELDS)
+    placeholders = '(' + ', '.join(['%s'] * (len(ROLLUP_FIELDS) + 2)) + ')'
+    updates = ', '.join(f'{qn(f)} = {qn(table)}.{qn(f)} + EXCLUDED.{qn(f)}' for f in ROLLUP_FIELDS)
+
+    rows = [
+        (
+            plan_field.get_db_prep_save(plan_id, connection),
+            day_field.get_db_prep_save(day, connection),
+            *(values[f] for f in ROLLUP_FIELDS),
+        )
+        for (plan_id, day), values in sorted(deltas.items(), key=lambda item: (str(item[0][0]), item[0][1]))
+    ]
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            cursor.execute(
+                f'INSERT INTO {qn(table)} ({columns}) VALUES {", ".join([placeholders] * len(batch))} '
+                f'ON CONFLICT ({qn("plan_id")}, {qn("day")}) DO UPDATE SET {updates}',
+                [value for row in batch for value in row],
+            )
+
+
+def update_subscription_rollups(histories: Iterable[SubscriptionHistory]) -> None:
+    """
+    Adds `histories` to the subscription rollups. Also used for subscription changes
+    that are not recorded as histories, such as apps created with a plan.
+    """
+    apply_rollup_deltas(get_rollup_deltas(histories))
+
+
+def record_plan_price_change(plan_id, old_price, price, subscribers: int) -> None:
+    """
+    Changes the revenue of a plan whose price changed from `old_price` to `price`
+    while it had `subscribers` apps.
+    """
+    change = subscribers * ((price or 0) - (old_price or 0))
+    if not change:
+        return
+
+    deltas = _new_deltas()
+    deltas[(plan_id, timezone.localdate())]['revenue'] = change
+    apply_rollup_deltas(deltas)
+
+
+def get_plan_totals(day, plan_id=None) -> dict:
+    """
+    Subscribers and monthly recurring revenue of each plan at the end of `day`,
+    {plan id: (subscribers, revenue)}, summed from the rollups.
+    """
+    queryset = SubscriptionRollup.objects.filter(day__lte=day)
+    if plan_id:
+        queryset = queryset.filter(plan_id=plan_id)
+
+    totals = (
+        queryset
+        .order_by()
+        .values('plan_id')
+        .annotate(total_subscribers=Sum('subscribers'), total_revenue=Sum('revenue'))
+        .values_list('plan_id', 'total_subscribers', 'total_revenue')
+    )
+    return {plan: (subscribers, revenue) for plan, subscribers, revenue in totals}
+
+
+def get_plan_rollups(since, until, plan_id=None) -> list:
+    """
+    The rollups from `since` to `until` ordered by day, each with the running
+    `total_subscribers` and `total_revenue` of its plan. Days without changes have
+    no rollup.
+    """
+    totals = get_plan_totals(since - datetime.timedelta(days=1), plan_id)
+
+    queryset = SubscriptionRollup.objects.filter(day__range=(since, until))
+    if plan_id:
+        queryset = queryset.filter(plan_id=plan_id)
+
+    rollups = list(queryset.order_by('day', 'plan_id'))
+    for rollup in rollups:
+        subscribers, revenue = totals.get(rollup.plan_id, (0, Decimal(0)))
+        subscribers, revenue = subscribers + rollup.subscribers, revenue + rollup.revenue
+        totals[rollup.plan_id] = subscribers, revenue
+        rollup.total_subscribers, rollup.total_revenue = subscribers, revenue
+
+    return rollups
+
+
+def _resolve_plan_ids(histories, plan_ids_by_name: dict):
+    for history in histories:
+        history.old_plan_id = history.old_plan_id or plan_ids_by_name.get(history.old_plan_name)
+        history.current_plan_id = history.current_plan_id or plan_ids_by_name.get(history.current_plan_name)
+        yield history
+
+
+def _get_opening_subscriptions(plan_ids_by_name: dict):
+    """
+    The plan each app was on before its first history, or its current plan when it has
+    none, as subscriptions on the day the app was created.
+    """
+    first_histories = (
+        SubscriptionHistory.objects
+        .order_by('app_id', 'created_at')
+        .distinct('app_id')
+        .values_list('old_plan_id', 'old_plan_name', 'old_price', 'app__created_at')
+    )
+    for old_plan_id, old_plan_name, old_price, created_at in first_histories.iterator(ROLLUP_REBUILD_CHUNK_SIZE):
+        old_plan_id = old_plan_id or plan_ids_by_name.get(old_plan_name)
+        if old_plan_id:
+            yield SubscriptionHistory(
+                action_type=PlanActionType.SUBSCRIBE,
+                current_plan_id=old_plan_id,
+                current_price=old_price,
+                created_at=created_at,
+            )
+
+    without_history = (
+        Application.objects
+        .filter(plan__isnull=False)
+        .filter(~Exists(SubscriptionHistory.objects.filter(app=OuterRef('pk'))))
+        .order_by()
+        .values_list('plan_id', 'plan__price', 'created_at')
+    )
+    for plan_id, price, created_at in without_history.iterator(ROLLUP_REBUILD_CHUNK_SIZE):
+        yield SubscriptionHistory(
+            action_type=PlanActionType.SUBSCRIBE,
+            current_plan_id=plan_id,
+            current_price=price,
+            created_at=created_at,
+        )
+
+
+def _reconcile(deltas: dict) -> None:
+    """
+    Adds today the difference between the replayed totals and the current subscribers
+    and revenue of every plan, e.g. plan price changes, which have no history.
+    """
+    totals = defaultdict(lambda: [0, Decimal(0)])
+    for (plan_id, _), values in deltas.items():
+        totals[plan_id][0] += values['subscribers']
+        totals[plan_id][1] += values['revenue']
+
+    prices = dict(Plan.objects.values_list('pk', 'price'))
+    subscribers = dict(
+        Application.objects
+        .filter(plan__isnull=False)
+        .order_by()
+        .values('plan_id')
+        .annotate(count=Count('pk'))
+        .values_list('plan_id', 'count')
+    )
+
+    today = timezone.localdate()
+    for plan_id in set(totals) | set(subscribers):
+        count = subscribers.get(plan_id, 0)
+        revenue = count * (prices.get(plan_id) or 0)
+        replayed_count, replayed_revenue = totals[plan_id]
+        if count != replayed_count or revenue != replayed_revenue:
+            row = deltas[(plan_id, today)]
+            row['subscribers'] += count - replayed_count
+            row['revenue'] += revenue - replayed_revenue
+
+
+def rebuild_subscription_rollups() -> int:
+    """
+    Recomputes every rollup from the subscription histories and the current apps.
+    Histories recorded before they stored plan ids are matched to the plans by name
+    when the name is unique. Returns the number of rollups written.
+    """
+    names = Plan.objects.order_by().values('name').annotate(count=Count('pk')).filter(count=1).values('name')
+    plan_ids_by_name = dict(Plan.objects.filter(name__in=names).values_list('name', 'pk'))
+
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Waits for the transactions updating the rollups and holds back new ones
+            # until the rollups are rebuilt, so no change is lost or counted twice
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {connection.ops.quote_name(SubscriptionRollup._meta.db_table)} '
+                               f'IN EXCLUSIVE MODE')
+
+        SubscriptionRollup.objects.all().delete()
+
+        histories = SubscriptionHistory.objects.order_by().only(
+            'old_plan_id', 'old_plan_name', 'old_price',
+            'current_plan_id', 'current_plan_name', 'current_price',
+            'action_type', 'created_at',
+        )
+        deltas = get_rollup_deltas(_resolve_plan_ids(histories.iterator(ROLLUP_REBUILD_CHUNK_SIZE), plan_ids_by_name))
+        get_rollup_deltas(_get_opening_subscriptions(plan_ids_by_name), deltas)
+        _reconcile(deltas)
+        apply_rollup_deltas(deltas)
+
+    return len(deltas)
@@ -1 +1,2 @@
 from .application import *
+from .plan import *
@@ -1,68 +1,41 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from ..constants import PLAN_NAME_UNKNOWN_ALIAS
-from ..enums import PlanActionType
-from ..models import Application, Plan, SubscriptionHistory
+from ..models import Application, Plan
+from ..services import build_subscription_history, record_subscription_histories, update_subscription_rollups
 
 
 @receiver(post_save, sender=Application)
-def register_subscription_history(instance: Application, raw: bool, **_) -> None:
+def register_subscription_history(instance: Application, created: bool, raw: bool, **_) -> None:
     if raw is True:
         # fixtures inserted are ignored
         return
 
     if instance.has_changed('plan_id') is False:
+        if created and instance.plan_id:
+            # Apps created with a plan have no history, but they are new subscribers
+            update_subscription_rollups([build_subscription_history(instance.pk, None, None, instance.get_plan())])
         # Nothing changed
         return
 
     old_plan_id = instance.old_value('plan_id')
-
-    if not old_plan_id and not instance.plan_id:
-        # Plan changed, there is no current plan and old plan is not found
-        # do nothing
+    if old_plan_id and old_plan_id == instance.plan_id:
+        # False positive
         return
 
-    history = SubscriptionHistory(app_id=instance.pk)
-    old_plan = None
-
-    if old_plan_id:
-        if old_plan_id == instance.plan_id:
-            # False positive
-            # Do nothing
-            return
-
-        try:
-            old_plan = Plan.objects.get(pk=old_plan_id)
-            history.old_plan_name = old_plan.name
-            history.old_price = old_plan.price
+    old_plan = Plan.catalog.get(old_plan_id) if old_plan_id else None
+    plan = instance.get_plan()
 
-        except Plan.DoesNotExist:
-            # current plan exists, old plan is present but no longer found in persistence
-            # Let's consider it as subscription switch.
-            history.action_type = PlanActionType.SWITCH
-            history.old_plan_name = PLAN_NAME_UNKNOWN_ALIAS
+    history = build_subscription_history(instance.pk, old_plan_id, old_plan, plan)
+    if history is not None:
+        record_subscription_histories([history])
 
-    else:
-        # Plan changed and there no previous plan
-        history.action_type = PlanActionType.SUBSCRIBE
 
-    if instance.plan_id:
-        plan = instance.plan
-        history.current_plan_name = plan.name
-        history.current_price = plan.price
-
-        if old_plan:
-            if plan.price < old_plan.price:
-                history.action_type = PlanActionType.DOWNGRADE
-            elif plan.price == old_plan.price:
-                history.action_type = PlanActionType.SWITCH
-            elif plan.price > old_plan.price:
-                history.action_type = PlanActionType.UPGRADE
-
-    elif old_plan_id:
-        # Plan changed, there is no current plan and old plan exists
-        history.action_type = PlanActionType.UNSUBSCRIBE
+@receiver(post_delete, sender=Application)
+def unregister_subscription(instance: Application, **_) -> None:
+    if not instance.plan_id:
+        return
 
-    history.validate()
-    history.save()
+    # The histories of the app are deleted with it, only the rollups remember it
+    plan = Plan.catalog.get(instance.plan_id)
+    update_subscription_rollups([build_subscription_history(instance.pk, instance.plan_id, plan, None)])
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_generation
+from ..constants import PLAN_CACHE_NAMESPACE
+from ..models import Application, Plan
+from ..services import record_plan_price_change
+
+
+@receiver([post_save, post_delete], sender=Plan)
+def invalidate_plan_responses(**_) -> None:
+    # Bumped after commit, otherwise a concurrent request could cache the old rows
+    # again under the new generation
+    transaction.on_commit(lambda: bump_generation(PLAN_CACHE_NAMESPACE))
+
+
+@receiver([post_save, post_delete], sender=Plan)
+def invalidate_plan_catalog(**_) -> None:
+    # This process sees the change right away, the others once it is committed
+    Plan.catalog.clear()
+    transaction.on_commit(Plan.catalog.invalidate)
+
+
+@receiver(post_save, sender=Plan)
+def register_plan_price_change(instance: Plan, created: bool, raw: bool, **_) -> None:
+    if raw is True or created or instance.has_changed('price') is False:
+        return
+
+    # The revenue of the plan changes for every app on it
+    subscribers = Application.objects.filter(plan_id=instance.pk).count()
+    record_plan_price_change(instance.pk, instance.old_value('price'), instance.price, subscribers)
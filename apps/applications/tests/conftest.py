@@ -1,12 +1,44 @@
 from decimal import Decimal
 
 import pytest
+from django.core.cache import caches
 
 from . import factories
+from .query_budgets import QUERY_BUDGETS, QueryBudgetRecorder
+from ..models import Plan
 
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def local_memory_cache(settings):
+    """ Keeps cached responses from leaking between tests or into a shared Redis. """
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tests',
+        }
+    }
+    caches['default'].clear()
+
+
+@pytest.fixture(autouse=True)
+def query_budgets():
+    """ Fails tests making requests over the query budget of their endpoint, see query_budgets.py. """
+    recorder = QueryBudgetRecorder(QUERY_BUDGETS)
+    with recorder.recording():
+        yield recorder
+
+    if recorder.violations:
+        pytest.fail('Query budgets exceeded:\n' + '\n'.join(recorder.violations), pytrace=False)
+
+
+@pytest.fixture(autouse=True)
+def plan_catalog():
+    """ Drops plans of previous tests from the process-local catalog. """
+    Plan.catalog.clear()
+
+
 @pytest.mark.django_db
 @pytest.fixture
 def plan():
@@ -0,0 +1,66 @@
+import datetime
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+
+from .. import factories
+from ...models import SubscriptionHistory
+
+
+class TestAnalyticsEndpoints(TestCase):
+    def setUp(self) -> None:
+        self.endpoint = reverse_lazy('application:analytics-list')
+        self.summary_endpoint = reverse_lazy('application:analytics-summary')
+        self.admin = factories.UserFactory(is_staff=True)
+        self.plan = factories.PlanFactory(price=Decimal(20))
+
+    def test_restricted_to_staff(self):
+        """ Tests whether analytics are restricted to staff users. """
+        self.client.force_login(factories.UserFactory())
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_daily_rollups(self):
+        """ Tests whether the daily rollups carry the running totals of their plan. """
+        factories.ApplicationFactory.create_batch(2, plan=self.plan)
+        self.client.force_login(self.admin)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.endpoint, {'plan': str(self.plan.pk)})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [rollup] = response.json()
+        self.assertEqual(rollup['plan_name'], self.plan.name)
+        self.assertEqual((rollup['subscribes'], rollup['total_subscribers']), (2, 2))
+        self.assertEqual(Decimal(rollup['total_revenue']), Decimal(40))
+        # Never scans the raw history
+        self.assertFalse([q for q in queries.captured_queries if SubscriptionHistory._meta.db_table in q['sql']])
+
+    def test_summary(self):
+        """ Tests whether the summary adds up the plans at the end of the day. """
+        factories.ApplicationFactory.create_batch(2, plan=self.plan)
+        factories.ApplicationFactory(plan=factories.PlanFactory(price=Decimal(5)))
+        self.client.force_login(self.admin)
+
+        response = self.client.get(self.summary_endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['subscribers'], 3)
+        self.assertEqual(Decimal(response.json()['revenue']), Decimal(45))
+        self.assertEqual(response.json()['plans'][0]['plan'], str(self.plan.pk))
+
+        yesterday = timezone.localdate() - datetime.timedelta(days=1)
+        response = self.client.get(self.summary_endpoint, {'until': yesterday.isoformat()})
+        self.assertEqual(response.json()['subscribers'], 0)
+
+    def test_invalid_range(self):
+        """ Tests whether a range ending before it starts is rejected. """
+        self.client.force_login(self.admin)
+        response = self.client.get(self.endpoint, {'since': '2026-02-01', 'until': '2026-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('since', response.json())
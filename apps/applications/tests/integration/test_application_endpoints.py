@@ -1,12 +1,20 @@
+import json
+from base64 import b64encode
+
+import factory
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 from rest_framework import status
 
 from apps.users.api.serializers import SimpleUserSerializer
 from apps.users.models import User
+from core.pagination import KeysetPagination
 from .. import factories
 from ...api import serializers
-from ...models import Application, Plan
+from ...enums import PlanActionType
+from ...models import Application, Plan, SubscriptionHistory
 
 
 def create_application_data() -> dict:
@@ -71,6 +79,80 @@ class TestAppCreationEndpoint(TestCase):
         self.assertIn('updated_at', result)
 
 
+class TestAppBulkEndpoint(TestCase):
+    def setUp(self) -> None:
+        self.endpoint = reverse_lazy('application:application-bulk')
+        self.user = factories.UserFactory()
+        self.plans = factories.PlanFactory.create_batch(3)
+
+    def create_items(self, count):
+        return [
+            dict(create_application_data(), plan=str(self.plans[i % len(self.plans)].pk))
+            for i in range(count)
+        ]
+
+    def test_bulk_restriction(self):
+        """ Tests whether bulk endpoint is restricted to authenticated users. """
+        response = self.client.post(self.endpoint, data=self.create_items(1), content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_creation(self):
+        """ Tests whether apps and their subscription histories are created in a fixed number of queries. """
+        self.client.force_login(self.user)
+        self.client.post(self.endpoint, data=self.create_items(1), content_type='application/json')
+
+        data = self.create_items(30)
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(self.endpoint, data=data[:3], content_type='application/json')
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.post(self.endpoint, data=data[3:], content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(many), len(few))
+
+        result = response.json()
+        self.assertEqual([i['name'] for i in result], [i['name'] for i in data[3:]])
+        self.assertEqual(result[0]['user'], get_user_data(self.user))
+        self.assertEqual(result[0]['plan'], get_plan_data(self.plans[0]))
+
+        self.assertEqual(Application.objects.count(), 31)
+        histories = SubscriptionHistory.objects.filter(action_type=PlanActionType.SUBSCRIBE)
+        self.assertEqual(histories.count(), 31)
+
+    def test_bulk_update(self):
+        """ Tests whether items with an id update the app and record the plan change. """
+        self.client.force_login(self.user)
+        app = factories.ApplicationFactory(user=self.user, plan=self.plans[0])
+
+        item = dict(get_application_data(app), plan=str(self.plans[1].pk), name='Renamed')
+        response = self.client.post(self.endpoint, data=[item], content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        app.refresh_from_db()
+        self.assertEqual(app.name, 'Renamed')
+        self.assertEqual(app.plan_id, self.plans[1].pk)
+
+        history = SubscriptionHistory.objects.get(app=app)
+        self.assertEqual(history.old_plan_name, self.plans[0].name)
+        self.assertEqual(history.current_plan_name, self.plans[1].name)
+
+    def test_bulk_errors(self):
+        """ Tests whether errors are reported per item and nothing is saved. """
+        self.client.force_login(self.user)
+        data = self.create_items(3)
+        data[1]['name'] = ''
+        data[2]['plan'] = str(factories.PlanFactory.build().pk)
+
+        response = self.client.post(self.endpoint, data=data, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn('name', errors[1])
+        self.assertIn('plan', errors[2])
+        self.assertEqual(Application.objects.count(), 0)
+
+
 class TestAppListEndpoint(TestCase):
     def setUp(self) -> None:
         self.endpoint = reverse_lazy('application:application-list')
@@ -97,6 +179,170 @@ class TestAppListEndpoint(TestCase):
         for item in self.items:
             self.assertIn(str(item.pk), pks)
 
+    def test_list_cursor_pagination(self):
+        """ Tests whether cursor pagination walks every item once, forwards and backwards. """
+        factories.ApplicationFactory.create_batch(3, user=self.user, name=self.items[0].name)
+        expected = list(Application.objects.order_by('name', 'id').values_list('pk', flat=True))
+
+        self.client.force_login(self.user)
+        response = self.client.get(self.endpoint, {'pagination': 'cursor', 'limit': 4})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.json())
+
+        pages = list()
+        result = response.json()
+        while True:
+            pages.append([i['id'] for i in result['results']])
+            if not result['next']:
+                break
+            result = self.client.get(result['next']).json()
+
+        self.assertEqual(sum(pages, []), [str(pk) for pk in expected])
+
+        previous = self.client.get(result['previous']).json()
+        self.assertEqual([i['id'] for i in previous['results']], pages[-2])
+
+    def test_list_invalid_cursor(self):
+        """ Tests whether a tampered cursor is rejected. """
+        self.client.force_login(self.user)
+        cursors = ['not-a-cursor'] + [
+            b64encode(json.dumps({'p': position}).encode()).decode()
+            for position in (['a', 'not-a-uuid'], [{'x': 1}, '1'], ['a', None])
+        ]
+        for cursor in cursors:
+            # DRF rolls back the innermost transaction on errors, the test one for the non-atomic list
+            with transaction.atomic():
+                response = self.client.get(self.endpoint, {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_limit_offset_not_capped(self):
+        """ Tests whether limit/offset pagination still returns more rows than a cursor page. """
+        # Distinct names, the factory gets the app instead of creating it when its name is taken
+        factories.ApplicationFactory.create_batch(
+            KeysetPagination.max_limit + 1 - len(self.items),
+            user=self.user,
+            name=factory.Sequence(lambda i: f'App {i}'),
+        )
+
+        self.client.force_login(self.user)
+        response = self.client.get(self.endpoint, {'limit': KeysetPagination.max_limit + 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), KeysetPagination.max_limit + 1)
+
+    def test_list_queries_do_not_scale_with_rows(self):
+        """ Tests whether nested user and plan are loaded without a query per row. """
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(self.endpoint)
+
+        factories.ApplicationFactory.create_batch(20, user=self.user)
+
+        with CaptureQueriesContext(connection) as large_page:
+            response = self.client.get(self.endpoint)
+
+        self.assertEqual(len(response.json()['results']), len(self.items) + 20)
+        self.assertEqual(len(large_page), len(small_page))
+
+    def test_list_joins_only_requested_relations(self):
+        """ Tests whether relations that are not rendered are not joined. """
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.endpoint, {'fields': 'id,name'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()['results'][0].keys()), {'id', 'name'})
+
+        list_query = next(q['sql'] for q in queries if 'ORDER BY' in q['sql'])
+        self.assertNotIn('JOIN', list_query)
+
+    def test_list_not_modified(self):
+        """ Tests whether a list with a matching ETag answers 304 from its page, without aggregating every row. """
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(any('MAX(' in q['sql'] for q in queries))
+
+    def test_list_etag_follows_page(self):
+        """ Tests whether the list ETag only changes with the rows of the requested page. """
+        self.client.force_login(self.user)
+        first, second = Application.objects.order_by('name', 'id')[:2]
+        etag = self.client.get(self.endpoint, {'limit': 1})['ETag']
+
+        second.description = 'Changed'
+        second.save()
+        response = self.client.get(self.endpoint, {'limit': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        first.description = 'Changed'
+        first.save()
+        response = self.client.get(self.endpoint, {'limit': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_validators_join_only_requested_relations(self):
+        """ Tests whether the list ETag does not join the relations that are not rendered. """
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.endpoint, {'fields': 'id,name'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('JOIN' in q['sql'] for q in queries))
+
+    def test_list_etag_follows_nested_plan(self):
+        """ Tests whether changing a rendered plan changes the list ETag. """
+        self.client.force_login(self.user)
+        etag = self.client.get(self.endpoint)['ETag']
+
+        plan = self.items[0].plan
+        plan.name = 'Renamed'
+        plan.save()
+
+        response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_etag_follows_nested_user(self):
+        """ Tests whether changing a rendered user changes the list ETag. """
+        self.client.force_login(self.user)
+        etag = self.client.get(self.endpoint)['ETag']
+
+        self.user.first_name = 'Renamed'
+        self.user.save()
+
+        response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'][0]['user']['first_name'], 'Renamed')
+
+    def test_list_ndjson_export(self):
+        """ Tests whether every app is streamed, unpaginated, one JSON document per line. """
+        self.client.force_login(self.user)
+        factories.ApplicationFactory.create_batch(60, user=self.user)
+
+        response = self.client.get(self.endpoint, {'fields': 'id,name,plan'}, HTTP_ACCEPT='application/x-ndjson')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(len(rows), Application.objects.count())
+        self.assertEqual(set(rows[0].keys()), {'id', 'name', 'plan'})
+        self.assertEqual([r['name'] for r in rows], list(Application.objects.values_list('name', flat=True)))
+        self.assertEqual({r['id'] for r in rows}, {str(pk) for pk in Application.objects.values_list('pk', flat=True)})
+
 
 class TestAppItemEndpoint(TestCase):
     def setUp(self) -> None:
@@ -132,6 +378,16 @@ class TestAppItemEndpoint(TestCase):
         self.assertIn('created_at', result)
         self.assertIn('updated_at', result)
 
+    def test_item_not_modified_since(self):
+        """ Tests whether item endpoint honours If-Modified-Since. """
+        self.client.force_login(self.user)
+
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.endpoint, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
 
 class TestAppEditionEndpoint(TestCase):
     def setUp(self) -> None:
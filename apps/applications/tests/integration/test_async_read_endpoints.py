@@ -0,0 +1,113 @@
+import asyncio
+import csv
+import io
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .. import factories
+from ...api import viewsets
+from ...models import Plan
+
+
+class AsyncReadEndpointsTestCase(TestCase):
+    def setUp(self) -> None:
+        self.user = factories.UserFactory()
+        self.factory = APIRequestFactory()
+
+    def call(self, viewset, actions, method, path, data=None, user=None, headers=None, **kwargs):
+        with override_settings(ASYNC_READ_VIEWS=True):
+            view = viewset.as_view(actions)
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+
+        request = getattr(self.factory, method)(path, data, format='json' if method == 'post' else None, **(headers or {}))
+        if user is not None:
+            force_authenticate(request, user=user)
+
+        response = async_to_sync(view)(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_plan_list(self):
+        """ Tests whether plans are listed and paginated by the async view. """
+        factories.PlanFactory.create_batch(3)
+
+        response = self.call(viewsets.PlanViewSet, {'get': 'list', 'post': 'create'}, 'get', '/v1/plans/', user=self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], Plan.objects.count())
+        self.assertEqual(len(response.data['results']), Plan.objects.count())
+
+    def test_plan_retrieve_not_modified(self):
+        """ Tests whether the async retrieve keeps the conditional GET of plans. """
+        plan = factories.PlanFactory()
+        actions = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+
+        response = self.call(viewsets.PlanViewSet, actions, 'get', '/v1/plans/', user=self.user, id=str(plan.pk))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], str(plan.pk))
+
+        headers = {'HTTP_IF_NONE_MATCH': response['ETag']}
+        response = self.call(viewsets.PlanViewSet, actions, 'get', '/v1/plans/', user=self.user, headers=headers,
+                             id=str(plan.pk))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_sync_methods_on_async_route(self):
+        """ Tests whether the other methods of an async route keep their sync handlers. """
+        data = {'name': 'Async', 'description': 'Plan', 'price': '10.00'}
+
+        response = self.call(viewsets.PlanViewSet, {'get': 'list', 'post': 'create'}, 'post', '/v1/plans/', data,
+                             user=self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Plan.objects.filter(name='Async').exists())
+
+    def test_app_retrieve(self):
+        """ Tests whether an app is retrieved by the async view, and unknown ids are not found. """
+        app = factories.ApplicationFactory(user=self.user)
+        actions = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+
+        response = self.call(viewsets.ApplicationViewSet, actions, 'get', '/v1/apps/', user=self.user, id=str(app.pk))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['plan']['id'], str(app.plan_id))
+
+        response = self.call(viewsets.ApplicationViewSet, actions, 'get', '/v1/apps/', user=self.user, id='unknown')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_app_retrieve_restriction(self):
+        """ Tests whether the async view still authenticates the request. """
+        app = factories.ApplicationFactory(user=self.user)
+        actions = {'get': 'retrieve'}
+
+        response = self.call(viewsets.ApplicationViewSet, actions, 'get', '/v1/apps/', id=str(app.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_history_list(self):
+        """ Tests whether histories are filtered and cursor paginated by the async view. """
+        app = factories.ApplicationFactory()
+        items = factories.SubscriptionHistoryFactory.create_batch(5, app=app)
+        factories.SubscriptionHistoryFactory.create_batch(3)
+
+        response = self.call(viewsets.SubscriptionHistoryViewSet, {'get': 'list'}, 'get', '/v1/apps/x/subscriptions/',
+                             {'pagination': 'cursor', 'limit': 2}, user=self.user, app_id=str(app.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+        self.assertTrue({r['id'] for r in response.data['results']} <= {str(item.pk) for item in items})
+
+    def test_history_export(self):
+        """ Tests whether exports asked to the async view are still streamed. """
+        app = factories.ApplicationFactory()
+        items = factories.SubscriptionHistoryFactory.create_batch(3, app=app)
+
+        response = self.call(viewsets.SubscriptionHistoryViewSet, {'get': 'list'}, 'get', '/v1/apps/x/subscriptions/',
+                             user=self.user, headers={'HTTP_ACCEPT': 'text/csv'}, app_id=str(app.pk))
+
+        self.assertTrue(response.streaming)
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual({r['id'] for r in rows}, {str(item.pk) for item in items})
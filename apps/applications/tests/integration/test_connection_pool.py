@@ -0,0 +1,150 @@
+import threading
+import time
+
+import psycopg2
+from django.db import connection, connections
+from django.test import TestCase
+
+from core.db.health_checks import ConnectionPoolHealthCheck
+from core.db.pool import ConnectionPool, PoolTimeout, get_pool
+
+
+class TestConnectionPool(TestCase):
+    def setUp(self) -> None:
+        self.conn_params = connection.get_connection_params()
+
+    def connect(self):
+        return psycopg2.connect(**self.conn_params)
+
+    def get_pool(self, **options):
+        pool = ConnectionPool('test', **options)
+        self.addCleanup(pool.close)
+        return pool
+
+    def checkout(self, pool):
+        conn = pool.checkout(self.connect)
+        self.addCleanup(conn.close)
+        return conn
+
+    def test_reuse(self):
+        """ Tests whether a checked in connection is checked out again rather than a new one opened. """
+        pool = self.get_pool()
+        conn = self.checkout(pool)
+        pool.checkin(conn)
+
+        self.assertIs(self.checkout(pool), conn)
+        self.assertEqual(pool.get_stats()['connects'], 1)
+        self.assertEqual(pool.get_stats()['checkouts'], 2)
+
+    def test_max_size(self):
+        """ Tests whether a checkout beyond the max size waits for a connection, then times out. """
+        pool = self.get_pool(max_size=1, timeout=0.1)
+        self.checkout(pool)
+
+        with self.assertRaises(PoolTimeout):
+            self.checkout(pool)
+
+        stats = pool.get_stats()
+        self.assertEqual((stats['size'], stats['waits'], stats['timeouts']), (1, 1, 1))
+
+    def test_rollback_on_checkin(self):
+        """ Tests whether a connection checked in within a transaction is rolled back. """
+        pool = self.get_pool()
+        conn = self.checkout(pool)
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertEqual(conn.info.transaction_status, psycopg2.extensions.TRANSACTION_STATUS_INTRANS)
+
+        pool.checkin(conn)
+        self.assertEqual(conn.info.transaction_status, psycopg2.extensions.TRANSACTION_STATUS_IDLE)
+        self.assertIs(self.checkout(pool), conn)
+
+    def test_session_reset_on_checkin(self):
+        """ Tests whether session settings and temporary tables do not outlive a checkout. """
+        pool = self.get_pool()
+        conn = self.checkout(pool)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("SET statement_timeout = '1234ms'")
+            cursor.execute('CREATE TEMPORARY TABLE pool_session (id int)')
+
+        pool.checkin(conn)
+        self.assertIs(self.checkout(pool), conn)
+        self.assertTrue(conn.autocommit)
+        with conn.cursor() as cursor:
+            cursor.execute('SHOW statement_timeout')
+            self.assertEqual(cursor.fetchone(), ('0',))
+            cursor.execute("SELECT to_regclass('pool_session')")
+            self.assertEqual(cursor.fetchone(), (None,))
+
+    def test_health_check_out_of_lock(self):
+        """ Tests whether other threads use the pool while a connection is checked. """
+        pool = self.get_pool(check_delay=0)
+        pool.checkin(self.checkout(pool))
+        is_healthy = pool.is_healthy
+
+        def check_from_other_thread(pooled):
+            other = threading.Thread(target=pool.get_stats)
+            other.start()
+            other.join(timeout=1)
+            self.assertFalse(other.is_alive())
+            return is_healthy(pooled)
+
+        pool.is_healthy = check_from_other_thread
+        self.checkout(pool)
+        self.assertEqual(pool.get_stats()['connects'], 1)
+
+    def test_max_lifetime(self):
+        """ Tests whether expired connections are closed rather than checked out again. """
+        pool = self.get_pool(max_lifetime=0.001)
+        conn = self.checkout(pool)
+        time.sleep(0.01)
+        pool.checkin(conn)
+
+        self.assertTrue(conn.closed)
+        self.assertIsNot(self.checkout(pool), conn)
+        self.assertEqual(pool.get_stats()['discards'], 1)
+
+    def test_health_check(self):
+        """ Tests whether a connection dropped by the server is replaced on checkout. """
+        pool = self.get_pool(check_delay=0)
+        conn = self.checkout(pool)
+        pool.checkin(conn)
+
+        with self.connect() as other, other.cursor() as cursor:
+            cursor.execute('SELECT pg_terminate_backend(%s)', [conn.info.backend_pid])
+
+        self.assertIsNot(self.checkout(pool), conn)
+        self.assertEqual(pool.get_stats()['discards'], 1)
+
+
+class TestPooledBackend(TestCase):
+    def test_close_checks_in(self):
+        """ Tests whether the backend reuses the connection it closed, as at the end of a request. """
+        wrapper = connections.create_connection('default')
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        conn = wrapper.connection
+        self.assertIsNotNone(wrapper.pool)
+
+        wrapper.close()
+        self.assertFalse(conn.closed)
+        wrapper.ensure_connection()
+        self.assertIs(wrapper.connection, conn)
+
+    def test_health_check_stats(self):
+        """ Tests whether the pool health check reports the statistics, and timeouts as a warning. """
+        pool = get_pool('health-check-test', 'health-check-test', max_size=0, timeout=0)
+        self.addCleanup(pool.close)
+        check = ConnectionPoolHealthCheck()
+        check.run_check()
+        self.assertFalse(check.errors)
+        self.assertIn('health-check-test: 0/0 connections', check.pretty_status())
+
+        with self.assertRaises(PoolTimeout):
+            pool.checkout(lambda: None)
+
+        check.run_check()
+        self.assertTrue(check.errors)
+        check.run_check()
+        self.assertFalse(check.errors)
@@ -1,10 +1,12 @@
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 from rest_framework import status
 
 from .. import factories
 from ...api import serializers
-from ...models import Plan
+from ...models import Application, Plan, SubscriptionHistory
 
 
 def create_plan_data() -> dict:
@@ -75,6 +77,47 @@ class TestPlanListEndpoint(TestCase):
         for item in self.items:
             self.assertIn(str(item.pk), pks)
 
+    def test_list_is_cached_until_plans_change(self):
+        """ Tests whether list responses are cached and dropped when a plan is saved. """
+        self.client.force_login(self.user)
+        first = self.client.get(self.endpoint, {'fields': 'id,name'})
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(self.endpoint, {'fields': 'name,id'})
+
+        self.assertEqual(cached.json(), first.json())
+        self.assertFalse(any('applications_plan' in q['sql'] for q in queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            plan = self.items[0]
+            plan.name = plan.name + ' edited'
+            plan.save()
+
+        result = self.client.get(self.endpoint, {'fields': 'id,name'}).json()
+        self.assertIn(plan.name, [i['name'] for i in result['results']])
+
+    def test_list_cache_varies_by_fields(self):
+        """ Tests whether each set of requested fields gets its own cached response. """
+        self.client.force_login(self.user)
+        self.client.get(self.endpoint, {'fields': 'id'})
+
+        result = self.client.get(self.endpoint, {'fields': 'id,price'}).json()
+        self.assertEqual(set(result['results'][0].keys()), {'id', 'price'})
+
+    def test_list_cursor_pagination(self):
+        """ Tests whether cursor pagination returns every plan without counting them. """
+        self.client.force_login(self.user)
+        result = self.client.get(self.endpoint, {'pagination': 'cursor', 'limit': 3}).json()
+        self.assertNotIn('count', result)
+
+        pks = [i['id'] for i in result['results']]
+        while result['next']:
+            result = self.client.get(result['next']).json()
+            pks += [i['id'] for i in result['results']]
+
+        expected = Plan.objects.order_by('name', 'id').values_list('pk', flat=True)
+        self.assertEqual(pks, [str(pk) for pk in expected])
+
 
 class TestPlanItemEndpoint(TestCase):
     def setUp(self) -> None:
@@ -103,6 +146,20 @@ class TestPlanItemEndpoint(TestCase):
         self.assertIn('created_at', result)
         self.assertIn('updated_at', result)
 
+    def test_item_not_modified(self):
+        """ Tests whether item endpoint answers 304 until the plan changes. """
+        self.client.force_login(self.user)
+        etag = self.client.get(self.endpoint)['ETag']
+
+        response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.save()
+
+        response = self.client.get(self.endpoint, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
 
 class TestPlanEditionEndpoint(TestCase):
     def setUp(self) -> None:
@@ -190,3 +247,47 @@ class TestPlanDeletionEndpoint(TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
         self.assertEqual(queryset.filter(pk=self.item.pk).exists(), False)
+
+
+class TestPlanMigrationEndpoint(TestCase):
+    def setUp(self) -> None:
+        self.item = factories.PlanFactory.create()
+        self.target = factories.PlanFactory.create()
+        self.apps = factories.ApplicationFactory.create_batch(3, plan=self.item)
+        self.endpoint = reverse_lazy('application:plan-migrate', kwargs={'id': str(self.item.pk)})
+        self.user = factories.UserFactory(is_staff=True)
+
+    def test_migration_restriction(self):
+        """ Tests whether migration endpoint is restricted to authenticated users. """
+        response = self.client.post(self.endpoint, data={'plan': str(self.target.pk)}, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_migration_staff_only(self):
+        """ Tests whether users who are not staff cannot migrate the applications of every user. """
+        self.client.force_login(factories.UserFactory())
+        # DRF rolls back the innermost transaction on errors, the test one for the non-atomic migration
+        with transaction.atomic():
+            response = self.client.post(self.endpoint, data={'plan': str(self.target.pk)},
+                                        content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Application.objects.filter(plan=self.item).count(), len(self.apps))
+
+    def test_migration(self):
+        """ Tests whether every app of the plan is moved and its history recorded. """
+        self.client.force_login(self.user)
+        response = self.client.post(self.endpoint, data={'plan': str(self.target.pk)}, content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'migrated': len(self.apps)})
+        self.assertEqual(Application.objects.filter(plan=self.target).count(), len(self.apps))
+        self.assertEqual(SubscriptionHistory.objects.filter(current_plan_name=self.target.name).count(), len(self.apps))
+
+    def test_migration_invalid_plan(self):
+        """ Tests whether an unknown target plan is rejected. """
+        self.client.force_login(self.user)
+        response = self.client.post(self.endpoint, data={'plan': str(factories.PlanFactory.build().pk)},
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('plan', response.json())
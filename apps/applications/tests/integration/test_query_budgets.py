@@ -0,0 +1,82 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+
+from .. import factories
+from ..query_budgets import QueryBudgetRecorder
+
+
+class TestListQueries(TestCase):
+    """ List endpoints make as many queries for one row as for a page of them """
+    rows = 10
+
+    def setUp(self) -> None:
+        self.user = factories.UserFactory(is_staff=True)
+        self.client.force_login(self.user)
+
+        # Rows of different plans, owners and applications, the usual N+1 culprits
+        self.apps = [factories.ApplicationFactory(user=self.user) for _ in range(self.rows)]
+        factories.SubscriptionHistoryFactory.create_batch(self.rows, app=self.apps[0])
+
+    def count_queries(self, endpoint, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(endpoint, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries), response.json()
+
+    def assertQueriesIndependentOfRows(self, endpoint, **params):
+        # Loads what is loaded once per process or session
+        self.count_queries(endpoint, limit=2, **params)
+
+        one, data = self.count_queries(endpoint, limit=1, **params)
+        self.assertEqual(len(data['results']), 1)
+        page, data = self.count_queries(endpoint, limit=self.rows, **params)
+        self.assertEqual(len(data['results']), self.rows)
+        self.assertEqual(page, one)
+
+    def test_plans(self):
+        """ Tests whether listing plans makes a constant number of queries. """
+        self.assertQueriesIndependentOfRows(reverse_lazy('application:plan-list'))
+
+    def test_applications(self):
+        """ Tests whether listing applications makes a constant number of queries. """
+        self.assertQueriesIndependentOfRows(reverse_lazy('application:application-list'))
+
+    def test_subscription_histories(self):
+        """ Tests whether listing subscription histories makes a constant number of queries, in both paginations. """
+        endpoint = reverse_lazy('application:app-subscriptions-list', kwargs={'app_id': str(self.apps[0].pk)})
+        self.assertQueriesIndependentOfRows(endpoint)
+        self.assertQueriesIndependentOfRows(endpoint, pagination='cursor')
+
+    def test_analytics(self):
+        """ Tests whether listing daily rollups makes a constant number of queries. """
+        endpoint = reverse_lazy('application:analytics-list')
+        today = timezone.localdate()
+        self.count_queries(endpoint)
+
+        one, data = self.count_queries(endpoint, plan=str(self.apps[0].plan_id))
+        self.assertEqual(len(data), 1)
+        all_plans, data = self.count_queries(endpoint, since=(today - datetime.timedelta(days=1)).isoformat())
+        self.assertEqual(len(data), self.rows)
+        self.assertEqual(all_plans, one)
+
+
+class TestQueryBudgetRecorder(TestCase):
+    def test_violations(self):
+        """ Tests whether requests over their budget, or without one, are reported, not other requests. """
+        self.client.force_login(factories.UserFactory())
+        recorder = QueryBudgetRecorder({('application:plan-list', 'GET'): 1})
+
+        with recorder.recording():
+            self.client.get(reverse_lazy('application:plan-list'))
+            self.client.get(reverse_lazy('application:application-list'))
+            self.client.get('/health/')
+
+        self.assertEqual(len(recorder.violations), 2)
+        self.assertIn('over the budget of 1', recorder.violations[0])
+        self.assertIn('no budget for application:application-list GET', recorder.violations[1])
@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection, router
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from rest_framework import status
+
+from core.db.routers import PIN_KEY, get_replica, is_pinned_to_primary, pin_to_primary, replica_reads
+from .. import factories
+from ...api.viewsets import PlanViewSet
+from ...models import Plan
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class TestReplicaRouter(TestCase):
+    def setUp(self) -> None:
+        self.user = factories.UserFactory()
+        self.addCleanup(cache.delete, PIN_KEY.format(self.user.pk))
+
+    def test_reads_outside_replica_reads(self):
+        """ Tests whether reads go to the primary unless replica reads are on. """
+        self.assertEqual(Plan.objects.all().db, 'default')
+
+    def test_replica_reads(self):
+        """ Tests whether reads go to the replica inside replica_reads(), writes to the primary. """
+        with replica_reads():
+            self.assertEqual(Plan.objects.all().db, 'replica_0')
+            self.assertEqual(router.db_for_write(Plan), 'default')
+            # Following reads must see the write
+            self.assertEqual(Plan.objects.all().db, 'default')
+
+        self.assertEqual(Plan.objects.all().db, 'default')
+
+    def test_no_migrations_on_replicas(self):
+        """ Tests whether migrations only run on the primary. """
+        self.assertFalse(router.allow_migrate('replica_0', 'applications'))
+        self.assertTrue(router.allow_migrate('default', 'applications'))
+
+    def test_pin_to_primary(self):
+        """ Tests whether pinned users are known, only when authenticated. """
+        self.assertFalse(is_pinned_to_primary(self.user))
+        pin_to_primary(self.user)
+        self.assertTrue(is_pinned_to_primary(self.user))
+
+        pin_to_primary(AnonymousUser())
+        self.assertFalse(is_pinned_to_primary(AnonymousUser()))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        """ Tests whether nothing is routed or pinned without replicas. """
+        with replica_reads():
+            self.assertEqual(Plan.objects.all().db, 'default')
+
+        pin_to_primary(self.user)
+        self.assertIsNone(cache.get(PIN_KEY.format(self.user.pk)))
+
+
+class TestReplicaReadEndpoints(TestCase):
+    def setUp(self) -> None:
+        self.user = factories.UserFactory()
+        self.client.force_login(self.user)
+        self.endpoint = reverse_lazy('application:plan-list')
+        self.plan_data = {'name': 'Pro', 'price': '10.00'}
+        self.addCleanup(cache.delete, PIN_KEY.format(self.user.pk))
+
+    # The replica is the primary, as when testing a single database under two aliases
+    @override_settings(DATABASE_REPLICAS=['default'])
+    def test_write_pins_user(self):
+        """ Tests whether a successful write pins its user to the primary, not a read or a failure. """
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(is_pinned_to_primary(self.user))
+
+        response = self.client.post(self.endpoint, data={}, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(is_pinned_to_primary(self.user))
+
+        response = self.client.post(self.endpoint, data=self.plan_data, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(is_pinned_to_primary(self.user))
+
+    def test_reads_out_of_request_transaction(self):
+        """ Tests whether reads skip the request transaction, writes of the same route keep it. """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in queries if q['sql'].startswith('SAVEPOINT')])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.endpoint, data=self.plan_data, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue([q for q in queries if q['sql'].startswith('SAVEPOINT')])
+
+    @override_settings(DATABASE_REPLICAS=['default'])
+    def test_replica_reads_end_on_error(self):
+        """ Tests whether the replica reads of a request end when its view raises. """
+        with mock.patch.object(PlanViewSet, 'list', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.get(self.endpoint)
+
+        self.assertIsNone(get_replica())
@@ -0,0 +1,93 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse_lazy
+from rest_framework import status
+
+from core.metrics import RequestTimings, registry, timed
+from .. import factories
+
+PLAN_LIST_COUNT = ('http_request_duration_seconds_count', (('view', 'PlanViewSet'), ('action', 'list')))
+
+
+class TestRequestTimings(TestCase):
+    def test_nested_calls(self):
+        """ Tests whether calls made by a call of the same kind only count once, and nothing counts outside requests. """
+        with timed('cache'):
+            pass
+
+        timings = RequestTimings()
+        timings.start()
+        self.addCleanup(timings.stop)
+        with timed('cache'):
+            with timed('cache'):
+                pass
+        with timed('db'):
+            pass
+
+        self.assertEqual(timings.counts, {'cache': 1, 'db': 1})
+
+
+class TestRequestMetrics(TestCase):
+    def setUp(self) -> None:
+        self.user = factories.UserFactory()
+        self.client.force_login(self.user)
+        self.endpoint = reverse_lazy('application:plan-list')
+        factories.PlanFactory.create_batch(3)
+
+    @override_settings(METRICS_SERVER_TIMING=True)
+    def test_server_timing(self):
+        """ Tests whether responses tell the queries of the request and its timings. """
+        response = self.client.get(self.endpoint)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        entries = dict(entry.split(';', 1) for entry in response['Server-Timing'].split(', '))
+        self.assertIn('queries"', entries['db'])
+        self.assertIn('serialize', entries)
+        self.assertIn('render', entries)
+        self.assertIn('total', entries)
+
+    @override_settings(METRICS_SERVER_TIMING=False)
+    def test_no_server_timing(self):
+        """ Tests whether the Server-Timing header can be turned off. """
+        response = self.client.get(self.endpoint)
+        self.assertNotIn('Server-Timing', response)
+
+    def test_metrics(self):
+        """ Tests whether requests are counted by viewset and action in the Prometheus format. """
+        count = int(registry.collect().get(PLAN_LIST_COUNT, 0))
+        self.client.get(self.endpoint)
+        self.assertEqual(registry.collect()[PLAN_LIST_COUNT], count + 1)
+
+        with self.settings(METRICS_TOKEN='token'):
+            response = self.client.get(reverse_lazy('metrics'), HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+        lines = response.content.decode().splitlines()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', lines)
+        buckets = [line for line in lines if line.startswith(
+            'http_request_duration_seconds_bucket{view="PlanViewSet",action="list"'
+        )]
+        self.assertEqual(len(buckets), 12)
+        self.assertTrue(buckets[-1].startswith(
+            'http_request_duration_seconds_bucket{view="PlanViewSet",action="list",le="+Inf"}'
+        ))
+        self.assertIn(
+            f'http_request_duration_seconds_count{{view="PlanViewSet",action="list"}} {count + 1}', lines
+        )
+        self.assertTrue([line for line in lines if line.startswith(
+            'http_request_timing_calls_total{view="PlanViewSet",action="list",timing="db"}'
+        )])
+
+    def test_metrics_restricted(self):
+        """ Tests whether /metrics needs the token or an allowed IP, and is closed without them. """
+        endpoint = reverse_lazy('metrics')
+        self.assertEqual(self.client.get(endpoint).status_code, status.HTTP_403_FORBIDDEN)
+
+        with self.settings(METRICS_TOKEN='token'):
+            response = self.client.get(endpoint, HTTP_AUTHORIZATION='Bearer other')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        with self.settings(METRICS_ALLOWED_IPS=['10.0.0.2']):
+            self.assertEqual(self.client.get(endpoint).status_code, status.HTTP_403_FORBIDDEN)
+            response = self.client.get(endpoint, REMOTE_ADDR='10.0.0.2')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,84 @@
+import http.client
+import socket
+import subprocess
+import sys
+import time
+
+import psutil
+from django.conf import settings
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(predicate, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.1)
+    raise AssertionError('Timed out')
+
+
+class TestServeCommand(SimpleTestCase):
+    """ Runs `manage.py serve` in a subprocess, on the configured database """
+
+    def setUp(self) -> None:
+        self.port = get_free_port()
+        self.path = reverse('application:plan-list')
+        self.process = subprocess.Popen(
+            [sys.executable, 'manage.py', 'serve', '--host', '127.0.0.1', '--port', str(self.port), '--workers', '1',
+             '--max-requests', '2', '--max-requests-jitter', '0', '--graceful-timeout', '10', '--verbosity', '0'],
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.addCleanup(self.process.wait)
+        self.addCleanup(self.process.kill)
+        self.worker = wait_until(self.get_worker)
+        wait_until(self.is_listening)
+
+    def get_worker(self):
+        children = psutil.Process(self.process.pid).children()
+        return children[0].pid if children else None
+
+    def is_listening(self):
+        with socket.socket() as sock:
+            return sock.connect_ex(('127.0.0.1', self.port)) == 0
+
+    def request(self, connection):
+        connection.request('GET', self.path)
+        response = connection.getresponse()
+        response.read()
+        return response
+
+    def test_worker_recycling(self):
+        """ Workers are replaced after serving --max-requests requests """
+        for _ in range(2):
+            connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+            self.assertEqual(self.request(connection).status, 401)
+            connection.close()
+
+        new_worker = wait_until(lambda: self.get_worker() not in (None, self.worker) and self.get_worker())
+        self.assertNotEqual(new_worker, self.worker)
+
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+        self.assertEqual(self.request(connection).status, 401)
+        connection.close()
+
+    def test_graceful_stop(self):
+        """ SIGTERM closes the idle keep-alive connections and stops the workers """
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+        self.assertEqual(self.request(connection).status, 401)
+
+        self.process.terminate()
+        self.assertEqual(self.process.wait(timeout=10), 0)
+        self.assertFalse(psutil.pid_exists(self.worker))
+        self.assertEqual(connection.sock.recv(1), b'')
+        connection.close()
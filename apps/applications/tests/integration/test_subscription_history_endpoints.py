@@ -1,8 +1,13 @@
+import csv
+import io
+
 from django.test import TestCase
 from django.urls import reverse_lazy
 from rest_framework import status
 
 from .. import factories
+from ...enums import PlanActionType
+from ...models import SubscriptionHistory
 
 
 class PlanCreationEndpointTestCase(TestCase):
@@ -55,6 +60,61 @@ class TestSubscriptionHistoryListEndpoint(TestCase):
         for item in self.items_to_ignore:
             self.assertNotIn(str(item.pk), not_pks)
 
+    def test_list_filters(self):
+        """ Tests whether the list is filtered by creation range and action type. """
+        self.client.force_login(self.user)
+        SubscriptionHistory.objects.update(action_type=PlanActionType.SUBSCRIBE)
+        SubscriptionHistory.objects.filter(pk=self.items[0].pk).update(created_at='2026-01-15T00:00:00Z')
+        SubscriptionHistory.objects.filter(pk=self.items[1].pk).update(
+            created_at='2026-02-15T00:00:00Z',
+            action_type=PlanActionType.UNSUBSCRIBE,
+        )
+
+        response = self.client.get(self.endpoint, {'since': '2026-01-01T00:00:00Z', 'until': '2026-03-01T00:00:00Z'})
+        self.assertEqual([i['id'] for i in response.json()['results']], [str(self.items[0].pk), str(self.items[1].pk)])
+
+        response = self.client.get(self.endpoint, {'action_type': PlanActionType.UNSUBSCRIBE})
+        self.assertEqual([i['id'] for i in response.json()['results']], [str(self.items[1].pk)])
+
+    def test_list_cursor_pagination(self):
+        """ Tests whether cursor pages follow the creation order without gaps nor repeats. """
+        self.client.force_login(self.user)
+
+        pks = list()
+        response = self.client.get(self.endpoint, {'pagination': 'cursor', 'limit': 3})
+        while True:
+            result = response.json()
+            self.assertNotIn('count', result)
+            pks.extend(i['id'] for i in result['results'])
+            if not result['next']:
+                break
+            response = self.client.get(result['next'])
+
+        expected = SubscriptionHistory.objects.filter(app=self.app).order_by('created_at', 'id')
+        self.assertEqual(pks, [str(pk) for pk in expected.values_list('pk', flat=True)])
+
+    def test_list_invalid_application(self):
+        """ Tests whether an invalid application id is rejected. """
+        self.client.force_login(self.user)
+        endpoint = reverse_lazy('application:app-subscriptions-list', kwargs={'app_id': 'not-a-uuid'})
+
+        response = self.client.get(endpoint)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_csv_export(self):
+        """ Tests whether the whole history of the app is streamed as CSV. """
+        self.client.force_login(self.user)
+        response = self.client.get(self.endpoint, HTTP_ACCEPT='text/csv')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual({r['id'] for r in rows}, {str(item.pk) for item in self.items})
+        self.assertIn('action_type', rows[0])
+
 
 class TestSubscriptionHistoryItemEndpoint(TestCase):
     def setUp(self) -> None:
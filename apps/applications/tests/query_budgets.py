@@ -0,0 +1,97 @@
+"""
+Query budgets of the API endpoints: the most queries a request may make, whatever the
+number of rows it reads or writes, so an N+1 fails the suite instead of reaching
+production. Every request of the tests is checked by the `query_budgets` fixture
+(see conftest.py), and every endpoint of the API must have a budget.
+
+Budgets count everything the request runs, session and user lookups and the savepoints
+of the request transaction included.
+"""
+from contextlib import ExitStack, contextmanager
+
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+NAMESPACE = 'application'
+
+QUERY_BUDGETS = {
+    # (URL name, method): queries
+    ('application:plan-list', 'GET'): 5,
+    ('application:plan-list', 'POST'): 5,
+    ('application:plan-detail', 'GET'): 4,
+    ('application:plan-detail', 'PUT'): 6,
+    ('application:plan-detail', 'PATCH'): 7,
+    ('application:plan-detail', 'DELETE'): 7,
+    # Also grows by chunk of migrated applications, see migrate_applications_plan()
+    ('application:plan-migrate', 'POST'): 14,
+    ('application:application-list', 'GET'): 6,
+    ('application:application-list', 'POST'): 7,
+    ('application:application-bulk', 'POST'): 9,
+    ('application:application-detail', 'GET'): 5,
+    ('application:application-detail', 'PUT'): 14,
+    ('application:application-detail', 'PATCH'): 14,
+    ('application:application-detail', 'DELETE'): 9,
+    ('application:app-subscriptions-list', 'GET'): 4,
+    ('application:app-subscriptions-list', 'POST'): 5,
+    ('application:app-subscriptions-detail', 'GET'): 3,
+    ('application:app-subscriptions-detail', 'PUT'): 5,
+    ('application:app-subscriptions-detail', 'PATCH'): 5,
+    ('application:app-subscriptions-detail', 'DELETE'): 5,
+    ('application:analytics-list', 'GET'): 5,
+    ('application:analytics-summary', 'GET'): 4,
+}
+
+
+class QueryBudgetRecorder:
+    """ Counts the queries of each request of the test client, checks them against the budgets """
+
+    def __init__(self, budgets, namespace=NAMESPACE):
+        self.budgets = budgets
+        self.namespace = namespace
+        self.request = None
+        self.queries = None
+        self.violations = list()
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.queries is not None:
+            self.queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def recording(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+
+            request_started.connect(self.start_request)
+            request_finished.connect(self.finish_request)
+            stack.callback(request_started.disconnect, self.start_request)
+            stack.callback(request_finished.disconnect, self.finish_request)
+            yield self
+
+    def start_request(self, sender, environ=None, scope=None, **kwargs):
+        if environ is not None:
+            self.request = (environ['REQUEST_METHOD'], environ['PATH_INFO'])
+        else:
+            self.request = (scope['method'], scope['path'])
+        self.queries = 0
+
+    def finish_request(self, sender, **kwargs):
+        if self.queries is None:
+            return
+        (method, path), queries = self.request, self.queries
+        self.request = self.queries = None
+
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return
+        if match.namespace != self.namespace:
+            return
+
+        budget = self.budgets.get((match.view_name, method))
+        if budget is None:
+            self.violations.append(f'{method} {path}: {queries} queries, no budget for {match.view_name} {method}')
+        elif queries > budget:
+            self.violations.append(f'{method} {path}: {queries} queries, over the budget of {budget}')
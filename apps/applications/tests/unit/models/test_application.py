@@ -1,7 +1,9 @@
 from decimal import Decimal
+from django.db.models.signals import post_init
 from django.test import TestCase
 
 from ... import factories
+from ....models import Application
 
 
 class TestApplicationModelTestCase(TestCase):
@@ -47,3 +49,31 @@ class TestApplicationModelTestCase(TestCase):
         # Old value is not the current free plan, but the first one persisted
         self.assertEqual(app.has_changed('plan_id'), True)
         self.assertEqual(app.old_value('plan_id'), plan.pk)
+
+    def test_track_loaded_plan_changes(self):
+        """ Tests whether plan changes are tracked on apps loaded from the database. """
+        plan = factories.PlanFactory()
+        app = factories.ApplicationFactory(plan=plan)
+
+        for loaded in (Application.objects.get(pk=app.pk), Application.objects.only('name').get(pk=app.pk)):
+            self.assertEqual(loaded.has_changed('plan_id'), False)
+            self.assertEqual(loaded.whats_changed(), {})
+
+            loaded.plan = None
+            self.assertEqual(loaded.has_changed('plan_id'), True)
+            self.assertEqual(loaded.old_value('plan_id'), plan.pk)
+            self.assertEqual(loaded.whats_changed(), {'plan_id': plan.pk})
+
+    def test_track_deferred_plan_changes(self):
+        """ Tests whether a deferred plan changed before being read is still tracked. """
+        plan = factories.PlanFactory()
+        app = factories.ApplicationFactory(plan=plan)
+
+        loaded = Application.objects.only('name').get(pk=app.pk)
+        loaded.plan = None
+        self.assertEqual(loaded.has_changed('plan_id'), True)
+        self.assertEqual(loaded.old_value('plan_id'), plan.pk)
+
+    def test_track_without_post_init(self):
+        """ Tests whether loading apps does not dispatch post_init. """
+        self.assertFalse(post_init.has_listeners(Application))
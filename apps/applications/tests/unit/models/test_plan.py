@@ -1,8 +1,11 @@
 from decimal import Decimal
+from unittest import mock
 
+from django.db.models import QuerySet
 from django.test import TestCase
 
 from ... import factories
+from ....models import Application, Plan
 
 
 class TestPlanModel(TestCase):
@@ -15,3 +18,70 @@ class TestPlanModel(TestCase):
 
         plan.clean()
         self.assertEqual(plan.price, Decimal(0))
+
+
+class TestPlanCatalog(TestCase):
+    def setUp(self) -> None:
+        self.plan = factories.PlanFactory(price=Decimal(10))
+
+    def test_catalog_reads_without_queries(self):
+        """ Tests whether plans are served from the snapshot once it is loaded. """
+        Plan.catalog.load()
+
+        with self.assertNumQueries(0):
+            entry = Plan.catalog.get(self.plan.pk)
+
+        self.assertEqual(entry.pk, self.plan.pk)
+        self.assertEqual(entry.name, self.plan.name)
+        self.assertEqual(entry.price, self.plan.price)
+
+    def test_catalog_finds_new_plans(self):
+        """ Tests whether a plan created after the snapshot is still found. """
+        Plan.catalog.load()
+        plan = factories.PlanFactory()
+
+        self.assertEqual(Plan.catalog.get(plan.pk).name, plan.name)
+        self.assertIsNone(Plan.catalog.get(factories.PlanFactory.build().pk))
+
+    def test_catalog_drops_changed_plans(self):
+        """ Tests whether saving a plan drops the snapshot. """
+        Plan.catalog.load()
+        self.plan.price = Decimal(20)
+        self.plan.save()
+
+        self.assertEqual(Plan.catalog.get(self.plan.pk).price, Decimal(20))
+
+    def test_catalog_cleared_during_load(self):
+        """ Tests whether a load does not install rows read before a concurrent clear. """
+        values_list = QuerySet.values_list
+
+        def clear_then_read(queryset, *fields):
+            Plan.catalog.clear()
+            return values_list(queryset, *fields)
+
+        with mock.patch.object(QuerySet, 'values_list', clear_then_read):
+            entries = Plan.catalog.load()
+
+        self.assertIn(self.plan.pk, entries)
+        self.assertIsNone(Plan.catalog._snapshot)
+
+        Plan.catalog.load()
+        self.assertIsNotNone(Plan.catalog._snapshot)
+
+    def test_application_reads_plan_from_catalog(self):
+        """ Tests whether an application does not load its plan to know if it is free. """
+        app = factories.ApplicationFactory(plan=self.plan)
+        app = Application.objects.get(pk=app.pk)
+        Plan.catalog.load()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(app.free, False)
+
+    def test_application_plan_is_catalog_entry(self):
+        """ Tests whether an application returns its plan as a catalog entry, whether the plan is loaded or not. """
+        app = factories.ApplicationFactory(plan=self.plan)
+        loaded = Application.objects.select_related('plan').get(pk=app.pk)
+        unloaded = Application.objects.get(pk=app.pk)
+
+        self.assertIsInstance(loaded.get_plan(), Plan.catalog.entry_class)
+        self.assertEqual(loaded.get_plan(), unloaded.get_plan())
@@ -1,7 +1,13 @@
 from decimal import Decimal
+from io import StringIO
 
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
 
+from core.db.partitioning import add_months, get_partition_name, get_partitions, month_start
+from core.models.mixins import DomainRuleMixin, RuleInstanceTypeError, RuleIntegrityError
 from ... import factories
 from .... import constants, models
 
@@ -72,3 +78,56 @@ class TestSubscriptionHistoryModel(TestCase):
         self.assertEqual(history.old_price_display, str(plan1.price))
         self.assertEqual(history.track_plan_price, f'{plan1.price} -> {plan2.price}')
 
+    def test_deletion_rules(self):
+        """ Tests whether deletion rules prevent a history from being deleted. """
+        app = factories.ApplicationFactory(plan=None)
+        app.plan = factories.PlanFactory()
+        app.save()
+        history = models.SubscriptionHistory.objects.get(app=app)
+
+        with self.assertRaises(RuleIntegrityError):
+            history.delete()
+
+        self.assertTrue(models.SubscriptionHistory.objects.filter(pk=history.pk).exists())
+
+    def test_invalid_rules_rejected_on_class_creation(self):
+        """ Tests whether rules that are not rule checkers are rejected when the class is declared. """
+        with self.assertRaises(RuleInstanceTypeError):
+            type('InvalidRules', (DomainRuleMixin,), {'integrity_rules': (object,)})
+
+        with self.assertRaises(RuleInstanceTypeError):
+            type('InvalidRules', (DomainRuleMixin,), {'deletion_rules': (object(),)})
+
+
+class TestSubscriptionHistoryPartitions(TestCase):
+    def test_rows_routed_to_monthly_partition(self):
+        """ Tests whether history rows are stored in the partition of their month. """
+        table = models.SubscriptionHistory._meta.db_table
+        call_command('create_history_partitions', verbosity=0)
+        history = factories.SubscriptionHistoryFactory()
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT tableoid::regclass::text FROM {table} WHERE id = %s', [history.pk])
+            partition = cursor.fetchone()[0]
+
+        self.assertEqual(partition, get_partition_name(table, month_start(history.created_at)))
+
+    def test_create_partitions_is_idempotent(self):
+        """ Tests whether creating the partitions again leaves them unchanged. """
+        table = models.SubscriptionHistory._meta.db_table
+        call_command('create_history_partitions', verbosity=0)
+        partitions = get_partitions(table)
+
+        out = StringIO()
+        call_command('create_history_partitions', stdout=out)
+
+        self.assertEqual(get_partitions(table), partitions)
+        self.assertEqual(out.getvalue(), '')
+
+    def test_create_partitions_months_ahead(self):
+        """ Tests whether the partitions are created up to the configured number of months ahead. """
+        table = models.SubscriptionHistory._meta.db_table
+        call_command('create_history_partitions', verbosity=0)
+
+        last = add_months(timezone.now().date(), constants.HISTORY_PARTITION_MONTHS_AHEAD)
+        self.assertIn(get_partition_name(table, last), get_partitions(table))
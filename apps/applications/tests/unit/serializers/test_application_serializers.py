@@ -0,0 +1,47 @@
+from django.test import TestCase
+
+from ... import factories
+from ....api import serializers
+
+
+class ApplicationSerializerFieldsTestCase(TestCase):
+    def setUp(self) -> None:
+        self.app = factories.ApplicationFactory()
+
+    def get_data(self, compile_fields, **context):
+        class Serializer(serializers.ApplicationSerializer):
+            pass
+
+        Serializer.compile_fields = compile_fields
+        return Serializer(instance=self.app, context=context).data
+
+    def test_compiled_output_matches_declared_fields(self):
+        """ Tests whether compiled serializers render the same output as plain ones. """
+        contexts = [
+            {},
+            {'fields': ['id', 'name', 'plan']},
+            {'fields': ['user']},
+            {'fields': ['unknown']},
+            {'fields': ['id', 'name'], 'excluded_fields': ['name']},
+            {'excluded_fields': ['description', 'plan']},
+        ]
+
+        for context in contexts:
+            with self.subTest(context=context):
+                self.assertEqual(self.get_data(True, **context), self.get_data(False, **context))
+
+    def test_field_set_is_compiled_once(self):
+        """ Tests whether the pruned field set is cached per requested fields. """
+        context = {'fields': ['id', 'name']}
+        serializer_class = serializers.ApplicationSerializer
+
+        first = serializer_class(context=context)
+        self.assertEqual(list(first.fields), ['id', 'name'])
+
+        key = first.get_compiled_fields_key(first.get_field_prototypes())
+        self.assertEqual(serializer_class._compiled_field_names[key], ('id', 'name'))
+
+        second = serializer_class(context=context)
+        self.assertEqual(list(second.fields), ['id', 'name'])
+        self.assertIsNot(first.fields['name'], second.fields['name'])
+        self.assertIs(second.fields['name'].parent, second)
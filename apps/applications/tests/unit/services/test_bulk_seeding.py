@@ -0,0 +1,115 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+
+from core.db.bulk_load import copy_rows, deferred_indexes_and_foreign_keys
+from ....models import Application, SubscriptionHistory, SubscriptionRollup
+from ....services import rebuild_subscription_rollups
+
+VOLUMES = {'users': 3, 'applications': 12, 'histories': 40}
+
+
+class TestSeedBulkCommand(TestCase):
+    def seed(self, **options):
+        call_command('seed_bulk', verbosity=0, interactive=False, force=True, **VOLUMES, **options)
+
+    def get_history_ids(self):
+        return list(SubscriptionHistory.objects.order_by('created_at', 'id').values_list('pk', flat=True))
+
+    def test_seed(self):
+        """ Tests whether the seeded applications are on the plan their histories lead to. """
+        self.seed(clear=True)
+
+        self.assertEqual(Application.objects.count(), VOLUMES['applications'])
+        self.assertEqual(SubscriptionHistory.objects.count(), VOLUMES['histories'])
+        for app in Application.objects.all():
+            last = app.histories.order_by('created_at').last()
+            self.assertEqual(last.current_plan_id, app.plan_id)
+            self.assertGreaterEqual(last.created_at, app.created_at)
+
+    def test_rollups(self):
+        """ Tests whether the seeded rollups are those rebuilt from the seeded histories. """
+        self.seed(clear=True)
+        fields = ('plan_id', 'day', 'subscribes', 'unsubscribes', 'upgrades', 'downgrades', 'switches',
+                  'subscribers', 'revenue')
+        seeded = set(SubscriptionRollup.objects.values_list(*fields))
+
+        rebuild_subscription_rollups()
+        self.assertEqual(set(SubscriptionRollup.objects.values_list(*fields)), seeded)
+
+    def test_deterministic(self):
+        """ Tests whether a seed always gives the same rows, and another seed other rows. """
+        self.seed(clear=True, seed=1)
+        history_ids = self.get_history_ids()
+
+        self.seed(clear=True, seed=1)
+        self.assertEqual(self.get_history_ids(), history_ids)
+        self.seed(clear=True, seed=2)
+        self.assertNotEqual(self.get_history_ids(), history_ids)
+
+    def test_seed_again(self):
+        """ Tests whether seeding the same rows again fails, rather than duplicating the plans. """
+        self.seed(clear=True)
+
+        with self.assertRaises(CommandError):
+            self.seed()
+
+        out = StringIO()
+        call_command('seed_bulk', clear=True, interactive=False, force=True, stdout=out, **VOLUMES)
+        self.assertIn(f'applications_subscriptionhistory: {VOLUMES["histories"]} rows', out.getvalue())
+
+    def test_clear_safeguards(self):
+        """ Tests whether clearing needs DEBUG or --force, and a confirmation unless --no-input. """
+        self.seed(clear=True)
+
+        with self.assertRaisesMessage(CommandError, 'DEBUG'):
+            call_command('seed_bulk', clear=True, interactive=False, verbosity=0, **VOLUMES)
+
+        with mock.patch('builtins.input', return_value='no') as prompt:
+            with self.assertRaisesMessage(CommandError, 'cancelled'):
+                call_command('seed_bulk', clear=True, force=True, verbosity=0, **VOLUMES)
+        prompt.assert_called_once()
+
+        with self.settings(DEBUG=True), mock.patch('builtins.input', return_value='yes'):
+            call_command('seed_bulk', clear=True, verbosity=0, **VOLUMES)
+        self.assertEqual(Application.objects.count(), VOLUMES['applications'])
+
+
+class TestBulkLoad(TestCase):
+    def get_indexes(self):
+        with connection.cursor() as cursor:
+            return connection.introspection.get_constraints(cursor, SubscriptionHistory._meta.db_table)
+
+    def test_indexes_created_again(self):
+        """ Tests whether the indexes and foreign keys dropped during a load are the same after it. """
+        indexes = self.get_indexes()
+
+        with transaction.atomic(), deferred_indexes_and_foreign_keys([SubscriptionHistory]):
+            self.assertNotIn('history_app_created_idx', self.get_indexes())
+
+        self.assertEqual(self.get_indexes(), indexes)
+
+    def test_foreign_keys_validated(self):
+        """ Tests whether rows loaded without foreign keys are still checked. """
+        row = {
+            'id': '00000000-0000-4000-8000-000000000000',
+            'app_id': '00000000-0000-4000-8000-000000000001',
+            'old_plan_id': None,
+            'current_plan_id': None,
+            'old_plan_name': None,
+            'current_plan_name': 'Tab\tand newline\n',
+            'action_type': 'subscribe',
+            'old_price': None,
+            'current_price': None,
+            'created_at': SubscriptionHistory._meta.get_field('created_at').pre_save(SubscriptionHistory(), True),
+        }
+
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic(), deferred_indexes_and_foreign_keys([SubscriptionHistory]):
+                self.assertEqual(copy_rows(SubscriptionHistory, [row]), 1)
+                history = SubscriptionHistory.objects.get(pk=row['id'])
+                self.assertEqual(history.current_plan_name, row['current_plan_name'])
+                self.assertIsNone(history.old_plan_name)
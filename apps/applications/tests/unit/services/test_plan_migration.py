@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from ... import factories
+from ....enums import PlanActionType
+from ....models import Application, SubscriptionHistory
+from ....services import migrate_applications_plan
+
+
+class PlanMigrationTestCase(TestCase):
+    def setUp(self) -> None:
+        self.cheap = factories.PlanFactory(price=Decimal(10))
+        self.expensive = factories.PlanFactory(price=Decimal(100))
+        self.same_price = factories.PlanFactory(price=Decimal(10))
+
+    def test_migration_classifies_histories(self):
+        """ Tests whether each app gets the history matching its own old plan. """
+        upgraded = factories.ApplicationFactory(plan=self.cheap)
+        downgraded = factories.ApplicationFactory(plan=self.expensive)
+        subscribed = factories.ApplicationFactory(plan=None)
+        switched = factories.ApplicationFactory(plan=self.same_price)
+        queryset = Application.objects.filter(pk__in=[upgraded.pk, downgraded.pk, subscribed.pk, switched.pk])
+
+        migrate_applications_plan(queryset, self.same_price)
+
+        self.assertEqual(set(queryset.values_list('plan_id', flat=True)), {self.same_price.pk})
+        histories = dict(SubscriptionHistory.objects.values_list('app_id', 'action_type'))
+        self.assertEqual(histories, {
+            upgraded.pk: PlanActionType.SWITCH,
+            downgraded.pk: PlanActionType.DOWNGRADE,
+            subscribed.pk: PlanActionType.SUBSCRIBE,
+        })
+
+    def test_migration_to_no_plan(self):
+        """ Tests whether migrating to no plan unsubscribes the apps. """
+        app = factories.ApplicationFactory(plan=self.cheap)
+
+        self.assertEqual(migrate_applications_plan(Application.objects.all(), None), 1)
+
+        app.refresh_from_db()
+        self.assertIsNone(app.plan_id)
+        history = SubscriptionHistory.objects.get(app=app)
+        self.assertEqual(history.action_type, PlanActionType.UNSUBSCRIBE)
+        self.assertEqual(history.old_plan_name, self.cheap.name)
+
+    def test_migration_queries_do_not_scale_with_rows(self):
+        """ Tests whether a chunk costs the same number of queries whatever its size. """
+        factories.ApplicationFactory.create_batch(2, plan=self.cheap)
+        with CaptureQueriesContext(connection) as few:
+            migrate_applications_plan(Application.objects.filter(plan=self.cheap), self.expensive)
+
+        factories.ApplicationFactory.create_batch(20, plan=self.cheap)
+        with CaptureQueriesContext(connection) as many:
+            migrated = migrate_applications_plan(Application.objects.filter(plan=self.cheap), self.expensive)
+
+        self.assertEqual(migrated, 20)
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(SubscriptionHistory.objects.filter(action_type=PlanActionType.UPGRADE).count(), 22)
+
+    def test_migration_in_chunks(self):
+        """ Tests whether every app is migrated when they span several chunks. """
+        factories.ApplicationFactory.create_batch(7, plan=self.cheap)
+
+        migrated = migrate_applications_plan(Application.objects.all(), self.expensive, chunk_size=3)
+
+        self.assertEqual(migrated, 7)
+        self.assertEqual(Application.objects.filter(plan=self.expensive).count(), 7)
+        self.assertEqual(SubscriptionHistory.objects.count(), 7)
+
+    def test_admin_action_out_of_request_transaction(self):
+        """ Tests whether the admin action migrates the apps outside of the request transaction. """
+        app = factories.ApplicationFactory(plan=self.cheap)
+        endpoint = reverse('admin:applications_plan_changelist')
+        self.assertIn('default', resolve(endpoint).func._non_atomic_requests)
+
+        self.client.force_login(factories.UserFactory(is_staff=True, is_superuser=True))
+        response = self.client.post(endpoint, {
+            'action': 'migrate_applications',
+            ACTION_CHECKBOX_NAME: [str(self.cheap.pk)],
+            'apply': '1',
+            'plan': str(self.expensive.pk),
+        })
+
+        self.assertEqual(response.status_code, 302)
+        app.refresh_from_db()
+        self.assertEqual(app.plan_id, self.expensive.pk)
@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from ... import factories
+from ....models import Application, SubscriptionRollup
+from ....services import get_plan_totals, migrate_applications_plan, rebuild_subscription_rollups
+
+
+class SubscriptionRollupTestCase(TestCase):
+    def setUp(self) -> None:
+        self.cheap = factories.PlanFactory(price=Decimal(10))
+        self.expensive = factories.PlanFactory(price=Decimal(100))
+
+    def get_rollup(self, plan):
+        return SubscriptionRollup.objects.get(plan_id=plan.pk, day=timezone.localdate())
+
+    def get_totals(self):
+        return get_plan_totals(timezone.localdate())
+
+    def test_plan_changes_update_rollups(self):
+        """ Tests whether subscribing, upgrading and unsubscribing move subscribers and revenue. """
+        app = factories.ApplicationFactory(plan=None)
+
+        app.plan = self.cheap
+        app.save()
+        app.plan = self.expensive
+        app.save()
+        app.plan = None
+        app.save()
+
+        cheap, expensive = self.get_rollup(self.cheap), self.get_rollup(self.expensive)
+        self.assertEqual((cheap.subscribes, cheap.subscribers, cheap.revenue), (1, 0, Decimal(0)))
+        self.assertEqual((expensive.upgrades, expensive.unsubscribes), (1, 1))
+        self.assertEqual((expensive.subscribers, expensive.revenue), (0, Decimal(0)))
+
+    def test_apps_created_and_deleted(self):
+        """ Tests whether apps created with a plan and deleted apps are counted without histories. """
+        app = factories.ApplicationFactory(plan=self.cheap)
+        factories.ApplicationFactory(plan=self.cheap)
+        self.assertEqual(self.get_totals()[self.cheap.pk], (2, Decimal(20)))
+
+        app.delete()
+        self.assertEqual(self.get_totals()[self.cheap.pk], (1, Decimal(10)))
+
+    def test_plan_price_change(self):
+        """ Tests whether a new plan price changes the revenue of its subscribers. """
+        factories.ApplicationFactory.create_batch(3, plan=self.cheap)
+
+        self.cheap.price = Decimal(15)
+        self.cheap.save()
+
+        self.assertEqual(self.get_totals()[self.cheap.pk], (3, Decimal(45)))
+
+    def test_bulk_migration_updates_rollups(self):
+        """ Tests whether a bulk plan migration is added up once per plan and day. """
+        factories.ApplicationFactory.create_batch(4, plan=self.cheap)
+
+        migrate_applications_plan(Application.objects.filter(plan=self.cheap), self.expensive, chunk_size=3)
+
+        totals = self.get_totals()
+        self.assertEqual(totals[self.cheap.pk], (0, Decimal(0)))
+        self.assertEqual(totals[self.expensive.pk], (4, Decimal(400)))
+        self.assertEqual(self.get_rollup(self.expensive).upgrades, 4)
+
+    def test_rebuild_matches_incremental_rollups(self):
+        """ Tests whether rebuilding the rollups gives the totals maintained incrementally. """
+        apps = factories.ApplicationFactory.create_batch(3, plan=self.cheap)
+        apps[0].plan = self.expensive
+        apps[0].save()
+        apps[1].plan = None
+        apps[1].save()
+        expected = self.get_totals()
+        counters = SubscriptionRollup.objects.aggregate(Sum('upgrades'), Sum('unsubscribes'))
+
+        SubscriptionRollup.objects.all().delete()
+        rebuild_subscription_rollups()
+
+        self.assertEqual(self.get_totals(), expected)
+        self.assertEqual(SubscriptionRollup.objects.aggregate(Sum('upgrades'), Sum('unsubscribes')), counters)
@@ -1,16 +1,12 @@
 from importlib import import_module
-from pathlib import Path
 
-from .utils import posixpath_to_modulepath
+from .manifest import get_module_admins
 
 # BE CAREFUL! Do not remove or change this code snippet, this is needed to get
 # Crowdbotics' official modules working properly.
 
 try:
-    admins = Path("").rglob('admin.py')
-
-    for admin in admins:
-        module = import_module(posixpath_to_modulepath(admin), package="modules")
-        from module import *  # noqa
+    for admin in get_module_admins():
+        import_module(admin)
 except (ImportError, IndexError):
     pass
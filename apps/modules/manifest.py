@@ -1,19 +1,116 @@
+import json
+import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from django.urls import path, include
 
 MODULES_PACKAGE_NAME = "modules"
 MODULES_DIR = f"{Path.cwd()}/{MODULES_PACKAGE_NAME}/"
-APPS = Path(MODULES_DIR).rglob("apps.py")
+# Index of the apps, admins, urls and options of the modules, shared by the loaders of this package
+MANIFEST_PATH = f"{Path.cwd()}/.{MODULES_PACKAGE_NAME}-manifest.json"
+MANIFEST_VERSION = 2
+# Directories that hold no module code, not walked
+IGNORED_DIRS = {"__pycache__", "node_modules", "static"}
 
 
-def get_modules():
+def _get_mtime(directory):
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def build_manifest(modules_dir=MODULES_DIR):
+    """
+    Walks `modules_dir` for the apps.py, admin.py, urls.py and options.py of the modules. The
+    modification time of every directory walked is kept: adding or removing a file or
+    a directory changes the one of its parent, which is enough to tell the manifest is
+    outdated without walking again.
+    """
+    root = Path(modules_dir)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "modules_dir": str(root),
+        "directories": {str(root): _get_mtime(root)},
+        "apps": [],
+        "admins": [],
+        "urls": [],
+        "options": [],
+    }
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in IGNORED_DIRS and not name.startswith("."))
+        directory = Path(dirpath)
+        manifest["directories"][dirpath] = _get_mtime(directory)
+
+        module = ".".join((MODULES_PACKAGE_NAME, *directory.relative_to(root).parts))
+        if "apps.py" in filenames:
+            manifest["apps"].append(module)
+        if "admin.py" in filenames:
+            manifest["admins"].append(f"{module}.admin")
+        if "urls.py" in filenames and directory.name != MODULES_PACKAGE_NAME:
+            manifest["urls"].append([directory.name.replace("_", "-"), f"{module}.urls"])
+        if "options.py" in filenames:
+            manifest["options"].append(f"{module}.options")
+
+    return manifest
+
+
+def is_outdated(manifest, modules_dir=MODULES_DIR):
+    return (
+        manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("modules_dir") != str(Path(modules_dir))
+        or any(_get_mtime(directory) != mtime for directory, mtime in manifest["directories"].items())
+    )
+
+
+def load_manifest(manifest_path=MANIFEST_PATH, modules_dir=MODULES_DIR):
+    """
+    Returns the manifest stored in `manifest_path`, rebuilt and stored again when a
+    directory of `modules_dir` changed since.
+    """
     try:
-        modules = []
-        python_package_separator = "."
-        for app in APPS:
-            app_name = app.as_posix().replace(MODULES_DIR, f"{MODULES_PACKAGE_NAME}/")
-            app_name = python_package_separator.join(app_name.split("/")[:-1])
-            modules.append(app_name)
-        return modules
-    except (ImportError, IndexError):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if not is_outdated(manifest, modules_dir):
+            return manifest
+    except (OSError, ValueError, KeyError, AttributeError):
         pass
+
+    manifest = build_manifest(modules_dir)
+    if os.path.isdir(modules_dir):
+        try:
+            fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(manifest_path), suffix=".json")
+            with os.fdopen(fd, "w") as f:
+                json.dump(manifest, f)
+            os.replace(temporary_path, manifest_path)
+        except OSError:
+            pass
+    return manifest
+
+
+@lru_cache(maxsize=None)
+def get_manifest(base_dir=None):
+    """ The manifest of the modules of `base_dir`, by default those of the current directory """
+    if base_dir is None:
+        return load_manifest()
+    return load_manifest(
+        manifest_path=f"{base_dir}/.{MODULES_PACKAGE_NAME}-manifest.json",
+        modules_dir=f"{base_dir}/{MODULES_PACKAGE_NAME}/",
+    )
+
+
+def get_modules():
+    return list(get_manifest()["apps"])
+
+
+def get_module_admins():
+    return list(get_manifest()["admins"])
+
+
+def get_module_urls(base_dir=None):
+    return [tuple(url) for url in get_manifest(str(base_dir) if base_dir else None)["urls"]]
+
+
+def get_module_options():
+    return list(get_manifest()["options"])
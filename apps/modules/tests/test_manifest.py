@@ -0,0 +1,70 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.modules import manifest
+
+
+class TestModulesManifest(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.base_dir = Path(directory.name)
+        self.modules_dir = self.base_dir / manifest.MODULES_PACKAGE_NAME
+        self.manifest_path = str(self.base_dir / '.modules-manifest.json')
+
+        self.add_module('blog', 'apps.py', 'options.py')
+        self.age_directories()
+
+    def add_module(self, path, *files):
+        directory = self.modules_dir / path
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ('__init__.py', *files):
+            (directory / name).touch()
+
+    def age_directories(self):
+        # Directory times have a coarse resolution, changes must happen in a later one
+        past = time.time() - 60
+        for dirpath, _, _ in os.walk(self.modules_dir):
+            os.utime(dirpath, (past, past))
+
+    def load(self):
+        with mock.patch.object(manifest, 'build_manifest', wraps=manifest.build_manifest) as build:
+            loaded = manifest.load_manifest(self.manifest_path, f'{self.modules_dir}/')
+        return loaded, build.called
+
+    def test_not_rebuilt_when_unchanged(self):
+        """ Tests whether the stored manifest is read again while no directory changed. """
+        loaded, rebuilt = self.load()
+        self.assertTrue(rebuilt)
+        self.assertEqual(loaded['apps'], ['modules.blog'])
+        self.assertEqual(loaded['options'], ['modules.blog.options'])
+        self.assertTrue(os.path.isfile(self.manifest_path))
+
+        self.assertEqual(self.load(), (loaded, False))
+
+    def test_rebuilt_on_nested_module(self):
+        """ Tests whether a module added deep in the tree, and a file added to it, rebuild the manifest. """
+        self.load()
+
+        self.add_module('shop/payments_stripe', 'apps.py', 'urls.py')
+        loaded, rebuilt = self.load()
+        self.assertTrue(rebuilt)
+        self.assertEqual(loaded['apps'], ['modules.blog', 'modules.shop.payments_stripe'])
+        self.assertEqual(loaded['urls'], [['payments-stripe', 'modules.shop.payments_stripe.urls']])
+        self.assertFalse(self.load()[1])
+
+        self.age_directories()
+        (self.modules_dir / 'shop' / 'payments_stripe' / 'admin.py').touch()
+        loaded, rebuilt = self.load()
+        self.assertTrue(rebuilt)
+        self.assertEqual(loaded['admins'], ['modules.shop.payments_stripe.admin'])
+
+    def test_urls_of_base_dir(self):
+        """ Tests whether module urls are found from the given base directory, not the current one. """
+        self.add_module('blog', 'urls.py')
+        self.assertEqual(manifest.get_module_urls(self.base_dir), [('blog', 'modules.blog.urls')])
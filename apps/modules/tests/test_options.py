@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.modules.utils import OptionsRegistry
+
+MODULE_SLUG = 'registry-test'
+PACKAGE = 'registry_test_modules'
+
+
+class TestOptionsRegistry(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        root = Path(directory.name)
+
+        package = root / PACKAGE / MODULE_SLUG.replace('-', '_')
+        package.mkdir(parents=True)
+        (root / PACKAGE / '__init__.py').touch()
+        (package / '__init__.py').touch()
+        self.defaults_path = package / 'options.py'
+        self.options_path = root / 'options.json'
+        self.write_defaults('TITLE = "Default"\n')
+        self.write_options({})
+
+        sys.path.insert(0, str(root))
+        self.addCleanup(sys.path.remove, str(root))
+        self.addCleanup(self.forget_modules)
+        patcher = mock.patch(
+            'apps.modules.utils.get_module_options',
+            return_value=[f'{PACKAGE}.{MODULE_SLUG.replace("-", "_")}.options'],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.registry = OptionsRegistry(str(self.options_path), check_interval=0)
+
+    @staticmethod
+    def forget_modules():
+        for name in [name for name in sys.modules if name.split('.')[0] == PACKAGE]:
+            del sys.modules[name]
+
+    def touch_later(self, path):
+        # The time of a rewrite may match the one of the previous write otherwise
+        later = time.time() + 10
+        os.utime(path, (later, later))
+
+    def write_defaults(self, source):
+        self.defaults_path.write_text(source)
+        self.touch_later(self.defaults_path)
+
+    def write_options(self, options):
+        self.options_path.write_text(json.dumps({'module_options': {MODULE_SLUG: options}}))
+        self.touch_later(self.options_path)
+
+    def test_options_file_changes(self):
+        """ Tests whether a change of the options file is picked up once its modification time changes. """
+        self.assertEqual(self.registry.get(MODULE_SLUG, 'TITLE'), 'Default')
+
+        self.write_options({'TITLE': 'Set'})
+        self.assertEqual(self.registry.get(MODULE_SLUG, 'TITLE'), 'Set')
+
+    def test_options_file_checked_every_interval(self):
+        """ Tests whether the options file is not checked again within the check interval. """
+        self.registry.check_interval = 60
+        self.assertEqual(self.registry.get(MODULE_SLUG, 'TITLE'), 'Default')
+
+        self.write_options({'TITLE': 'Set'})
+        self.assertEqual(self.registry.get(MODULE_SLUG, 'TITLE'), 'Default')
+
+        self.registry.reload()
+        self.assertEqual(self.registry.get(MODULE_SLUG, 'TITLE'), 'Set')
+
+    def test_reload_defaults(self):
+        """ Tests whether reload() picks up the changed defaults of the options.py of a module. """
+        self.assertEqual(self.registry.get(MODULE_SLUG, 'TITLE'), 'Default')
+
+        self.write_defaults('TITLE = "Changed default"\n')
+        self.assertEqual(self.registry.get(MODULE_SLUG, 'TITLE'), 'Default')
+
+        self.registry.reload()
+        self.assertEqual(self.registry.get(MODULE_SLUG, 'TITLE'), 'Changed default')
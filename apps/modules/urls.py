@@ -1,9 +1,8 @@
-from pathlib import Path
 from django.conf import settings
 from django.urls import path, include
 from django.db.utils import ProgrammingError
 
-from .utils import posixpath_to_modulepath
+from .manifest import get_module_urls
 
 urlpatterns = []
 
@@ -12,21 +11,7 @@ urlpatterns = []
 # Crowdbotics' official modules working properly.
 
 try:
-    base_dir = Path(settings.BASE_DIR)
-    modules_dir = base_dir / "modules"
-    urls = modules_dir.rglob("urls.py")
-    for url in urls:
-        module_name, _ = url.as_posix().split("/")[-2:]
-        if not module_name == "modules":
-            module_url = module_name.replace("_", "-")
-            urlpatterns += [
-                path(f"{module_url}/",
-                     include(
-                        posixpath_to_modulepath(
-                            url.relative_to(base_dir)
-                        )
-                     )
-                )  # noqa
-            ]
+    for module_url, urls in get_module_urls(settings.BASE_DIR):
+        urlpatterns += [path(f"{module_url}/", include(urls))]  # noqa
 except (ImportError, IndexError, ProgrammingError):
     pass
@@ -1,9 +1,16 @@
 import importlib
 import json
+import os
+import threading
+import time
 
 from pathlib import Path
 
+from .manifest import get_module_options
+
 GLOBAL_OPTIONS_FILE_PATH = f"{Path.cwd()}/modules/options.json"
+# Seconds during which the options file is not checked for changes again
+OPTIONS_CHECK_INTERVAL = 1
 
 
 def posixpath_to_modulepath(posixpath):
@@ -11,25 +18,83 @@ def posixpath_to_modulepath(posixpath):
     return f"{module_parent_path}.{posixpath.stem}"
 
 
-def get_options(module_slug, option_key):
-    with open(GLOBAL_OPTIONS_FILE_PATH, "r") as f:
-        all_module_options = json.loads(f.read())
-        all_module_options = all_module_options.get("module_options", None)
+class OptionsRegistry:
+    """
+    The options of the modules: the values set in the options file by module slug, over
+    the defaults of the options.py of each module. The file is parsed again when its
+    modification time changes, checked at most every `check_interval` seconds, or
+    after reload(), which also imports the options.py of the modules again.
+    """
+
+    def __init__(self, path=GLOBAL_OPTIONS_FILE_PATH, check_interval=OPTIONS_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._defaults = {}
+        # Modules imported before the last reload(), imported again on their next use
+        self._outdated = set()
+        self.reload()
+
+    def reload(self):
+        with self._lock:
+            self._module_options = None
+            self._mtime = None
+            self._next_check = 0
+            self._outdated.update(self._defaults)
+            self._defaults = {}
+
+    def _load_module_options(self):
+        now = time.monotonic()
+        if now >= self._next_check or self._module_options is None:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime != self._mtime or self._module_options is None:
+                with open(self.path, "r") as f:
+                    all_module_options = json.loads(f.read())
+                self._module_options = all_module_options.get("module_options", None) or {}
+                self._mtime = mtime
+            self._next_check = now + self.check_interval
+        return self._module_options
+
+    def get_module_options(self, module_slug):
+        module_options = self._module_options
+        if module_options is None or time.monotonic() >= self._next_check:
+            with self._lock:
+                module_options = self._load_module_options()
 
-    option_value = None
+        return module_options.get(module_slug, None)
 
-    if all_module_options:
-        module_options = all_module_options.get(module_slug, None)
+    def get_defaults(self, module_slug):
+        try:
+            return self._defaults[module_slug]
+        except KeyError:
+            pass
+
+        with self._lock:
+            package = module_slug.replace("-", "_")
+            options_module = next(
+                module for module in get_module_options() if package in module.split(".")[:-1]
+            )
+            defaults = importlib.import_module(options_module)
+            if module_slug in self._outdated:
+                # import_module() returns the module imported before, whatever its file holds now
+                defaults = importlib.reload(defaults)
+                self._outdated.discard(module_slug)
+            self._defaults[module_slug] = defaults
+            return defaults
+
+    def get(self, module_slug, option_key):
+        default_value = getattr(self.get_defaults(module_slug), option_key)
+
+        option_value = None
+        module_options = self.get_module_options(module_slug)
         if module_options:
             option_value = module_options.get(option_key, None)
 
-    module_options_file = next(
-        Path("").rglob(f"**/{module_slug.replace('-', '_')}/**/options.py")
-    )
+        return option_value if option_value else default_value
 
-    options_module = posixpath_to_modulepath(module_options_file)
-    default_value = getattr(
-        importlib.import_module(options_module), option_key
-    )
 
-    return option_value if option_value else default_value
+options_registry = OptionsRegistry()
+
+
+def get_options(module_slug, option_key):
+    return options_registry.get(module_slug, option_key)
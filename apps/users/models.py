@@ -23,3 +23,5 @@ class User(AbstractUser):
         unique=True,
         primary_key=True
     )
+    # Changes of the user data rendered nested in other responses, e.g. their ETag
+    updated_at = models.DateTimeField(auto_now=True)
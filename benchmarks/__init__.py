@@ -0,0 +1,5 @@
+"""
+Performance benchmarks. They are not collected by pytest, run them one at a time:
+
+    python -m benchmarks.bench_serializers
+"""
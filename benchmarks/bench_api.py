@@ -0,0 +1,190 @@
+"""
+Latency and queries of the API endpoints on a large seeded dataset, through the test
+client: listing, retrieving and creating applications, changing their plan and listing
+their subscription history, by page and by cursor.
+
+The dataset is seeded by `manage.py seed_bulk` in a database of its own, the configured
+one suffixed with `_bench`, and kept while its volumes match; --reseed seeds it again,
+e.g. for another --seed. Writes are rolled back so that every run reads the same rows:
+their queries include the savepoint of the request transaction, and their on-commit
+work is not run. With --json, the results are written with the commit and parameters
+of the run to compare runs across commits.
+
+    python -m benchmarks.bench_api --json bench_api.json
+"""
+import random
+import statistics
+import time
+from contextlib import ExitStack
+
+from .utils import get_git_revision, get_parser, report, setup_django
+
+# Requests of each endpoint before measuring, loading the catalogs, caches, connections, ...
+WARMUP = 10
+WRITES = ('create', 'plan_change')
+
+
+def setup_database():
+    """ Switches to the benchmark database, created and migrated when missing """
+    from django.core.management import call_command
+    from django.db import DEFAULT_DB_ALIAS, connection, connections
+
+    settings_dict = connection.settings_dict
+    settings_dict['TEST']['NAME'] = f'{settings_dict["NAME"]}_bench'
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=True)
+
+    # Replicas read the same database
+    for alias in connections:
+        if alias != DEFAULT_DB_ALIAS:
+            connections[alias].close()
+            connections[alias].settings_dict['NAME'] = settings_dict['NAME']
+
+    call_command('create_history_partitions', verbosity=0)
+
+
+def get_volumes():
+    """ Rows of the seeded tables, as SeedDataset.volumes """
+    from django.contrib.auth import get_user_model
+
+    from apps.applications.models import Application, SubscriptionHistory
+
+    return {
+        'users': get_user_model().objects.count(),
+        'applications': Application.objects.count(),
+        'histories': SubscriptionHistory.objects.count(),
+    }
+
+
+def get_scenarios(client, seed, requests):
+    """ {name: send(index)}, each request on an application drawn for the seed """
+    from django.urls import reverse
+
+    from apps.applications.enums import AppFramework, AppType
+    from apps.applications.models import Application, Plan
+
+    applications = list(Application.objects.order_by('pk').values_list('pk', 'plan_id'))
+    plan_ids = list(Plan.objects.order_by('pk').values_list('pk', flat=True))
+    sample = random.Random(seed).sample(applications, min(len(applications), WARMUP + requests))
+
+    list_url = reverse('application:application-list')
+
+    def detail_url(index):
+        return reverse('application:application-detail', kwargs={'id': sample[index % len(sample)][0]})
+
+    def history_url(index):
+        return reverse('application:app-subscriptions-list', kwargs={'app_id': sample[index % len(sample)][0]})
+
+    def other_plan(index):
+        plan_id = sample[index % len(sample)][1]
+        position = plan_ids.index(plan_id) + 1 if plan_id in plan_ids else 0
+        return str(plan_ids[position % len(plan_ids)])
+
+    def new_application(index):
+        return {
+            'name': f'Benchmark {index}',
+            'type': AppType.WEB,
+            'framework': AppFramework.DJANGO,
+            'screenshot': f'https://bench-{index}.example.com/screenshot.png',
+            'description': 'Created by the API benchmark',
+            'domain_name': f'bench-{index}.example.com',
+            'plan': str(plan_ids[index % len(plan_ids)]),
+        }
+
+    return {
+        'list': lambda index: client.get(list_url),
+        'retrieve': lambda index: client.get(detail_url(index)),
+        'create': lambda index: client.post(list_url, new_application(index), content_type='application/json'),
+        'plan_change': lambda index: client.patch(
+            detail_url(index), {'plan': other_plan(index)}, content_type='application/json'
+        ),
+        'history': lambda index: client.get(history_url(index)),
+        'history_cursor': lambda index: client.get(history_url(index), {'pagination': 'cursor'}),
+    }
+
+
+def send(name, func, index, rollback):
+    """ Latency and queries of a request """
+    from django.db import connections, transaction
+    from django.test.utils import CaptureQueriesContext
+
+    with ExitStack() as stack:
+        captures = [stack.enter_context(CaptureQueriesContext(connection)) for connection in connections.all()]
+        if rollback:
+            stack.enter_context(transaction.atomic())
+
+        started = time.perf_counter()
+        response = func(index)
+        elapsed = time.perf_counter() - started
+
+        if rollback:
+            transaction.set_rollback(True)
+
+    if response.status_code >= 400:
+        raise SystemExit(f'{name}: {response.status_code} {response.content[:500]!r}')
+    return elapsed, sum(len(capture) for capture in captures)
+
+
+def main():
+    parser = get_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=10000, help='Users of the dataset')
+    parser.add_argument('--apps', type=int, default=100000, help='Applications of the dataset')
+    parser.add_argument('--histories', type=int, default=1000000, help='Subscription histories of the dataset')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the dataset and of the requests')
+    parser.add_argument('--reseed', action='store_true', help='Seed the dataset even if its volumes match')
+    parser.add_argument('--requests', type=int, default=100, help='Requests per endpoint and run')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+
+    setup_database()
+    volumes = {'users': args.users, 'applications': args.apps, 'histories': args.histories}
+    if args.reseed or get_volumes() != volumes:
+        print(f'Seeding {volumes}')
+        call_command('seed_bulk', clear=True, interactive=False, force=True, seed=args.seed, **volumes)
+
+    setup_test_environment()
+    # As behind the HTTPS proxy, no redirect to HTTPS
+    client = Client(**{'wsgi.url_scheme': 'https', 'SERVER_PORT': '443'})
+    client.force_login(get_user_model().objects.get(username='user0'))
+
+    results = dict()
+    for name, func in get_scenarios(client, args.seed, args.requests).items():
+        rollback = name in WRITES
+        for index in range(WARMUP):
+            send(name, func, index, rollback)
+
+        latencies, queries = list(), list()
+        for _ in range(args.repeat):
+            for index in range(WARMUP, WARMUP + args.requests):
+                latency, count = send(name, func, index, rollback)
+                latencies.append(latency)
+                queries.append(count)
+
+        latencies.sort()
+        results[name] = {
+            'min': latencies[0],
+            'median': statistics.median(latencies),
+            'max': latencies[-1],
+            'p50_ms': round(statistics.median(latencies) * 1000, 2),
+            'p99_ms': round(latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000, 2),
+            'queries': round(statistics.mean(queries), 1),
+            'max_queries': max(queries),
+        }
+
+    metadata = {
+        'revision': get_git_revision(),
+        'seed': args.seed,
+        'volumes': volumes,
+        'requests': args.requests,
+        'repeat': args.repeat,
+    }
+    title = f'{args.repeat} x {args.requests} requests per endpoint on {volumes}'
+    report(title, results, args.json_path, metadata)
+
+
+if __name__ == '__main__':
+    main()
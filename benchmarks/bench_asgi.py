@@ -0,0 +1,174 @@
+"""
+Load test of the read endpoints served by waitress (WSGI, sync views) and by uvicorn
+(ASGI, async views). Both servers are started locally on the configured database and
+hit by the same number of concurrent keep-alive clients; the throughput and the
+latency percentiles of each are reported.
+
+    python -m benchmarks.bench_asgi --concurrency 64 --duration 10
+"""
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from .utils import get_parser, report, setup_django
+
+BENCH_USERNAME = 'benchmark'
+
+
+def prepare_data(histories):
+    """ A user with a token, a plan and an app with `histories` histories. """
+    from django.contrib.auth import get_user_model
+    from rest_framework.authtoken.models import Token
+
+    from apps.applications import enums, models
+
+    user, _ = get_user_model().objects.get_or_create(username=BENCH_USERNAME, defaults={'email': 'bench@example.com'})
+    token, _ = Token.objects.get_or_create(user=user)
+    plan, _ = models.Plan.objects.get_or_create(name='Benchmark', defaults={'price': 10})
+    app, _ = models.Application.objects.get_or_create(
+        name='Benchmark',
+        user=user,
+        defaults={'plan': plan, 'type': enums.AppType.WEB, 'framework': enums.AppFramework.DJANGO},
+    )
+
+    missing = histories - app.histories.count()
+    if missing > 0:
+        models.SubscriptionHistory.objects.bulk_create([
+            models.SubscriptionHistory(
+                app=app,
+                action_type=enums.PlanActionType.SUBSCRIBE,
+                current_plan_name=plan.name,
+                current_price=plan.price,
+            )
+            for _ in range(missing)
+        ])
+
+    return token.key, [
+        '/v1/plans/',
+        f'/v1/plans/{plan.pk}/',
+        f'/v1/apps/{app.pk}/',
+        f'/v1/apps/{app.pk}/subscriptions/?pagination=cursor',
+    ]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f'Server did not listen on port {port}')
+
+
+def start_server(command, port, env):
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        wait_for_port(port)
+    except RuntimeError:
+        process.kill()
+        raise RuntimeError(process.stderr.read().decode())
+    return process
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(port, requests, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        i = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(requests[i % len(requests)])
+            await writer.drain()
+            if await read_response(reader) == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors.append(1)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run_load(port, paths, token, concurrency, duration):
+    requests = [
+        (f'GET {path} HTTP/1.1\r\nHost: localhost\r\nAuthorization: Token {token}\r\n'
+         f'Accept: application/json\r\n\r\n').encode('ascii')
+        for path in paths
+    ]
+    latencies, errors = list(), list()
+
+    # Warm up every endpoint once
+    await client(port, requests, time.perf_counter() + 1, list(), list())
+
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(client(port, requests, deadline, latencies, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'min': latencies[0],
+        'median': statistics.median(latencies),
+        'max': latencies[-1],
+        'p99_ms': round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        'rps': round(len(latencies) / elapsed, 1),
+        'errors': len(errors),
+    }
+
+
+def main():
+    parser = get_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=64, help='Concurrent keep-alive clients')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of load per server')
+    parser.add_argument('--threads', type=int, default=4, help='Waitress worker threads')
+    parser.add_argument('--histories', type=int, default=200, help='Histories of the benchmark app')
+    parser.add_argument('--port', type=int, default=8765, help='First of the two ports used')
+    args = parser.parse_args()
+
+    setup_django()
+    token, paths = prepare_data(args.histories)
+
+    servers = {
+        f'waitress ({args.threads} threads)': (
+            ['waitress-serve', f'--port={args.port}', f'--threads={args.threads}', 'project.wsgi:application'],
+            args.port,
+            {'ASYNC_READ_VIEWS': 'false'},
+        ),
+        'uvicorn (async views)': (
+            [sys.executable, '-m', 'uvicorn', '--port', str(args.port + 1), '--no-access-log', '--log-level',
+             'warning', 'project.asgi:application'],
+            args.port + 1,
+            {'ASYNC_READ_VIEWS': 'true'},
+        ),
+    }
+
+    results = dict()
+    for name, (command, port, env) in servers.items():
+        process = start_server(command, port, {**os.environ, **env})
+        try:
+            results[name] = asyncio.run(run_load(port, paths, token, args.concurrency, args.duration))
+        finally:
+            process.terminate()
+            process.wait()
+
+    report(f'{len(paths)} read endpoints, {args.concurrency} concurrent clients, {args.duration:g}s each', results,
+           args.json_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Database cost of a request: the connection Django opens on the first query and closes
+when the request finishes, with and without the connection pool, on the configured
+database. Fresh connections also pay the TCP and authentication handshakes, more so
+over the network than on a local socket.
+
+    python -m benchmarks.bench_db_pool --requests 500
+"""
+from .utils import get_parser, measure, report, setup_django
+
+
+def main():
+    parser = get_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500, help='Requests per run')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.signals import request_finished, request_started
+    from django.db import connection
+
+    from core.db.pool import close_pools
+
+    def run():
+        for _ in range(args.requests):
+            request_started.send(sender=None)
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            request_finished.send(sender=None)
+
+    pool_settings = connection.settings_dict['POOL']
+    results = dict()
+    for name, max_size in {'no pool': 0, 'pool': pool_settings['MAX_SIZE'] or 10}.items():
+        connection.settings_dict['POOL'] = {**pool_settings, 'MAX_SIZE': max_size}
+        result = measure(run, args.repeat)
+        result['per_request_ms'] = round(result['median'] / args.requests * 1000, 3)
+        results[name] = result
+        close_pools()
+
+    report(f'{args.requests} requests of one query', results, args.json_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Iterates SubscriptionHistory rows built through Model.from_db() and runs their domain
+validation, with the former per-instance rule handling and with the rules and field
+lists prepared once per model. Also reads EntityMixin.get_values() of applications.
+
+    python -m benchmarks.bench_domain_rules --rows 1000000
+"""
+import uuid
+from contextlib import contextmanager
+from decimal import Decimal
+
+from .utils import get_parser, measure, report, setup_django
+
+
+def build_history_rows(count):
+    from django.utils import timezone
+
+    from apps.applications.enums import PlanActionType
+    from apps.applications.models import SubscriptionHistory
+
+    values = {
+        'app_id': uuid.uuid4(),
+        'old_plan_name': 'Basic',
+        'current_plan_name': 'Premium',
+        'action_type': PlanActionType.UPGRADE,
+        'old_price': Decimal(10),
+        'current_price': Decimal(100),
+        'created_at': timezone.now(),
+    }
+
+    field_names = [f.attname for f in SubscriptionHistory._meta.concrete_fields]
+    rows = list()
+    for _ in range(count):
+        values['id'] = uuid.uuid4()
+        rows.append(tuple(values[name] for name in field_names))
+
+    return field_names, rows
+
+
+def legacy_init(self, *args, **kwargs):
+    from core.models.mixins import RuleInstanceTypeError
+
+    self.ignore_validation = False
+    self.validation_processed = False
+    self.valid = False
+
+    integrity_rules = set()
+    for rule in self.integrity_rules:
+        if self.is_valid_integrity_rule(rule):
+            integrity_rules.add(rule)
+            continue
+        raise RuleInstanceTypeError(rule.__name__)
+
+    deletion_rules = set()
+    for rule in self.deletion_rules:
+        if self.is_valid_deletion_rule(rule):
+            deletion_rules.add(rule)
+            continue
+        raise RuleInstanceTypeError(rule.__class__.__name__)
+
+    super(legacy_init.mixin, self).__init__(*args, **kwargs)
+
+
+def legacy_required_fields_filled(self):
+    required_empty_fields = list()
+    for f in self._meta.get_fields():
+        if getattr(f, 'null', False) is True:
+            continue
+        if getattr(f, 'editable', True) is False:
+            continue
+        if getattr(self, getattr(f, 'attname', f.name), None) is None:
+            required_empty_fields.append(f.name)
+
+
+def legacy_check_integrity_rules(self):
+    for rule in self.integrity_rules:
+        rule().check(self)
+
+
+def legacy_get_values(self, include_hidden=True):
+    values = dict()
+    for f in self._meta.get_fields(include_hidden=include_hidden):
+        name = f.name
+        if f.name == self.get_pk_name():
+            name = 'pk'
+        if f.is_relation is True:
+            continue
+        values[name] = getattr(self, name)
+    return values
+
+
+@contextmanager
+def legacy_rules():
+    from core.models.mixins import DomainRuleMixin, EntityMixin
+
+    legacy_init.mixin = DomainRuleMixin
+    patches = (
+        (DomainRuleMixin, '__init__', legacy_init),
+        (DomainRuleMixin, '_required_fields_filled', legacy_required_fields_filled),
+        (DomainRuleMixin, '_check_integrity_rules', legacy_check_integrity_rules),
+        (EntityMixin, 'get_values', legacy_get_values),
+    )
+    originals = [(cls, name, cls.__dict__.get(name)) for cls, name, _ in patches]
+    for cls, name, func in patches:
+        setattr(cls, name, func)
+    try:
+        yield
+    finally:
+        for cls, name, func in originals:
+            if func is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, func)
+
+
+@contextmanager
+def prepared_rules():
+    yield
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--entities', type=int, default=100000, help='Applications read with get_values()')
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.applications.models import Application, SubscriptionHistory
+
+    field_names, rows = build_history_rows(args.rows)
+    apps = [Application(name=f'App {i}') for i in range(args.entities)]
+
+    def iterate():
+        for row in rows:
+            SubscriptionHistory.from_db('default', field_names, row)
+
+    def iterate_and_validate():
+        for row in rows:
+            SubscriptionHistory.from_db('default', field_names, row).validate(full_clean=False)
+
+    def get_values():
+        for app in apps:
+            app.get_values()
+
+    results = dict()
+    for name, rules in (('before (per instance)', legacy_rules), ('after (per model)', prepared_rules)):
+        with rules():
+            results[f'{name}: iterate'] = measure(iterate, args.repeat)
+            results[f'{name}: iterate + validate'] = measure(iterate_and_validate, args.repeat)
+            results[f'{name}: get_values'] = measure(get_values, args.repeat)
+
+    report(f'{args.rows} subscription histories, {args.entities} applications', results, args.json_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Startup cost of a process: the settings, django.setup() and the URLconf are imported in
+fresh interpreters with `python -X importtime`, every `manage.py` command and server
+worker pays for them.
+
+    python -m benchmarks.bench_importtime --top 15
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .utils import get_parser, report
+
+TARGETS = {
+    'project.settings': 'import project.settings',
+    'django.setup()': 'import django; django.setup()',
+    'project.urls': 'import django; django.setup(); import project.urls',
+}
+
+
+def parse_importtime(output):
+    """
+    Returns [(module, self µs, cumulative µs)] from the output of -X importtime.
+    """
+    imports = list()
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, cumulative, module = line[len('import time:'):].split('|')
+        imports.append((module.strip(), int(self_time), int(cumulative)))
+    return imports
+
+
+def run_target(code, repeat):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'project.settings'}
+    timings = list()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env, capture_output=True,
+                                 text=True, check=True)
+        timings.append(time.perf_counter() - started)
+    return timings, parse_importtime(process.stderr)
+
+
+def main():
+    parser = get_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports listed for each target')
+    args = parser.parse_args()
+
+    results = dict()
+    slowest = dict()
+    for name, code in TARGETS.items():
+        timings, imports = run_target(code, args.repeat)
+        results[name] = {
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'max': max(timings),
+            'modules': len(imports),
+            'import_ms': round(sum(self_time for _, self_time, _ in imports) / 1000, 1),
+        }
+        slowest[name] = sorted(imports, key=lambda item: item[2], reverse=True)[1:args.top + 1]
+
+    report('Process startup, wall time of the interpreter', results, args.json_path)
+    for name, imports in slowest.items():
+        print(f'\nSlowest imports of {name} (cumulative)')
+        for module, _, cumulative in imports:
+            print(f'  {cumulative / 1000:10.2f} ms  {module}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Cost of one get_options() call, the previous implementation against the options
+registry, in a generated checkout of `--files` files holding one module.
+
+    python -m benchmarks.bench_module_options --files 5000 --calls 1000
+"""
+import importlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from .utils import get_parser, measure, report
+
+MODULE_SLUG = 'bench-module'
+
+
+def create_checkout(root, files):
+    """ modules/bench_module with its options.py and the options file, among `files` other files """
+    package = root / 'modules' / MODULE_SLUG.replace('-', '_')
+    package.mkdir(parents=True)
+    (root / 'modules' / '__init__.py').touch()
+    (package / '__init__.py').touch()
+    (package / 'apps.py').touch()
+    (package / 'options.py').write_text('PAGE_SIZE = 20\nTITLE = "Default"\n')
+    (root / 'modules' / 'options.json').write_text(json.dumps({'module_options': {MODULE_SLUG: {'TITLE': 'Set'}}}))
+
+    # Like static files or node_modules in a checkout
+    for i in range(files):
+        directory = root / 'static' / f'{i // 100}'
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f'{i}.js').touch()
+
+
+def legacy_get_options(module_slug, option_key):
+    from apps.modules.utils import GLOBAL_OPTIONS_FILE_PATH, posixpath_to_modulepath
+
+    with open(GLOBAL_OPTIONS_FILE_PATH, "r") as f:
+        all_module_options = json.loads(f.read())
+        all_module_options = all_module_options.get("module_options", None)
+
+    option_value = None
+
+    if all_module_options:
+        module_options = all_module_options.get(module_slug, None)
+        if module_options:
+            option_value = module_options.get(option_key, None)
+
+    module_options_file = next(
+        Path("").rglob(f"**/{module_slug.replace('-', '_')}/**/options.py")
+    )
+
+    options_module = posixpath_to_modulepath(module_options_file)
+    default_value = getattr(
+        importlib.import_module(options_module), option_key
+    )
+
+    return option_value if option_value else default_value
+
+
+def main():
+    parser = get_parser(__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=5000, help='Files of the generated checkout')
+    parser.add_argument('--calls', type=int, default=1000, help='Calls per run')
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    sys.path.insert(0, cwd)
+    with tempfile.TemporaryDirectory() as root:
+        create_checkout(Path(root), args.files)
+        # The modules paths are taken from the working directory on import
+        os.chdir(root)
+        sys.path.insert(0, root)
+        try:
+            from apps.modules.utils import get_options
+
+            implementations = {'legacy (rglob)': legacy_get_options, 'registry': get_options}
+            results = dict()
+            for name, get in implementations.items():
+                assert get(MODULE_SLUG, 'TITLE') == 'Set' and get(MODULE_SLUG, 'PAGE_SIZE') == 20
+
+                def run():
+                    for _ in range(args.calls):
+                        get(MODULE_SLUG, 'TITLE')
+
+                result = measure(run, args.repeat)
+                result['per_call_us'] = round(result['median'] / args.calls * 1e6, 2)
+                results[name] = result
+        finally:
+            os.chdir(cwd)
+
+    report(f'{args.calls} get_options() calls, checkout of {args.files} files', results, args.json_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Serializes in-memory Application rows with and without compiled serializer fields.
+
+    python -m benchmarks.bench_serializers --rows 10000
+"""
+from decimal import Decimal
+
+from .utils import get_parser, measure, report, setup_django
+
+
+def build_rows(count):
+    from django.utils import timezone
+
+    from apps.applications import enums, models
+    from apps.users.models import User
+
+    now = timezone.now()
+    user = User(first_name='Bench', last_name='User', email='bench@example.com')
+    plans = [models.Plan(name=f'Plan {i}', price=Decimal(i * 10), created_at=now, updated_at=now) for i in range(5)]
+
+    return [
+        models.Application(
+            name=f'App {i}',
+            description='Benchmark application',
+            type=enums.AppType.WEB,
+            framework=enums.AppFramework.DJANGO,
+            domain_name=f'app-{i}.example.com',
+            screenshot=f'https://example.com/{i}.png',
+            user=user,
+            plan=plans[i % len(plans)],
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def get_serializer_classes():
+    from django.utils.functional import cached_property
+
+    from apps.applications.api import serializers
+
+    class LegacyPlanSerializer(serializers.SimplePlanSerializer):
+        compile_fields = False
+
+    class LegacyApplicationSerializer(serializers.ApplicationSerializer):
+        compile_fields = False
+
+        @cached_property
+        def plan_serializer(self):
+            return LegacyPlanSerializer()
+
+    return {
+        'before (compile_fields=False)': LegacyApplicationSerializer,
+        'after (compiled)': serializers.ApplicationSerializer,
+    }
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--inits', type=int, default=1000, help='Serializer instantiations per run')
+    args = parser.parse_args()
+
+    setup_django()
+    rows = build_rows(args.rows)
+    context = {'fields': ['id', 'name', 'type', 'plan', 'updated_at']}
+
+    results = dict()
+    for name, serializer_class in get_serializer_classes().items():
+        results[f'{name}: list'] = measure(
+            lambda: serializer_class(rows, many=True).data, args.repeat
+        )
+        results[f'{name}: list ?fields='] = measure(
+            lambda: serializer_class(rows, many=True, context=context).data, args.repeat
+        )
+        results[f'{name}: init'] = measure(
+            lambda: [serializer_class(context=context).fields for _ in range(args.inits)], args.repeat
+        )
+
+    report(f'Serialize {args.rows} applications, {args.inits} serializer inits', results, args.json_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Builds Application rows through Model.from_db(), the path every queryset takes, with
+the former post_init snapshot and with the current lazy change tracking.
+
+    python -m benchmarks.bench_track_data --rows 100000
+"""
+import uuid
+from contextlib import contextmanager
+
+from .utils import get_parser, measure, report, setup_django
+
+
+def build_rows(count):
+    from django.utils import timezone
+
+    from apps.applications import enums, models
+
+    now = timezone.now()
+    plan_ids = [uuid.uuid4() for _ in range(5)]
+    values = {
+        'name': 'App',
+        'description': 'Benchmark application',
+        'type': enums.AppType.WEB,
+        'framework': enums.AppFramework.DJANGO,
+        'domain_name': 'app.example.com',
+        'screenshot': 'https://example.com/app.png',
+        'active': True,
+        'created_at': now,
+        'updated_at': now,
+        'user_id': 1,
+    }
+
+    field_names = [f.attname for f in models.Application._meta.concrete_fields]
+    rows = list()
+    for i in range(count):
+        values.update(id=uuid.uuid4(), plan_id=plan_ids[i % len(plan_ids)])
+        rows.append(tuple(values[name] for name in field_names))
+
+    return field_names, rows
+
+
+@contextmanager
+def post_init_tracking():
+    """ The former implementation: a post_init receiver copying the tracked fields. """
+    from django.db.models.signals import post_init
+
+    from apps.applications.models import Application
+
+    def _post_init(instance, **_):
+        instance._tracked_data = dict((f, getattr(instance, f)) for f in ('plan_id',)) if instance.pk else {}
+
+    lazy_init = Application.__init__
+    Application.__init__ = lazy_init.original
+    post_init.connect(_post_init, sender=Application, weak=False)
+    try:
+        yield
+    finally:
+        post_init.disconnect(_post_init, sender=Application)
+        Application.__init__ = lazy_init
+
+
+@contextmanager
+def lazy_tracking():
+    yield
+
+
+def main():
+    parser = get_parser(__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.applications.models import Application
+
+    field_names, rows = build_rows(args.rows)
+
+    def load():
+        return [Application.from_db('default', field_names, row) for row in rows]
+
+    def load_and_check():
+        return [app.has_changed('plan_id') for app in load()]
+
+    results = dict()
+    for name, tracking in (('before (post_init)', post_init_tracking), ('after (lazy)', lazy_tracking)):
+        with tracking():
+            results[f'{name}: load'] = measure(load, args.repeat)
+            results[f'{name}: load + has_changed'] = measure(load_and_check, args.repeat)
+
+    report(f'Load {args.rows} applications', results, args.json_path)
+
+
+if __name__ == '__main__':
+    main()
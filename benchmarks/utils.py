@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import time
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+    import django
+    django.setup()
+
+
+def get_parser(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement')
+    parser.add_argument('--json', dest='json_path', help='Also write results to this JSON file')
+    return parser
+
+
+def measure(func, repeat=5):
+    """
+    Runs `func` `repeat` times and returns timings in seconds.
+    """
+    timings = list()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'max': max(timings),
+    }
+
+
+def get_git_revision():
+    """
+    The commit checked out, `-dirty` when there are uncommitted changes, None outside a repository.
+    """
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty', '--abbrev=40'],
+            capture_output=True, check=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(title, results, json_path=None, metadata=None):
+    """
+    Prints `{name: {'min': s, 'median': s, 'max': s, ...}}` as a table. The JSON file
+    also holds `metadata`, e.g. the commit and parameters to compare runs with.
+    """
+    print(title)
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        extra = ''.join(f'  {k}={v}' for k, v in result.items() if k not in ('min', 'median', 'max'))
+        print(
+            f'  {name:<{width}}  min {result["min"] * 1000:10.2f} ms'
+            f'  median {result["median"] * 1000:10.2f} ms{extra}'
+        )
+
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump({'title': title, 'metadata': metadata or {}, 'results': results}, f, indent=2)
@@ -0,0 +1,12 @@
+#!/usr/bin/env bash
+
+source /project/conf/scripts/runner.sh
+
+run_python_script "Collecting static files" "manage.py collectstatic --noinput --verbosity 0"
+run_python_script "Creating subscription history partitions" "manage.py create_history_partitions --verbosity 0"
+
+echo " > Initializing ASGI SERVER"
+echo ;
+echo "########################################################################"
+echo ;
+uvicorn --host 0.0.0.0 --port "$PORT" --no-access-log project.asgi:application
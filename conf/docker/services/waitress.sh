@@ -3,9 +3,10 @@
 source /project/conf/scripts/runner.sh
 
 run_python_script "Collecting static files" "manage.py collectstatic --noinput --verbosity 0"
+run_python_script "Creating subscription history partitions" "manage.py create_history_partitions --verbosity 0"
 
 echo " > Initializing SERVER"
 echo ;
 echo "########################################################################"
 echo ;
-waitress-serve --port="$PORT" project.wsgi:application
+python manage.py serve --port "$PORT"
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    def ready(self):
+        from health_check.plugins import plugin_dir
+
+        from .db.health_checks import ConnectionPoolHealthCheck
+
+        plugin_dir.register(ConnectionPoolHealthCheck)
@@ -0,0 +1,45 @@
+import django
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler as BaseASGIHandler
+
+_DONE = object()
+
+
+class ASGIHandler(BaseASGIHandler):
+    """
+    Django 4.1 iterates streaming responses in the event loop, so contents read from
+    the database while they are sent, such as the streaming exports, raise
+    SynchronousOnlyOperation. Their parts are pulled in the thread of the request
+    instead, the one that ran the view.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+
+        headers = list()
+        for header, value in response.items():
+            header = header.encode('ascii') if isinstance(header, str) else header
+            value = value.encode('latin1') if isinstance(value, str) else value
+            headers.append((bytes(header), bytes(value)))
+        for cookie in response.cookies.values():
+            headers.append((b'Set-Cookie', cookie.output(header='').encode('ascii').strip()))
+
+        await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+
+        parts = iter(response)
+        next_part = sync_to_async(next, thread_sensitive=True)
+        while (part := await next_part(parts, _DONE)) is not _DONE:
+            for chunk, _ in self.chunk_bytes(part):
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body'})
+
+        await sync_to_async(response.close, thread_sensitive=True)()
+
+
+def get_asgi_application():
+    """
+    django.core.asgi.get_asgi_application() with the handler above.
+    """
+    django.setup(set_prefix=False)
+    return ASGIHandler()
@@ -0,0 +1,3 @@
+from .generation import bump_generation, get_generation  # noqa
+from .invalidation import InvalidationChannel  # noqa
+from .local_catalog import LocalCatalog  # noqa
@@ -0,0 +1,38 @@
+"""
+Generation keys: cached entries embed the current generation of their namespace in their
+key, so invalidating a whole namespace is a single INCR and never needs a key scan.
+Entries of older generations are simply never read again and expire on their own.
+"""
+import time
+
+from django.core.cache import caches
+
+GENERATION_KEY = 'generation:{}'
+
+
+def _initial_generation():
+    # Starts from the clock so a generation key lost to eviction never reuses an old value
+    return int(time.time() * 1000)
+
+
+def get_generation(namespace, alias='default'):
+    cache = caches[alias]
+    key = GENERATION_KEY.format(namespace)
+
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _initial_generation(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(namespace, alias='default'):
+    cache = caches[alias]
+    key = GENERATION_KEY.format(namespace)
+
+    try:
+        return cache.incr(key)
+    except ValueError:
+        generation = _initial_generation()
+        cache.set(key, generation, timeout=None)
+        return generation
@@ -0,0 +1,87 @@
+"""
+Invalidation channels: a Redis pub/sub fan-out telling every process to drop a local,
+in-memory copy of some data. Each process listens from a daemon thread, started on
+first use and again after a fork. Without a django-redis cache, channels only work
+within the process.
+"""
+import logging
+import os
+import threading
+import time
+
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_KEY = 'invalidate:{}'
+
+
+def get_redis_client(alias='default'):
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection(alias)
+    except NotImplementedError:
+        # Not a django-redis cache, e.g. the local memory cache used by tests
+        return None
+
+
+class InvalidationChannel:
+    retry_delay = 1
+
+    def __init__(self, name, alias='default'):
+        self.name = CHANNEL_KEY.format(name)
+        self.alias = alias
+        self.receivers = list()
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def connect(self, receiver):
+        self.receivers.append(receiver)
+
+    def notify(self):
+        for receiver in self.receivers:
+            receiver()
+
+    def publish(self):
+        """
+        Asks every process, this one included, to drop its copy.
+        """
+        self.notify()
+
+        client = get_redis_client(self.alias)
+        if client is None:
+            return
+
+        try:
+            client.publish(self.name, os.getpid())
+        except (RedisError, OSError):
+            logger.warning('Could not publish on %s, other processes rely on their TTL', self.name, exc_info=True)
+
+    def ensure_listening(self):
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+
+            if get_redis_client(self.alias) is None:
+                return
+
+            thread = threading.Thread(target=self.listen, name=f'{self.name} listener', daemon=True)
+            thread.start()
+
+    def listen(self):
+        while True:
+            try:
+                pubsub = get_redis_client(self.alias).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.name)
+                # Messages sent while we were not subscribed are lost
+                self.notify()
+
+                for _ in pubsub.listen():
+                    self.notify()
+            except (RedisError, OSError):
+                logger.warning('Lost subscription to %s, retrying', self.name, exc_info=True)
+                time.sleep(self.retry_delay)
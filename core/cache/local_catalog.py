@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import namedtuple
+
+from .invalidation import InvalidationChannel
+
+
+class LocalCatalog:
+    """
+    Process-local, read-only copy of a small and rarely changing table, declared on
+    the model it copies:
+
+        class Plan(models.Model):
+            catalog = LocalCatalog(fields=('id', 'name', 'price'), ttl=60)
+
+        Plan.catalog.get(pk)
+
+    The first field must be the primary key. Rows are kept as immutable named tuples
+    (entries) in a snapshot that is replaced as a whole. Each clear bumps `version`, a
+    load started before it does not install its rows.
+    A snapshot is reloaded after `ttl` seconds or after `invalidate()`, which reaches
+    every process through an InvalidationChannel. Keys missing from the snapshot are
+    looked up in the database, so rows created since the last load are still found.
+    """
+
+    def __init__(self, fields, ttl=60, channel=None, alias='default'):
+        self.fields = tuple(fields)
+        self.ttl = ttl
+        self.channel_name = channel
+        self.alias = alias
+        self.model = None
+        self.entry_class = None
+        self.channel = None
+        self.version = 0
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def contribute_to_class(self, model, name):
+        self.model = model
+        self.entry_class = type(f'{model.__name__}Entry', (namedtuple(f'{model.__name__}Row', self.fields),), {
+            '__slots__': (),
+            'pk': property(lambda entry: entry[0]),
+        })
+        self.channel = InvalidationChannel(self.channel_name or model._meta.label_lower, alias=self.alias)
+        self.channel.connect(self.clear)
+        setattr(model, name, self)
+
+    def clear(self):
+        """ Drops the snapshot of this process only. """
+        with self._lock:
+            self.version += 1
+            self._snapshot = None
+
+    def make_entry(self, instance):
+        """ The entry of a model instance that is already loaded. """
+        return self.entry_class._make(getattr(instance, f) for f in self.fields)
+
+    def invalidate(self):
+        """ Drops the snapshot of every process. """
+        self.channel.publish()
+
+    def load(self):
+        """
+        Reads the rows and installs them as the snapshot, unless the catalog was cleared
+        while they were read: they may predate the change, and are only returned.
+        """
+        version = self.version
+        rows = self.model._default_manager.values_list(*self.fields)
+        entries = {entry[0]: entry for entry in map(self.entry_class._make, rows)}
+
+        with self._lock:
+            if self.version == version:
+                self._snapshot = (time.monotonic() + self.ttl, entries)
+        return entries
+
+    def get_entries(self):
+        self.channel.ensure_listening()
+
+        snapshot = self._snapshot
+        if snapshot is None or snapshot[0] < time.monotonic():
+            return self.load()
+        return snapshot[1]
+
+    def all(self):
+        return list(self.get_entries().values())
+
+    def get(self, pk):
+        entry = self.get_entries().get(pk)
+        if entry is not None:
+            return entry
+
+        row = self.model._default_manager.filter(pk=pk).values_list(*self.fields).first()
+        if row is None:
+            return None
+
+        # New row, the next read takes a fresh snapshot
+        self.clear()
+        return self.entry_class._make(row)
@@ -0,0 +1,63 @@
+"""
+PostgreSQL backend checking its connections out of a pool (see core.db.pool) rather than
+opening a new one for each request, configured by the POOL entry of the database settings:
+
+    "POOL": {"MAX_SIZE": 10, "TIMEOUT": 10, "MAX_LIFETIME": 3600, "CHECK_DELAY": 30}
+
+Closing the connection, as Django does at the end of each request, checks it back in.
+A MAX_SIZE of 0 disables the pool.
+"""
+import functools
+import json
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+from django.utils.asyncio import async_unsafe
+
+from core.db.pool import close_pools, get_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle connections to the test database would prevent dropping it
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+
+    def get_pool(self, conn_params):
+        options = {key.lower(): value for key, value in self.settings_dict.get("POOL", dict()).items()}
+        # Connections to the maintenance database only serve to create and drop databases
+        if options.get("max_size") == 0 or self.alias == NO_DB_ALIAS:
+            return None
+        key = json.dumps(conn_params, sort_keys=True, default=str)
+        return get_pool(key, f'{conn_params.get("database")}@{conn_params.get("host", "")}', **options)
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        pool = self.get_pool(conn_params)
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        connection = pool.checkout(functools.partial(super().get_new_connection, conn_params))
+        self.pool = pool
+        # As the parent class does for new connections
+        self.isolation_level = self.settings_dict["OPTIONS"].get("isolation_level", connection.isolation_level)
+        return connection
+
+    def _close(self):
+        pool, self.pool = self.pool, None
+        if pool is None:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django keeps the connection until the atomic block exits, nobody else may use it meanwhile
+                self.connection.close()
+            pool.checkin(self.connection)
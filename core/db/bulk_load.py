@@ -0,0 +1,133 @@
+"""
+Postgres bulk loads with COPY, for millions of rows at once.
+
+COPY streams the rows in its text format with one statement per chunk, instead of one
+INSERT per row or batch. The secondary indexes and foreign keys of the tables loaded
+can also be dropped during the load and created again after it: building an index once
+and validating a foreign key with one query are cheaper than maintaining them row by row.
+"""
+import io
+import re
+from contextlib import contextmanager
+
+from django.db import connections
+
+COPY_NULL = '\\N'
+COPY_SPECIAL_CHARACTERS = re.compile(r'[\\\t\n\r]')
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_text(value) -> str:
+    if value is None:
+        return COPY_NULL
+    if COPY_SPECIAL_CHARACTERS.search(value):
+        return value.translate(COPY_ESCAPES)
+    return value
+
+
+def _copy_boolean(value) -> str:
+    return COPY_NULL if value is None else 't' if value else 'f'
+
+
+def _copy_datetime(value) -> str:
+    return COPY_NULL if value is None else value.isoformat()
+
+
+def _copy_value(value) -> str:
+    # UUIDs, numbers, ... whose text has nothing to escape
+    return COPY_NULL if value is None else str(value)
+
+
+def get_copy_formatter(field):
+    """ The function writing the values of `field` in the text format of COPY, chosen once per column """
+    internal_type = field.get_internal_type()
+    if internal_type in ('CharField', 'TextField', 'EmailField', 'URLField', 'SlugField'):
+        return _copy_text
+    if internal_type == 'BooleanField':
+        return _copy_boolean
+    if internal_type == 'DateTimeField':
+        return _copy_datetime
+    return _copy_value
+
+
+def copy_rows(model, rows, using: str = 'default') -> int:
+    """
+    Writes `rows`, dicts of {attname: value} of every concrete field of `model`, to its
+    table with a single COPY. Returns the number of rows written.
+    """
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    fields = model._meta.concrete_fields
+    columns = [(field.attname, get_copy_formatter(field)) for field in fields]
+
+    data = io.StringIO()
+    count = 0
+    for row in rows:
+        data.write('\t'.join([to_text(row[attname]) for attname, to_text in columns]))
+        data.write('\n')
+        count += 1
+    data.seek(0)
+
+    # Database errors of COPY raised as those of Django, e.g. IntegrityError
+    with connection.cursor() as cursor, connection.wrap_database_errors:
+        cursor.copy_expert(
+            f'COPY {quote_name(model._meta.db_table)} ({", ".join(quote_name(field.column) for field in fields)}) '
+            f'FROM STDIN',
+            data,
+        )
+    return count
+
+
+def _get_indexes_and_foreign_keys(cursor, table: str, quote_name) -> list:
+    """ [(drop SQL, create SQL)] of the indexes not backing a constraint and the foreign keys of `table` """
+    cursor.execute(
+        'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+        "WHERE conrelid = %s::regclass AND contype = 'f' ORDER BY conname",
+        [table],
+    )
+    foreign_keys = [
+        (
+            f'ALTER TABLE {table} DROP CONSTRAINT {quote_name(name)}',
+            f'ALTER TABLE {table} ADD CONSTRAINT {quote_name(name)} {definition}',
+        )
+        for name, definition in cursor.fetchall()
+    ]
+
+    cursor.execute(
+        'SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) FROM pg_index i '
+        'WHERE i.indrelid = %s::regclass '
+        'AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid) '
+        'ORDER BY 1',
+        [table],
+    )
+    indexes = [
+        # The index of a partitioned table is defined ON ONLY the table, created that
+        # way it would not be created on the partitions
+        (f'DROP INDEX {name}', definition.replace(' ON ONLY ', ' ON ', 1))
+        for name, definition in cursor.fetchall()
+    ]
+    return indexes + foreign_keys
+
+
+@contextmanager
+def deferred_indexes_and_foreign_keys(models, using: str = 'default'):
+    """
+    Drops the foreign keys and the indexes, those of the primary keys and unique
+    constraints aside, of the tables of `models`, and creates them again on exit, which
+    also validates the foreign keys of every row. To be used in a transaction, which
+    keeps the tables locked until it ends; they are not created again on errors.
+    """
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        statements = list()
+        for model in models:
+            statements.extend(_get_indexes_and_foreign_keys(cursor, quote_name(model._meta.db_table), quote_name))
+        for drop, _ in statements:
+            cursor.execute(drop)
+
+    yield
+
+    with connection.cursor() as cursor:
+        for _, create in statements:
+            cursor.execute(create)
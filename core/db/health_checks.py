@@ -0,0 +1,38 @@
+from health_check.backends import BaseHealthCheckBackend
+from health_check.exceptions import ServiceWarning
+
+from core.db.pool import get_pools
+
+# Timeouts of each pool at the previous check of the process
+_reported_timeouts = dict()
+
+
+class ConnectionPoolHealthCheck(BaseHealthCheckBackend):
+    """
+    Statistics of the connection pools of the process serving the check. Checkouts that
+    timed out since its previous check are a warning, not a failure: whether the database
+    is up is the database check's concern.
+    """
+    critical_service = False
+
+    def __init__(self):
+        super().__init__()
+        self.stats = dict()
+
+    def check_status(self):
+        self.stats = {pool.name: pool.get_stats() for pool in get_pools().values()}
+
+        for name, stats in self.stats.items():
+            timeouts = stats['timeouts'] - _reported_timeouts.get(name, 0)
+            _reported_timeouts[name] = stats['timeouts']
+            if timeouts > 0:
+                raise ServiceWarning(f'{name}: {timeouts} connection checkouts timed out')
+
+    def pretty_status(self):
+        stats = '; '.join(
+            '{name}: {size}/{max_size} connections, {idle} idle, {checkouts} checkouts, {waits} waits '
+            '({wait_seconds}s), {timeouts} timeouts'.format(name=name, **pool_stats)
+            for name, pool_stats in self.stats.items()
+        )
+        status = super().pretty_status()
+        return f'{status} ({stats})' if stats else status
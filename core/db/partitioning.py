@@ -0,0 +1,176 @@
+"""
+Postgres declarative range partitioning by month.
+
+A partitioned table is split into one partition per calendar month of its
+partition column, named `<table>_pYYYY_MM`, plus a DEFAULT partition catching rows
+no monthly partition covers. Postgres only reads the partitions matching a filter
+on the partition column (partition pruning).
+
+Primary keys and unique constraints of a partitioned table must include the
+partition column, so the primary key becomes (pk, partition column) in the
+database while Django keeps using the model primary key alone.
+"""
+import datetime
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+
+def month_start(value) -> datetime.date:
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(value: datetime.date, months: int) -> datetime.date:
+    month = value.month - 1 + months
+    return datetime.date(value.year + month // 12, month % 12 + 1, 1)
+
+
+def get_partition_name(table: str, start: datetime.date) -> str:
+    return f'{table}_p{start:%Y_%m}'
+
+
+def get_default_partition_name(table: str) -> str:
+    return f'{table}_default'
+
+
+def _bound(value: datetime.date) -> str:
+    return f"'{value.isoformat()} 00:00:00+00'"
+
+
+def is_partitioned(table: str, using: str = 'default') -> bool:
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid '
+            'WHERE c.relname = %s AND pg_table_is_visible(c.oid)',
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def get_partitions(table: str, using: str = 'default') -> list:
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent '
+            'WHERE p.relname = %s AND pg_table_is_visible(p.oid) ORDER BY c.relname',
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_monthly_partition(table: str, column: str, start: datetime.date, using: str = 'default') -> bool:
+    """
+    Creates the partition of the month starting at `start`, unless it exists. Rows of
+    that month already stored in the default partition are moved into it.
+    Returns whether the partition was created.
+    """
+    start = month_start(start)
+    end = add_months(start, 1)
+    name = get_partition_name(table, start)
+    connection = connections[using]
+    qn = connection.ops.quote_name
+
+    if name in get_partitions(table, using=using):
+        return False
+
+    default = get_default_partition_name(table)
+    in_month = f'{qn(column)} >= {_bound(start)} AND {qn(column)} < {_bound(end)}'
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        if default in get_partitions(table, using=using):
+            # Attaching fails while the default partition holds rows of the new range
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {qn(default)} WHERE {in_month} RETURNING *) '
+                f'INSERT INTO {qn(name)} SELECT * FROM moved'
+            )
+        cursor.execute(
+            f'ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} '
+            f'FOR VALUES FROM ({_bound(start)}) TO ({_bound(end)})'
+        )
+
+    return True
+
+
+def create_monthly_partitions(table: str, column: str, since: datetime.date, until: datetime.date,
+                              using: str = 'default') -> list:
+    """
+    Creates the missing monthly partitions from `since` to `until`, both included.
+    Returns the names of the partitions created.
+    """
+    created = list()
+    start = month_start(since)
+    while start <= until:
+        if create_monthly_partition(table, column, start, using=using):
+            created.append(get_partition_name(table, start))
+        start = add_months(start, 1)
+    return created
+
+
+def _create_relations_and_indexes(schema_editor, model):
+    for field in model._meta.local_fields:
+        if field.remote_field and field.db_constraint:
+            schema_editor.execute(schema_editor._create_fk_sql(model, field, '_fk_%(to_table)s_%(to_column)s'))
+        if field.db_index and not field.unique:
+            schema_editor.execute(schema_editor._create_index_sql(model, fields=[field]))
+    for index in model._meta.indexes:
+        schema_editor.execute(index.create_sql(model, schema_editor))
+
+
+def partition_table(schema_editor, model, column: str, months_ahead: int = 3):
+    """
+    Replaces the table of `model` by a partitioned copy, for use in a RunPython
+    migration. The rows are copied, and the primary key, foreign keys and indexes of
+    the model are rebuilt with the partition column added to the primary key.
+    """
+    table = model._meta.db_table
+    legacy = f'{table}_legacy'
+    qn = schema_editor.quote_name
+    pk_column = model._meta.pk.column
+
+    schema_editor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}')
+    schema_editor.execute(
+        f'CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ({qn(column)})'
+    )
+    schema_editor.execute(f'CREATE TABLE {qn(get_default_partition_name(table))} PARTITION OF {qn(table)} DEFAULT')
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN({qn(column)}) FROM {qn(legacy)}')
+        oldest = cursor.fetchone()[0]
+
+    # The current month in UTC, as the rows are routed by their UTC partition column
+    today = timezone.now().date()
+    create_monthly_partitions(
+        table,
+        column,
+        since=oldest.date() if oldest else today,
+        until=add_months(today, months_ahead),
+        using=schema_editor.connection.alias,
+    )
+
+    schema_editor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}')
+    schema_editor.execute(f'DROP TABLE {qn(legacy)}')
+
+    schema_editor.execute(
+        f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(f"{table}_pkey")} PRIMARY KEY ({qn(pk_column)}, {qn(column)})'
+    )
+    _create_relations_and_indexes(schema_editor, model)
+
+
+def unpartition_table(schema_editor, model, column: str):
+    """
+    Reverse of partition_table(): copies the rows back into a regular table.
+    """
+    table = model._meta.db_table
+    partitioned = f'{table}_partitioned'
+    qn = schema_editor.quote_name
+    pk_column = model._meta.pk.column
+
+    schema_editor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(partitioned)}')
+    schema_editor.execute(f'CREATE TABLE {qn(table)} (LIKE {qn(partitioned)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    schema_editor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(partitioned)}')
+    schema_editor.execute(f'DROP TABLE {qn(partitioned)} CASCADE')
+
+    schema_editor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(f"{table}_pkey")} PRIMARY KEY ({qn(pk_column)})')
+    _create_relations_and_indexes(schema_editor, model)
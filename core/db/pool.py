@@ -0,0 +1,269 @@
+"""
+Database connection pools, one per process and set of connection parameters, shared by
+the threads of the process (see core.db.backends.postgresql_pool).
+
+A pool holds at most `max_size` connections; a checkout beyond it waits up to `timeout`
+seconds for a connection to come back, then fails with PoolTimeout. Connections are
+replaced once older than `max_lifetime` seconds, and checked with a round trip on
+checkout when idle for more than `check_delay` seconds, so those the server dropped
+(restart, idle timeout) are replaced before a request runs into them. Checked in
+connections are rolled back and their session state discarded.
+
+Health checks, resets and closes are round trips to the server made out of the lock of
+the pool, which only guards its bookkeeping: a slow connection stalls its own thread only.
+"""
+import os
+import random
+import threading
+import time
+
+import psycopg2
+
+# Connections expire within the last 5% of their lifetime, so they are not all replaced together
+LIFETIME_JITTER = 0.05
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    pass
+
+
+class PoolStats:
+    """ Counters since the pool was created """
+    fields = ('checkouts', 'waits', 'wait_seconds', 'timeouts', 'connects', 'discards')
+
+    def __init__(self):
+        for field in self.fields:
+            setattr(self, field, 0)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.fields}
+
+
+class PooledConnection:
+    def __init__(self, connection, max_lifetime):
+        now = time.monotonic()
+        self.connection = connection
+        self.expires_at = now + max_lifetime * (1 - random.uniform(0, LIFETIME_JITTER)) if max_lifetime else None
+        self.checked_in_at = now
+
+    def is_expired(self, now):
+        return self.expires_at is not None and now >= self.expires_at
+
+
+class ConnectionPool:
+    def __init__(self, name, max_size=10, timeout=10, max_lifetime=3600, check_delay=30):
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_delay = check_delay
+
+        self.stats = PoolStats()
+        # Checked out connections, keyed by id() as psycopg2 connections are not hashable by value
+        self.used = dict()
+        self.idle = list()
+        self.closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def size(self):
+        return len(self.used) + len(self.idle)
+
+    def get_stats(self):
+        with self._condition:
+            stats = {'size': self.size, 'idle': len(self.idle), 'max_size': self.max_size, **self.stats.as_dict()}
+        stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+        return stats
+
+    def checkout(self, connect):
+        """
+        Returns an idle connection that passed its health check, a new one from `connect()`
+        if the pool is not full, or the first one checked in within the timeout.
+        """
+        with self._condition:
+            self.stats.checkouts += 1
+
+        deadline = None
+        while True:
+            with self._condition:
+                while not self.idle and self.size >= self.max_size:
+                    now = time.monotonic()
+                    if deadline is None:
+                        self.stats.waits += 1
+                        deadline = now + self.timeout
+                    elif now >= deadline:
+                        self.stats.timeouts += 1
+                        raise PoolTimeout(
+                            f'No connection available within {self.timeout} seconds ({self.max_size} in use)'
+                        )
+                    self._condition.wait(deadline - now)
+                    self.stats.wait_seconds += time.monotonic() - now
+
+                if not self.idle:
+                    # Reserves the slot, connecting happens outside of the lock
+                    reserved = object()
+                    self.used[id(reserved)] = reserved
+                    break
+                pooled = self.idle.pop()
+                self.used[id(pooled.connection)] = pooled
+
+            # Round trips to the server happen outside of the lock, not to stall the other threads
+            if self.is_healthy(pooled):
+                return pooled.connection
+            self.discard(pooled)
+
+        try:
+            connection = connect()
+        except BaseException:
+            with self._condition:
+                del self.used[id(reserved)]
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            del self.used[id(reserved)]
+            self.stats.connects += 1
+            self.used[id(connection)] = PooledConnection(connection, self.max_lifetime)
+        return connection
+
+    def checkin(self, connection):
+        """
+        Takes back a connection, rolled back if left in a transaction and with its session
+        state reset. Broken or expired connections are closed instead.
+        """
+        with self._condition:
+            pooled = self.used[id(connection)]
+            closed = self.closed
+
+        # The connection keeps its slot while reset, outside of the lock
+        if closed or pooled.is_expired(time.monotonic()) or not self.reset(connection):
+            self.discard(pooled)
+            return
+
+        with self._condition:
+            if not self.closed:
+                del self.used[id(connection)]
+                pooled.checked_in_at = time.monotonic()
+                self.idle.append(pooled)
+                self._condition.notify()
+                return
+        self.discard(pooled)
+
+    def is_healthy(self, pooled):
+        connection = pooled.connection
+        now = time.monotonic()
+        if connection.closed or pooled.is_expired(now):
+            return False
+        if now - pooled.checked_in_at < self.check_delay:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return self.rollback(connection)
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def rollback(connection):
+        if connection.closed:
+            return False
+        status = connection.info.transaction_status
+        if status == psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            return True
+        if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+
+        try:
+            connection.rollback()
+        except psycopg2.Error:
+            return False
+        return connection.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    @classmethod
+    def reset(cls, connection):
+        """
+        Rolls back the connection and drops its session state (settings, temporary tables,
+        prepared statements, ...), so the next request starts as on a new connection.
+        """
+        if not cls.rollback(connection):
+            return False
+
+        autocommit = connection.autocommit
+        try:
+            # DISCARD ALL cannot run in a transaction
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute('DISCARD ALL')
+                # psycopg2 skips setting the encoding it set last, which DISCARD ALL reset
+                if connection.get_parameter_status('client_encoding') != connection.encoding:
+                    cursor.execute('SET client_encoding TO %s', [connection.encoding])
+            connection.autocommit = autocommit
+        except psycopg2.Error:
+            return False
+        return True
+
+    def discard(self, pooled):
+        """ Closes a connection, checked out or not, and frees its slot """
+        try:
+            pooled.connection.close()
+        except psycopg2.Error:
+            pass
+
+        with self._condition:
+            self.stats.discards += 1
+            if self.used.pop(id(pooled.connection), None) is not None:
+                self._condition.notify()
+
+    def close(self):
+        """ Closes the idle connections, the checked out ones once checked in """
+        with self._condition:
+            self.closed = True
+            idle, self.idle = self.idle, list()
+        for pooled in idle:
+            self.discard(pooled)
+
+
+_pools = dict()
+_pools_pid = os.getpid()
+_pools_lock = threading.Lock()
+# Pools inherited through a fork, kept referenced: closing their connections would close
+# them for the parent too, they share the sockets.
+_inherited_pools = list()
+
+
+def _forget_inherited_pools():
+    global _pools_pid
+
+    if _pools_pid != os.getpid():
+        _inherited_pools.append(_pools.copy())
+        _pools.clear()
+        _pools_pid = os.getpid()
+
+
+def get_pool(key, name, **options):
+    """
+    Returns the pool of `key`, created with `options` on first use. `name` identifies it in
+    statistics, the key holds credentials.
+    """
+    with _pools_lock:
+        _forget_inherited_pools()
+        pool = _pools.get(key)
+        if pool is None or pool.closed:
+            pool = _pools[key] = ConnectionPool(name, **options)
+        return pool
+
+
+def get_pools():
+    with _pools_lock:
+        _forget_inherited_pools()
+        return {key: pool for key, pool in _pools.items() if not pool.closed}
+
+
+def close_pools():
+    with _pools_lock:
+        _forget_inherited_pools()
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
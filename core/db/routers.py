@@ -0,0 +1,83 @@
+"""
+Read replicas. Reads go to a replica only inside replica_reads(), which the read-only
+viewset actions enter (see core.viewsets.ReplicaReadViewsetMixin), so a replica never
+serves a read that has to see a write of the same request. A user who wrote is pinned
+to the primary for settings.DATABASE_REPLICA_PIN_SECONDS, long enough for the replicas
+to catch up, so they read their own writes.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_KEY = 'primary-pin:{}'
+
+# The replica the reads of the current request go to, if any
+_replica = ContextVar('replica', default=None)
+
+
+def get_replica():
+    return _replica.get()
+
+
+def use_replica():
+    """
+    Sends the following reads of the current context to a replica picked at random,
+    the same one until end_replica_reads(). No-op without replicas.
+    """
+    replicas = settings.DATABASE_REPLICAS
+    _replica.set(random.choice(replicas) if replicas else None)
+
+
+def end_replica_reads():
+    _replica.set(None)
+
+
+@contextmanager
+def replica_reads():
+    use_replica()
+    try:
+        yield
+    finally:
+        end_replica_reads()
+
+
+def pin_to_primary(user, alias='default'):
+    if user.is_authenticated and settings.DATABASE_REPLICAS:
+        caches[alias].set(PIN_KEY.format(user.pk), 1, timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user, alias='default'):
+    if not user.is_authenticated or not settings.DATABASE_REPLICAS:
+        return False
+    return caches[alias].get(PIN_KEY.format(user.pk)) is not None
+
+
+class ReplicaRouter:
+    """
+    Routes the reads made inside replica_reads() to its replica, every other query to
+    the primary, including the lazy reads of objects loaded from a replica. A write
+    ends the replica reads of its context.
+    """
+
+    def db_for_read(self, model, **hints):
+        return get_replica() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        end_replica_reads()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
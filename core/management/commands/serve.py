@@ -0,0 +1,70 @@
+import logging
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ... import prefork
+
+
+class Command(BaseCommand):
+    help = (
+        'Serves the application with forked waitress workers sharing the preloaded code, '
+        'replaced after a number of requests or above a memory limit. Stops gracefully on SIGTERM.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='0.0.0.0', help='Address to listen on.')
+        parser.add_argument('--port', type=int, default=8000, help='Port to listen on.')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.SERVER_WORKERS,
+            help='Number of worker processes, 0 for one per available CPU.',
+        )
+        parser.add_argument(
+            '--threads', type=int, default=settings.SERVER_THREADS, help='Number of threads of each worker.',
+        )
+        parser.add_argument(
+            '--max-requests',
+            type=int,
+            default=settings.SERVER_MAX_REQUESTS,
+            help='Requests after which a worker is replaced, 0 to keep them.',
+        )
+        parser.add_argument(
+            '--max-requests-jitter',
+            type=int,
+            default=settings.SERVER_MAX_REQUESTS_JITTER,
+            help='Random number of requests of up to this value added to --max-requests for each worker.',
+        )
+        parser.add_argument(
+            '--max-memory',
+            type=int,
+            default=settings.SERVER_MAX_MEMORY,
+            help='Resident memory in MB above which a worker is replaced, 0 to keep them.',
+        )
+        parser.add_argument(
+            '--graceful-timeout',
+            type=int,
+            default=settings.SERVER_GRACEFUL_TIMEOUT,
+            help='Seconds given to a stopping worker to finish its requests.',
+        )
+
+    def handle(self, *args, host, port, workers, threads, max_requests, max_requests_jitter, max_memory,
+               graceful_timeout, verbosity, **options):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('[%(process)d] %(levelname)s: %(message)s'))
+        prefork.logger.addHandler(handler)
+        prefork.logger.setLevel(logging.INFO if verbosity else logging.WARNING)
+
+        server = prefork.PreforkServer(
+            host=host,
+            port=port,
+            workers=workers or len(os.sched_getaffinity(0)),
+            threads=threads,
+            max_requests=max_requests,
+            max_requests_jitter=max_requests_jitter,
+            max_memory=max_memory * 2 ** 20,
+            graceful_timeout=graceful_timeout,
+        )
+        server.run()
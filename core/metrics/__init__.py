@@ -0,0 +1,3 @@
+from .middleware import RequestMetricsMiddleware  # noqa
+from .registry import registry  # noqa
+from .timing import RequestTimings, get_request_timings, timed  # noqa
@@ -0,0 +1,31 @@
+from django_redis.client import DefaultClient
+
+from .timing import timed
+
+TIMED_METHODS = (
+    'add', 'get', 'set', 'delete', 'delete_many', 'delete_pattern', 'get_many', 'set_many', 'has_key', 'incr', 'decr',
+    'ttl', 'pttl', 'expire', 'persist', 'touch', 'keys', 'clear',
+)
+
+
+def time_method(name):
+    method = getattr(DefaultClient, name)
+
+    def timed_method(self, *args, **kwargs):
+        with timed('cache'):
+            return method(self, *args, **kwargs)
+
+    timed_method.__name__ = name
+    timed_method.__doc__ = method.__doc__
+    return timed_method
+
+
+class TimedClient(DefaultClient):
+    """
+    django-redis client timing its calls as part of the current request (see
+    core.metrics.RequestMetricsMiddleware).
+    """
+
+
+for method_name in TIMED_METHODS:
+    setattr(TimedClient, method_name, time_method(method_name))
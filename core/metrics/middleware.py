@@ -0,0 +1,100 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+
+from .registry import registry
+from .timing import RequestTimings
+
+# Descriptions of the Server-Timing entries that count calls
+CALLS_DESCRIPTIONS = {'db': '{} queries', 'cache': '{} calls'}
+
+
+def get_view_labels(request):
+    """ The viewset (or view) and action that served the request """
+    match = request.resolver_match
+    if match is None:
+        return 'unmatched', ''
+
+    view = match.func
+    if hasattr(view, 'cls'):
+        # DRF views, the actions of viewsets by method
+        actions = getattr(view, 'actions', None) or dict()
+        return view.cls.__name__, actions.get(request.method.lower(), request.method.lower())
+    return match.view_name or match._func_path, ''
+
+
+def format_server_timing(timings, total):
+    entries = list()
+    for name, duration in timings.durations.items():
+        entry = f'{name};dur={duration * 1000:.2f}'
+        if name in CALLS_DESCRIPTIONS:
+            entry += ';desc="{}"'.format(CALLS_DESCRIPTIONS[name].format(timings.counts[name]))
+        entries.append(entry)
+    entries.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(entries)
+
+
+class RequestMetricsMiddleware(MiddlewareMixin):
+    """
+    Times the database queries and cache calls of each request, reports them with the
+    time spent serializing and rendering in a Server-Timing header (METRICS_SERVER_TIMING),
+    and adds them to the metrics of /metrics by viewset and action.
+
+    Serializing is the time the view took apart from its queries and cache calls, rendering
+    the time a DRF response took to render. Streamed contents are not timed.
+    """
+
+    def process_request(self, request):
+        request._timings = timings = RequestTimings()
+        request._timings_started = time.perf_counter()
+        request._timings_stack = stack = ExitStack()
+
+        def time_query(execute, sql, params, many, context):
+            with timings.timer('db'):
+                return execute(sql, params, many, context)
+
+        timings.start()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(time_query))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._timings_view = (time.perf_counter(), dict(request._timings.durations))
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered next
+        self.stop_view_timer(request)
+        request._timings_render = time.perf_counter()
+        return response
+
+    def stop_view_timer(self, request):
+        view_started, durations = getattr(request, '_timings_view', (None, None))
+        if view_started is None:
+            return
+        request._timings_view = (None, None)
+
+        timings = request._timings
+        elapsed = time.perf_counter() - view_started
+        for name, duration in timings.durations.items():
+            elapsed -= duration - durations.get(name, 0)
+        timings.durations['serialize'] += max(elapsed, 0)
+
+    def process_response(self, request, response):
+        timings = getattr(request, '_timings', None)
+        if timings is None:
+            return response
+
+        request._timings_stack.close()
+        timings.stop()
+        self.stop_view_timer(request)
+        render_started = getattr(request, '_timings_render', None)
+        if render_started is not None:
+            timings.durations['render'] += time.perf_counter() - render_started
+
+        total = time.perf_counter() - request._timings_started
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = format_server_timing(timings, total)
+        registry.observe_request(*get_view_labels(request), total, timings)
+        return response
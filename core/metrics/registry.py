@@ -0,0 +1,138 @@
+"""
+Request metrics in the Prometheus text format. Each process adds up its samples in memory
+and flushes them to a Redis hash at most every METRICS_FLUSH_INTERVAL seconds, so /metrics
+reports the totals of every worker whichever serves it. Without a django-redis cache,
+the metrics are those of the serving process only.
+"""
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from core.cache.invalidation import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY = 'metrics:requests'
+
+# Prometheus defaults
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+FAMILIES = {
+    'http_request_duration_seconds': ('histogram', 'Duration of the requests by view and action'),
+    'http_request_timing_calls_total': ('counter', 'Database queries, cache calls, ... made by the requests'),
+    'http_request_timing_seconds_total': ('counter', 'Time spent in database queries, cache calls, serializing, ...'),
+}
+
+
+def format_labels(labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels)
+
+
+def sample_sort_key(item):
+    # Samples of the same labels together, histogram buckets in increasing order
+    (name, labels), _ = item
+    le = dict(labels).get('le')
+    return tuple(label for label in labels if label[0] != 'le'), name, float(le) if le else 0
+
+
+def format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    def __init__(self, alias='default'):
+        self.alias = alias
+        # {(sample name, ((label, value), ...)): value}, totals of this process
+        self.samples = defaultdict(float)
+        # Part of the totals not flushed yet
+        self.pending = defaultdict(float)
+        self.flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, name, labels, value):
+        key = (name, tuple(labels))
+        self.samples[key] += value
+        self.pending[key] += value
+
+    def observe_request(self, view, action, duration, timings):
+        labels = (('view', view), ('action', action))
+        with self._lock:
+            for bucket in DURATION_BUCKETS:
+                self.add('http_request_duration_seconds_bucket', labels + (('le', str(bucket)),), duration <= bucket)
+            self.add('http_request_duration_seconds_bucket', labels + (('le', '+Inf'),), 1)
+            self.add('http_request_duration_seconds_sum', labels, duration)
+            self.add('http_request_duration_seconds_count', labels, 1)
+
+            for name, duration in timings.durations.items():
+                timing_labels = labels + (('timing', name),)
+                self.add('http_request_timing_seconds_total', timing_labels, duration)
+                if name in timings.counts:
+                    self.add('http_request_timing_calls_total', timing_labels, timings.counts[name])
+
+        if time.monotonic() - self.flushed_at >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """ Adds the pending samples to the totals of Redis, kept pending if it is unavailable """
+        with self._lock:
+            pending, self.pending = self.pending, defaultdict(float)
+            self.flushed_at = time.monotonic()
+
+        client = get_redis_client(self.alias)
+        if client is None or not pending:
+            return
+
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for key, value in pending.items():
+                pipeline.hincrbyfloat(METRICS_KEY, json.dumps(key), value)
+            pipeline.execute()
+        except (RedisError, OSError):
+            logger.warning('Could not flush the request metrics, retrying on the next flush', exc_info=True)
+            with self._lock:
+                for key, value in pending.items():
+                    self.pending[key] += value
+
+    def collect(self):
+        client = get_redis_client(self.alias)
+        if client is None:
+            with self._lock:
+                return dict(self.samples)
+
+        self.flush()
+        try:
+            stored = client.hgetall(METRICS_KEY)
+        except (RedisError, OSError):
+            logger.warning('Could not read the request metrics, reporting those of this process', exc_info=True)
+            with self._lock:
+                return dict(self.samples)
+
+        samples = dict()
+        for field, value in stored.items():
+            name, labels = json.loads(field)
+            samples[(name, tuple(tuple(label) for label in labels))] = float(value)
+        return samples
+
+    def render(self):
+        """ The samples in the Prometheus text exposition format """
+        samples_by_family = defaultdict(list)
+        for (name, labels), value in sorted(self.collect().items(), key=sample_sort_key):
+            family = next(family for family in FAMILIES if name.startswith(family))
+            samples_by_family[family].append(f'{name}{{{format_labels(labels)}}} {format_value(value)}')
+
+        lines = list()
+        for family, (kind, description) in FAMILIES.items():
+            lines.append(f'# HELP {family} {description}')
+            lines.append(f'# TYPE {family} {kind}')
+            lines.extend(samples_by_family[family])
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,55 @@
+"""
+Timings of the current request: how many queries, cache calls, ... it made and how long
+they took, collected by the hooks of core.metrics (see RequestMetricsMiddleware).
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_request_timings = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.counts = defaultdict(int)
+        # Calls in progress, a call made by another of the same kind (e.g. set_many() calling
+        # set()) is part of it
+        self._depth = defaultdict(int)
+
+    @contextmanager
+    def timer(self, name):
+        self._depth[name] += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth[name] -= 1
+            if not self._depth[name]:
+                self.durations[name] += time.perf_counter() - started
+                self.counts[name] += 1
+
+    def start(self):
+        _request_timings.set(self)
+
+    @staticmethod
+    def stop():
+        # Not reset with a token: under ASGI, middleware hooks run in copies of the request context
+        _request_timings.set(None)
+
+
+def get_request_timings():
+    return _request_timings.get()
+
+
+@contextmanager
+def timed(name):
+    """ Times the block as part of the current request, if any """
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    with timings.timer(name):
+        yield
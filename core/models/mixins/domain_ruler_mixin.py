@@ -85,33 +85,38 @@ class DeletionRuleChecker(ABC):
 
 class DomainRuleMixin:
     """ Adds support to check domain rules """
-    # Rule instances
+    # Rule classes or instances
     integrity_rules = list()
     deletion_rules = list()
 
-    def __init__(self, *args, **kwargs):
-        self.ignore_validation = False
-        self.validation_processed = False
-        self.valid = False
+    ignore_validation = False
+    validation_processed = False
+    valid = False
 
-        integrity_rules = set()
+    # Instantiated rules, see __init_subclass__
+    _integrity_checkers = tuple()
+    _deletion_checkers = tuple()
 
-        for rule in self.integrity_rules:
-            if self.is_valid_integrity_rule(rule):
-                integrity_rules.add(rule)
-                continue
+    # {model class: ((field name, attribute), ...)} of the fields that must be filled
+    _required_fields = dict()
 
-            raise RuleInstanceTypeError(rule.__name__)
+    def __init_subclass__(cls, **kwargs):
+        """
+        Rules are checked and instantiated once, when the model class is created, so
+        instances pay nothing for them.
+        """
+        super().__init_subclass__(**kwargs)
 
-        deletion_rules = set()
-        for rule in self.deletion_rules:
-            if self.is_valid_deletion_rule(rule):
-                deletion_rules.add(rule)
-                continue
+        for rule in cls.integrity_rules:
+            if not cls.is_valid_integrity_rule(rule):
+                raise RuleInstanceTypeError(getattr(rule, '__name__', rule.__class__.__name__))
 
-            raise RuleInstanceTypeError(rule.__class__.__name__)
+        for rule in cls.deletion_rules:
+            if not cls.is_valid_deletion_rule(rule):
+                raise RuleInstanceTypeError(getattr(rule, '__name__', rule.__class__.__name__))
 
-        super().__init__(*args, **kwargs)
+        cls._integrity_checkers = tuple(cls.get_checker(rule) for rule in cls.integrity_rules)
+        cls._deletion_checkers = tuple(cls.get_checker(rule) for rule in cls.deletion_rules)
 
     def full_clean(self, exclude=None, validate_unique=True):
         super().full_clean(exclude, validate_unique)
@@ -151,31 +156,45 @@ class DomainRuleMixin:
 
     @staticmethod
     def is_valid_integrity_rule(rule):
-        is_subclass = issubclass(rule, IntegrityRuleChecker)
+        is_subclass = isinstance(rule, type) and issubclass(rule, IntegrityRuleChecker)
         is_instance = isinstance(rule, IntegrityRuleChecker)
         return is_subclass is True or is_instance is True
 
     @staticmethod
     def is_valid_deletion_rule(rule):
-        is_subclass = issubclass(rule, DeletionRuleChecker)
+        is_subclass = isinstance(rule, type) and issubclass(rule, DeletionRuleChecker)
         is_instance = isinstance(rule, DeletionRuleChecker)
         return is_subclass is True or is_instance is True
 
+    @staticmethod
+    def get_checker(rule):
+        return rule() if isinstance(rule, type) else rule
+
+    @classmethod
+    def get_required_fields(cls):
+        """
+        (field name, attribute) of the fields that must be filled, computed once per model.
+        """
+        required_fields = cls._required_fields.get(cls)
+        if required_fields is None:
+            required_fields = tuple(
+                # Foreign keys are checked by their column, the related row is not loaded
+                (f.name, getattr(f, 'attname', f.name))
+                for f in cls._meta.get_fields()
+                if getattr(f, 'null', False) is False and getattr(f, 'editable', True) is True
+            )
+            cls._required_fields[cls] = required_fields
+        return required_fields
+
     def _required_fields_filled(self):
         """
         Check if all required fields are filled.
         """
-        required_empty_fields = list()
-        for f in self._meta.get_fields():
-            if getattr(f, 'null', False) is True:
-                continue
-
-            if getattr(f, 'editable', True) is False:
-                continue
-
-            v = getattr(self, f.name, None)
-            if v is None:
-                required_empty_fields.append(f.name)
+        required_empty_fields = [
+            name
+            for name, attname in self.get_required_fields()
+            if getattr(self, attname, None) is None
+        ]
 
         if required_empty_fields:
             raise ValidationError(
@@ -185,10 +204,7 @@ class DomainRuleMixin:
     def _check_integrity_rules(self):
         """ Verifica as regras de integridade de domínio. """
 
-        for rule in self.integrity_rules:
-            if not isinstance(rule, IntegrityRuleChecker):
-                rule = rule()
-
+        for rule in self._integrity_checkers:
             try:
                 rule.check(self)
             except RuleIntegrityError as e:
@@ -202,7 +218,5 @@ class DomainRuleMixin:
 
     def _check_deletion_rules(self):
         """ Verifica as regras de remoção de entidade de domínio. """
-        for rule in self.integrity_rules:
-            if not isinstance(rule, DeletionRuleChecker):
-                rule = rule()
-                rule.check(self)
+        for rule in self._deletion_checkers:
+            rule.check(self)
@@ -3,6 +3,9 @@ class EntityMixin:
     Mixin to add utilities to model
     """
 
+    # {(model class, include_hidden): ((name, field), ...)}, built once per model
+    _entity_fields = dict()
+
     @property
     def is_new(self):
         return self._state.adding is True
@@ -10,26 +13,31 @@ class EntityMixin:
     def get_pk_name(self):
         return self._meta.pk.name
 
-    def get_fields(self, include_hidden=True) -> dict:
-        fields = dict()
-        for f in self._meta.get_fields(include_hidden=include_hidden):
-            name = f.name
-            if f.name == self.get_pk_name():
-                name = 'pk'
-            fields[name] = f
+    @classmethod
+    def get_entity_fields(cls, include_hidden=True):
+        """
+        (name, field) of every model field, the primary key being named 'pk'.
+        """
+        key = (cls, include_hidden)
+        fields = cls._entity_fields.get(key)
+        if fields is None:
+            pk_name = cls._meta.pk.name
+            fields = tuple(
+                ('pk' if f.name == pk_name else f.name, f)
+                for f in cls._meta.get_fields(include_hidden=include_hidden)
+            )
+            cls._entity_fields[key] = fields
         return fields
 
-    def get_values(self, include_hidden=True) -> dict:
-        values = dict()
-        for f in self._meta.get_fields(include_hidden=include_hidden):
-            name = f.name
-            if f.name == self.get_pk_name():
-                name = 'pk'
+    def get_fields(self, include_hidden=True) -> dict:
+        return dict(self.get_entity_fields(include_hidden))
 
-            if f.is_relation is True:
-                continue
-            values[name] = getattr(self, name)
-        return values
+    def get_values(self, include_hidden=True) -> dict:
+        return {
+            name: getattr(self, name)
+            for name, f in self.get_entity_fields(include_hidden)
+            if f.is_relation is False
+        }
 
     def get_field(self, field_name: str):
         return self._meta.get_field(field_name)
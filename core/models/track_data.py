@@ -1,7 +1,6 @@
 # pylint: disable=W0613
 """Decorator @track_data - Tracks changes in models"""
-
-from django.db.models.signals import post_init
+from django.db.models import DEFERRED
 
 
 # from https://gist.github.com/dcramer/730765
@@ -18,22 +17,61 @@ def track_data(*fields):
         def post_save(cls, sender, instance, created, **kwargs):
             if instance.has_changed('name'):
                 print "Hooray!"
+
+    Instances built with keyword arguments take their copy right away. Rows loaded
+    from the database, which Model.from_db() builds with positional values, only
+    keep a reference to those values; the copy is made the first time it is read.
     """
 
     not_saved = dict()
 
-    def _store(self):
-        """Updates a local copy of attributes values"""
-        if self.pk:
-            self.data = dict((f, getattr(self, f)) for f in fields)
-        else:
-            self.data = not_saved
-
     def inner(cls):
         """Inner callback to return"""
 
-        # contains a local copy of the previous values of attributes
-        cls.data = {}
+        attnames = [f.attname for f in cls._meta.concrete_fields]
+        positions = tuple(attnames.index(f) if f in attnames else None for f in fields)
+        pk_position = attnames.index(cls._meta.pk.attname)
+
+        def _store(self):
+            """Updates a local copy of attributes values"""
+            if self.pk:
+                self._tracked_data = dict((f, getattr(self, f)) for f in fields)
+            else:
+                self._tracked_data = not_saved
+
+        def _load(self, values):
+            """Copies the tracked attributes from the values the instance was built with"""
+            if not values[pk_position]:
+                return not_saved
+
+            data = dict()
+            for field, position in zip(fields, positions):
+                value = values[position] if position is not None else DEFERRED
+                if value is DEFERRED:
+                    value = _load_deferred(self, field)
+                data[field] = value
+            return data
+
+        def _load_deferred(self, field):
+            """Reads the stored value of a field that was not loaded with the instance"""
+            if field not in self.__dict__:
+                return getattr(self, field)
+
+            # Assigned since it was loaded, the instance no longer holds the stored value
+            queryset = cls._base_manager.using(self._state.db).filter(pk=self.pk)
+            return queryset.values_list(field, flat=True).first()
+
+        # contains a local copy of the previous values of attributes,
+        # or the raw values the instance was built with until first read
+        cls._tracked_data = {}
+
+        def data(self):
+            tracked = self._tracked_data
+            if type(tracked) is tuple:
+                tracked = self._tracked_data = _load(self, tracked)
+            return tracked
+
+        cls.data = property(data)
 
         def has_changed(self, field):
             """Returns `True` if `field` has changed since initialization."""
@@ -61,16 +99,21 @@ def track_data(*fields):
 
         cls.whats_changed = whats_changed
 
-        # Ensure we are updating local attributes on model init
-        # noinspection PyUnusedLocal
-        def _post_init(instance, **kwargs):
-            _store(instance)
+        # Takes the local copy on model init, without a post_init receiver which
+        # would be dispatched for every row loaded
+        def __init__(self, *args, **kwargs):
+            __init__.original(self, *args, **kwargs)
+            if len(args) == len(attnames):
+                self._tracked_data = args
+            else:
+                _store(self)
 
-        post_init.connect(_post_init, sender=cls, weak=False)
+        __init__.original = cls.__init__
+        cls.__init__ = __init__
 
         # Ensure we are updating local attributes on model save
         def save(self, *args, **kwargs):
-            """Intercepts save() in post_init signal"""
+            """Intercepts save() to refresh the local copy"""
 
             save.original(self, *args, **kwargs)
             _store(self)
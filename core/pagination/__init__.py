@@ -0,0 +1 @@
+from .keyset_pagination import KeysetPagination, KeysetOrLimitOffsetPagination  # noqa
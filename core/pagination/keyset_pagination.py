@@ -0,0 +1,253 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    if hasattr(value, 'isoformat'):
+        # Keeps microseconds, DjangoJSONEncoder would truncate them
+        return value.isoformat()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a unique tuple of non-null fields, e.g. ('name', 'id').
+    Each page is a range condition on the ordering index instead of an OFFSET, and no
+    COUNT(*) is issued, so every page costs the same no matter how deep it is.
+    The view may override the keyset with a `cursor_ordering` attribute.
+    """
+    ordering = ('id',)
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = api_settings.PAGE_SIZE
+    max_limit = 200
+    invalid_cursor_message = _('Invalid cursor')
+
+    def __init__(self):
+        self.request = None
+        self.limit = None
+        self.position = None
+        self.reverse = False
+        self.has_next = False
+        self.has_previous = False
+        self.page = list()
+
+    def get_ordering(self, view=None):
+        return tuple(getattr(view, 'cursor_ordering', None) or self.ordering)
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit,
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position, reverse = cursor['p'], bool(cursor.get('r'))
+        except (BinasciiError, UnicodeError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering) or None in position:
+            raise NotFound(self.invalid_cursor_message)
+
+        # Values of the model fields, a tampered value is rejected rather than failing the query
+        opts = queryset.model._meta
+        try:
+            position = [opts.get_field(f).to_python(v) for f, v in zip(self.ordering, position)]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse=False):
+        cursor = {'p': [_encode_value(getattr(instance, f)) for f in self.ordering]}
+        if reverse:
+            cursor['r'] = 1
+        encoded = b64encode(json.dumps(cursor).encode('utf-8')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_keyset_filter(self, position, reverse=False):
+        """
+        Builds `(f1, f2, ...) > (v1, v2, ...)` as an OR of prefixes. The extra bound on
+        the first field lets the planner start an index range scan at the cursor.
+        """
+        lookup = 'lt' if reverse else 'gt'
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            prefix = {f: v for f, v in zip(self.ordering[:i], position[:i])}
+            prefix[f'{field}__{lookup}'] = position[i]
+            condition |= Q(**prefix)
+
+        return Q(**{f'{self.ordering[0]}__{lookup}e': position[0]}) & condition
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        The rows of the requested page, plus one telling whether there are more.
+        """
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        self.limit = self.get_limit(request)
+
+        cursor = self.decode_cursor(request, queryset)
+        self.position, self.reverse = cursor if cursor else (None, False)
+
+        queryset = queryset.order_by(*[f'-{f}' if self.reverse else f for f in self.ordering])
+        if self.position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(self.position, self.reverse))
+
+        return queryset[:self.limit + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next, self.has_previous = self.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        self.page = results
+        return results
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([obj async for obj in self.get_page_queryset(queryset, request, view)])
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.limit_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class KeysetOrLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination for existing clients that switches to keyset pagination
+    when `?pagination=cursor` is sent or a `cursor` link is followed.
+    """
+    mode_query_param = 'pagination'
+    mode_cursor = 'cursor'
+    keyset_class = KeysetPagination
+
+    def __init__(self):
+        self.keyset = None
+
+    def is_keyset_request(self, request):
+        params = request.query_params
+        return params.get(self.mode_query_param) == self.mode_cursor or self.keyset_class.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset_request(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset_request(request):
+            self.keyset = self.keyset_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        # LimitOffsetPagination.paginate_queryset() with the async ORM
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = await queryset.acount()
+        self.offset = self.get_offset(request)
+        self.request = request
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count == 0 or self.offset > self.count:
+            return []
+        return [obj async for obj in queryset[self.offset:self.offset + self.limit]]
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                'name': self.mode_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Use "cursor" to paginate with cursors instead of offsets.',
+                'schema': {'type': 'string', 'enum': [self.mode_cursor]},
+            },
+            {
+                'name': self.keyset_class.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+        ]
@@ -0,0 +1,233 @@
+import gc
+import itertools
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import time
+import traceback
+
+import psutil
+from django.core.cache import caches
+from django.core.servers.basehttp import get_internal_wsgi_application
+from django.db import connections
+from django.urls import get_resolver
+from waitress import wasyncore
+from waitress.server import create_server
+
+from core.db.pool import close_pools
+from core.metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two reads of the resident memory of a worker
+MEMORY_CHECK_INTERVAL = 5
+
+
+class PreforkServer:
+    """
+    Serves settings.WSGI_APPLICATION with `workers` forked waitress processes accepting
+    on one listening socket, so a container uses all of its cores despite the GIL.
+
+    The application is imported once in the master and the objects it allocated are
+    frozen out of the garbage collector before forking: the collector of a worker
+    would otherwise write to all of them and copy the memory pages they share.
+
+    Workers are replaced after `max_requests` requests, plus a random jitter of up to
+    `max_requests_jitter`, or once their resident memory exceeds `max_memory` bytes.
+    Both limits are disabled by 0. A worker being replaced, or stopped by SIGTERM or
+    SIGINT, stops accepting connections and finishes the requests in progress for up
+    to `graceful_timeout` seconds.
+    """
+
+    def __init__(self, host, port, workers, threads, max_requests=0, max_requests_jitter=0, max_memory=0,
+                 graceful_timeout=30, backlog=1024):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.max_memory = max_memory
+        self.graceful_timeout = graceful_timeout
+        self.backlog = backlog
+
+        self.application = None
+        self.socket = None
+        self.pids = set()
+        self.stopping = False
+
+    def run(self):
+        self.socket = socket.create_server((self.host, self.port), backlog=self.backlog)
+        self.preload()
+        logger.info('Listening on http://%s:%s with %s workers', self.host, self.socket.getsockname()[1], self.workers)
+
+        wakeup_read, wakeup_write = os.pipe()
+        os.set_blocking(wakeup_read, False)
+        os.set_blocking(wakeup_write, False)
+        signal.set_wakeup_fd(wakeup_write)
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        # Only signals with a handler wake up the loop below
+        signal.signal(signal.SIGCHLD, lambda *args: None)
+
+        try:
+            while True:
+                self.reap_workers()
+                if self.stopping:
+                    break
+                while len(self.pids) < self.workers:
+                    self.spawn_worker(wakeup_read, wakeup_write)
+
+                select.select([wakeup_read], [], [], 1)
+                try:
+                    while os.read(wakeup_read, 512):
+                        pass
+                except BlockingIOError:
+                    pass
+        finally:
+            signal.set_wakeup_fd(-1)
+            os.close(wakeup_read)
+            os.close(wakeup_write)
+            self.stop_workers()
+            self.socket.close()
+
+    def preload(self):
+        """
+        Imports what the requests need and freezes it in the permanent generation of the
+        garbage collector, which stays off in the master. Connections are closed, the
+        workers would share them otherwise.
+        """
+        gc.disable()
+        self.application = get_internal_wsgi_application()
+        # Imports the views
+        get_resolver().url_patterns  # pylint: disable=W0104
+        connections.close_all()
+        close_pools()
+        caches.close_all()
+        gc.freeze()
+
+    def handle_stop(self, signum, frame):
+        self.stopping = True
+
+    def spawn_worker(self, *inherited_fds):
+        pid = os.fork()
+        if pid:
+            self.pids.add(pid)
+            return
+
+        exit_code = 0
+        try:
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            for fd in inherited_fds:
+                os.close(fd)
+            PreforkWorker(self).run()
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def reap_workers(self):
+        while self.pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.pids.clear()
+                return
+            if not pid:
+                return
+
+            self.pids.discard(pid)
+            exit_code = os.waitstatus_to_exitcode(status)
+            if exit_code and not self.stopping:
+                logger.warning('Worker %s exited with %s', pid, exit_code)
+
+    def stop_workers(self):
+        for pid in self.pids:
+            os.kill(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.pids and time.monotonic() < deadline:
+            time.sleep(0.1)
+            self.reap_workers()
+
+        for pid in self.pids:
+            logger.warning('Worker %s did not stop in %ss, killing it', pid, self.graceful_timeout)
+            os.kill(pid, signal.SIGKILL)
+        while self.pids:
+            pid, _ = os.waitpid(-1, 0)
+            self.pids.discard(pid)
+
+
+class PreforkWorker:
+    """
+    A forked process of PreforkServer, running waitress on the socket of the master.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.max_requests = server.max_requests and server.max_requests + random.randint(0, server.max_requests_jitter)
+        self.requests = itertools.count(1)
+        self.stopping = False
+        self.recycling = False
+        self.waitress = create_server(self.application, sockets=[server.socket], threads=server.threads)
+
+    def application(self, environ, start_response):
+        try:
+            return self.server.application(environ, start_response)
+        finally:
+            # Counted in the threads of waitress, next() on a count is atomic
+            if self.max_requests and next(self.requests) == self.max_requests:
+                logger.info('Worker %s served %s requests, recycling it', os.getpid(), self.max_requests)
+                self.recycling = True
+                self.waitress.pull_trigger()
+
+    def handle_stop(self, signum, frame):
+        self.stopping = True
+
+    def is_over_memory(self, process):
+        rss = process.memory_info().rss
+        if rss <= self.server.max_memory:
+            return False
+        logger.info('Worker %s uses %s MB, recycling it', os.getpid(), rss // 2 ** 20)
+        return True
+
+    def run(self):
+        gc.enable()
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+
+        adj = self.waitress.adj
+        process = psutil.Process()
+        next_memory_check = time.monotonic() + MEMORY_CHECK_INTERVAL
+        deadline = None
+
+        while True:
+            now = time.monotonic()
+            if deadline is None:
+                if self.server.max_memory and now >= next_memory_check:
+                    next_memory_check = now + MEMORY_CHECK_INTERVAL
+                    self.recycling = self.recycling or self.is_over_memory(process)
+                if self.stopping or self.recycling:
+                    # Stops accepting, keeps the trigger the threads wake up the loop with
+                    wasyncore.dispatcher.close(self.waitress)
+                    deadline = now + self.server.graceful_timeout
+
+            if deadline is not None:
+                # Like waitress' maintenance of idle channels, without waiting for their timeout
+                for channel in self.waitress.active_channels.values():
+                    if not channel.requests:
+                        channel.will_close = True
+                if not self.waitress.active_channels or now >= deadline:
+                    break
+
+            wasyncore.loop(adj.asyncore_loop_timeout, map=self.waitress._map, use_poll=adj.asyncore_use_poll, count=1)
+
+        self.waitress.task_dispatcher.shutdown(timeout=max(deadline - time.monotonic(), 0))
+        # Metrics of the last requests, not flushed yet
+        metrics_registry.flush()
+        connections.close_all()
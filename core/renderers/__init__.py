@@ -0,0 +1 @@
+from .export_renderers import CSVRenderer, NDJSONRenderer  # noqa
@@ -0,0 +1,66 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+
+class ExportRenderer(BaseRenderer):
+    """
+    Renders a list of objects row by row. `render_rows()` yields the encoded rows
+    lazily, so a streamed response never holds more than one row.
+    """
+    charset = 'utf-8'
+
+    def render_rows(self, rows):  # pragma: no cover
+        raise NotImplementedError('ExportRenderer.render_rows() must be implemented.')
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return b''.join(self.render_rows(data if isinstance(data, list) else [data]))
+
+
+class NDJSONRenderer(ExportRenderer):
+    """ One JSON document per line. """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    encoder_class = encoders.JSONEncoder
+    ensure_ascii = not api_settings.UNICODE_JSON
+
+    def render_rows(self, rows):
+        for row in rows:
+            line = json.dumps(row, cls=self.encoder_class, ensure_ascii=self.ensure_ascii, separators=(',', ':'))
+            yield line.encode(self.charset) + b'\n'
+
+
+class CSVRenderer(ExportRenderer):
+    """
+    A header with the keys of the first row, then one line per row. Nested objects
+    are written as JSON in their column.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    encoder_class = encoders.JSONEncoder
+
+    def get_cell(self, value):
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, cls=self.encoder_class, ensure_ascii=False)
+        return value
+
+    def render_rows(self, rows):
+        buffer = io.StringIO()
+        writer = None
+
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row), extrasaction='ignore')
+                writer.writeheader()
+
+            writer.writerow({k: self.get_cell(v) for k, v in row.items()})
+            yield buffer.getvalue().encode(self.charset)
+
+            buffer.seek(0)
+            buffer.truncate()
@@ -0,0 +1,90 @@
+"""
+Settings stored in Google Cloud Secret Manager, loaded by project.settings before it
+reads any setting. The Google SDKs are only imported when the secret is fetched.
+"""
+import io
+import logging
+import os
+import tempfile
+import time
+
+import environ
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_secret(name: str):
+    """
+    Returns the latest version of the `name` secret of the current project, or None
+    without credentials or access to it.
+    """
+    import google.auth
+    from google.api_core.exceptions import GoogleAPICallError
+    from google.auth.exceptions import DefaultCredentialsError, TransportError
+    from google.cloud import secretmanager
+
+    try:
+        _, project = google.auth.default()
+        client = secretmanager.SecretManagerServiceClient()
+        version = client.secret_version_path(project, name, 'latest')
+        return client.access_secret_version(name=version).payload.data.decode('UTF-8')
+    except (DefaultCredentialsError, TransportError, GoogleAPICallError):
+        logger.warning('Could not read the %s secret', name, exc_info=True)
+        return None
+
+
+def read_cached_secret(path: str, ttl=None):
+    """
+    The payload cached in `path`, if it was written less than `ttl` seconds ago. The file
+    must be owned by the current user and private to them, as write_cached_secret() leaves
+    it, not to load settings that another user of a shared directory put there.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+    except OSError:
+        return None
+
+    with os.fdopen(fd, encoding='UTF-8') as f:
+        stat = os.fstat(fd)
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+            logger.warning('Ignoring the cached secret settings in %s, not private to the current user', path)
+            return None
+        if ttl is not None and time.time() - stat.st_mtime >= ttl:
+            return None
+        try:
+            return f.read()
+        except (OSError, UnicodeError):
+            return None
+
+
+def write_cached_secret(path: str, payload: str):
+    """ Writes `payload` to `path`, readable by the current user only """
+    directory = os.path.dirname(path) or '.'
+    try:
+        fd, temporary_path = tempfile.mkstemp(dir=directory, prefix='.secret-')
+        with os.fdopen(fd, 'w', encoding='UTF-8') as f:
+            f.write(payload)
+        os.replace(temporary_path, path)
+    except OSError:
+        logger.warning('Could not cache the secret settings in %s', path, exc_info=True)
+
+
+def load_secret_settings(name: str, cache_path: str, cache_ttl: int) -> bool:
+    """
+    Adds the settings of the `name` secret, in .env format, to the environment variables
+    that are not set yet. The secret is cached in `cache_path` for `cache_ttl` seconds,
+    0 disables the cache, and a stale copy is used when Secret Manager cannot be read.
+    Returns whether settings were loaded.
+    """
+    payload = read_cached_secret(cache_path, cache_ttl) if cache_ttl else None
+    if payload is None:
+        payload = fetch_secret(name)
+        if payload is not None and cache_ttl:
+            write_cached_secret(cache_path, payload)
+        elif cache_ttl:
+            payload = read_cached_secret(cache_path)
+    if payload is None:
+        return False
+
+    environ.Env.read_env(io.StringIO(payload))
+    return True
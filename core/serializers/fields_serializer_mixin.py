@@ -1,27 +1,79 @@
+import copy
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.functional import cached_property
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+
 class FieldsSerializerMixin:
+    # Field sets are compiled once per (serializer class, requested fields, excluded fields)
+    # and copied for each new serializer. Disable it for serializers whose fields depend
+    # on runtime state.
+    compile_fields = True
+
+    # {serializer class: {field name: unbound field}}
+    _field_prototypes = dict()
+    # {(serializer class, requested fields, excluded fields): (field name, ...)}
+    _compiled_field_names = dict()
+
+    def get_fields(self):
+        if self.compile_fields is False:
+            return self.prune_fields(super().get_fields())
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        prototypes = self.get_field_prototypes()
+        key = self.get_compiled_fields_key(prototypes)
 
-        fields = self.get_requested_fields()
-        if fields:
+        field_names = self._compiled_field_names.get(key)
+        if field_names is None:
+            field_names = tuple(self.prune_fields(dict(prototypes)).keys())
+            self._compiled_field_names[key] = field_names
+
+        return {name: copy.deepcopy(prototypes[name]) for name in field_names}
+
+    def get_field_prototypes(self):
+        """
+        Every field of the serializer class, built once by the parent get_fields().
+        """
+        cls = type(self)
+        prototypes = self._field_prototypes.get(cls)
+        if prototypes is None:
+            prototypes = super().get_fields()
+            self._field_prototypes[cls] = prototypes
+        return prototypes
+
+    def get_compiled_fields_key(self, prototypes):
+        # Unknown names are dropped so clients cannot grow the cache at will, but asking
+        # only for unknown fields must still differ from asking for nothing.
+        requested = self.get_requested_fields()
+        excluded = self.get_excluded_fields() or list()
+        return (
+            type(self),
+            frozenset(f for f in requested if f in prototypes) if requested else None,
+            frozenset(f for f in excluded if f in prototypes),
+        )
+
+    def prune_fields(self, fields):
+        requested = self.get_requested_fields()
+        if requested:
             # Drop any fields that are not specified in the `fields` argument.
-            for field_name in set(self.field_names) - set(fields):
-                self.fields.pop(field_name)
+            for field_name in set(fields) - set(requested):
+                fields.pop(field_name)
 
         excluded_fields = self.get_excluded_fields()
         if excluded_fields:
-            for f in self.field_names:
-                if f not in excluded_fields:
-                    continue
-                self.fields.pop(f)
+            for field_name in excluded_fields:
+                fields.pop(field_name, None)
+
+        return fields
 
     @property
     def field_names(self):
         return list(self.fields.keys())
 
     def has_field(self, field_name):
-        return field_name in self.field_names
+        return field_name in self.fields
 
     def get_excluded_fields(self):
         return self.context.get('excluded_fields')
@@ -34,11 +86,56 @@ class FieldsSerializerMixin:
             if f not in excluded_fields
         ]
 
+    @cached_property
+    def requested_field_set(self):
+        return frozenset(self.get_requested_fields())
+
     def has_requested_fields(self):
-        return self.get_requested_fields() != []
+        return bool(self.requested_field_set)
 
     def is_requested_field(self, field_name):
-        if self.has_requested_fields() is False:
+        if not self.requested_field_set:
             return True
 
-        return field_name in self.get_requested_fields()
+        return field_name in self.requested_field_set
+
+    @cached_property
+    def representation_plan(self):
+        """
+        (name, getter, to_representation) for each readable field. Plain model attributes
+        are read with attrgetter, anything else goes through the field's get_attribute.
+        """
+        model = getattr(getattr(self, 'Meta', None), 'model', None)
+        plan = list()
+
+        for field in self._readable_fields:
+            getter = field.get_attribute
+            if model is not None and len(field.source_attrs) == 1 and not hasattr(field, 'queryset'):
+                try:
+                    model_field = model._meta.get_field(field.source_attrs[0])
+                except FieldDoesNotExist:
+                    pass
+                else:
+                    if model_field.concrete and not model_field.is_relation:
+                        getter = attrgetter(model_field.attname)
+
+            plan.append((field.field_name, getter, field.to_representation))
+
+        return tuple(plan)
+
+    def to_representation(self, instance):
+        model = getattr(getattr(self, 'Meta', None), 'model', None)
+        if self.compile_fields is False or model is None or not isinstance(instance, model):
+            return super().to_representation(instance)
+
+        rep = dict()
+        for field_name, get_attribute, to_representation in self.representation_plan:
+            try:
+                attribute = get_attribute(instance)
+            except SkipField:
+                continue
+
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            rep[field_name] = None if check_for_none is None else to_representation(attribute)
+
+        return rep
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.secret_manager import load_secret_settings, read_cached_secret, write_cached_secret
+
+PAYLOAD = 'SECRET_MANAGER_TEST=fetched\n'
+
+
+@mock.patch.dict(os.environ)
+class TestSecretSettings(SimpleTestCase):
+    def setUp(self) -> None:
+        os.environ.pop('SECRET_MANAGER_TEST', None)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'settings.env')
+
+    def load(self, payload=PAYLOAD, ttl=300):
+        os.environ.pop('SECRET_MANAGER_TEST', None)
+        with mock.patch('core.secret_manager.fetch_secret', return_value=payload) as fetch:
+            loaded = load_secret_settings('settings', cache_path=self.path, cache_ttl=ttl)
+        return loaded, fetch
+
+    def expire_cache(self):
+        stale = time.time() - 600
+        os.utime(self.path, (stale, stale))
+
+    def test_fetched_then_cached(self):
+        """ Tests whether the secret is fetched once, then read from the cache within its TTL. """
+        loaded, fetch = self.load()
+        self.assertTrue(loaded)
+        fetch.assert_called_once_with('settings')
+        self.assertEqual(os.environ['SECRET_MANAGER_TEST'], 'fetched')
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+        loaded, fetch = self.load(payload='SECRET_MANAGER_TEST=again\n')
+        self.assertTrue(loaded)
+        fetch.assert_not_called()
+        self.assertEqual(os.environ['SECRET_MANAGER_TEST'], 'fetched')
+
+    def test_expired_cache_fetched_again(self):
+        """ Tests whether a cache older than its TTL is replaced by the fetched secret. """
+        self.load()
+        self.expire_cache()
+
+        loaded, fetch = self.load(payload='SECRET_MANAGER_TEST=again\n')
+        fetch.assert_called_once()
+        self.assertEqual(os.environ['SECRET_MANAGER_TEST'], 'again')
+        self.assertEqual(read_cached_secret(self.path), 'SECRET_MANAGER_TEST=again\n')
+
+    def test_stale_cache_when_fetch_fails(self):
+        """ Tests whether an expired cache is used when Secret Manager cannot be read. """
+        self.load()
+        self.expire_cache()
+
+        loaded, fetch = self.load(payload=None)
+        self.assertTrue(loaded)
+        fetch.assert_called_once()
+        self.assertEqual(os.environ['SECRET_MANAGER_TEST'], 'fetched')
+
+    def test_no_cache(self):
+        """ Tests whether a TTL of 0 fetches the secret every time and writes no cache. """
+        write_cached_secret(self.path, 'SECRET_MANAGER_TEST=cached\n')
+
+        loaded, fetch = self.load(ttl=0)
+        fetch.assert_called_once()
+        self.assertEqual(os.environ['SECRET_MANAGER_TEST'], 'fetched')
+
+        loaded, fetch = self.load(payload=None, ttl=0)
+        self.assertFalse(loaded)
+        self.assertNotIn('SECRET_MANAGER_TEST', os.environ)
+
+    def test_cache_not_private_ignored(self):
+        """ Tests whether a cache readable by other users, or a link to a file, is not loaded. """
+        write_cached_secret(self.path, 'SECRET_MANAGER_TEST=planted\n')
+        os.chmod(self.path, 0o644)
+        self.assertIsNone(read_cached_secret(self.path))
+
+        loaded, fetch = self.load(payload=None)
+        self.assertFalse(loaded)
+        self.assertNotIn('SECRET_MANAGER_TEST', os.environ)
+
+        target = self.path + '.target'
+        write_cached_secret(target, 'SECRET_MANAGER_TEST=planted\n')
+        os.remove(self.path)
+        os.symlink(target, self.path)
+        self.assertIsNone(read_cached_secret(self.path))
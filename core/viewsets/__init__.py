@@ -1 +1,7 @@
+from .async_read_viewset_mixin import AsyncReadViewsetMixin  # noqa
+from .cached_response_viewset_mixin import CachedResponseViewsetMixin  # noqa
+from .conditional_get_viewset_mixin import ConditionalGetViewsetMixin  # noqa
 from .field_request_viewset_mixin import FieldRequestViewsetMixin  # noqa
+from .non_atomic_viewset_mixin import NonAtomicViewsetMixin  # noqa
+from .replica_read_viewset_mixin import ReplicaReadViewsetMixin  # noqa
+from .streaming_export_viewset_mixin import StreamingExportViewsetMixin  # noqa
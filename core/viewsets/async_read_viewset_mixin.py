@@ -0,0 +1,142 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.http import Http404
+from rest_framework.response import Response
+
+
+class AsyncReadViewsetMixin:
+    """
+    Serves `async_actions` with async handlers (`alist`, `aretrieve`) when
+    settings.ASYNC_READ_VIEWS is on, i.e. under ASGI, so a request waiting on the
+    database or on a slow client holds no thread. The main queries go through the
+    async ORM. Authentication, filtering and serialization, which may query the
+    database, run in the thread of the request.
+
+    Other methods of the same routes keep their sync handlers, in the request
+    transaction. Async handlers run outside of it: Django does not allow
+    ATOMIC_REQUESTS on async views, and reads do not need it.
+
+    Put it last among the mixins, so the mixins wrapping `list`/`retrieve` wrap the
+    matching `alist`/`aretrieve` too.
+
+    Experimental, off by default: under Django 4.1 the async ORM runs each query in a
+    thread, and benchmarks/bench_asgi.py measures less throughput than the sync views
+    under waitress. `adispatch()` and the `apaginate_queryset()` of the pagination
+    classes mirror APIView.dispatch() and LimitOffsetPagination.paginate_queryset(),
+    check them against DRF on upgrades.
+    """
+    async_actions = ('list', 'retrieve')
+
+    @classmethod
+    def get_non_atomic_requests(cls, actions):
+        """
+        Databases whose transaction is not opened around the sync handlers of a route,
+        see NonAtomicViewsetMixin.
+        """
+        return set()
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not getattr(settings, 'ASYNC_READ_VIEWS', False) or actions.get('get') not in cls.async_actions:
+            return view
+        return cls.as_async_view(view, actions, initkwargs)
+
+    @classmethod
+    def as_async_view(cls, sync_view, actions, initkwargs):
+        # Django only opens the request transaction around sync views
+        atomic_view = sync_view
+        non_atomic_requests = cls.get_non_atomic_requests(actions)
+        for alias, settings_dict in connections.settings.items():
+            if settings_dict['ATOMIC_REQUESTS'] and alias not in non_atomic_requests:
+                atomic_view = transaction.atomic(using=alias)(atomic_view)
+        atomic_view = sync_to_async(atomic_view)
+
+        async def view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await atomic_view(request, *args, **kwargs)
+
+            self = cls(**initkwargs)
+            if 'get' in actions and 'head' not in actions:
+                actions['head'] = actions['get']
+            self.action_map = actions
+            for method, action in actions.items():
+                setattr(self, method, getattr(self, action))
+
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        view.__name__ = sync_view.__name__
+        view.__doc__ = sync_view.__doc__
+        # csrf_exempt() would wrap it in a sync function, DRF checks CSRF itself
+        view.csrf_exempt = True
+        view._non_atomic_requests = set(connections)
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        Async counterpart of APIView.dispatch().
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await getattr(self, f'a{self.action}')(request, *args, **kwargs)
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def get_filtered_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+    async def aserialize(self, instance, **kwargs):
+        # Serializers may read relations that were not loaded
+        return await sync_to_async(lambda: self.get_serializer(instance, **kwargs).data)()
+
+    async def aget_object(self):
+        queryset = await sync_to_async(self.get_filtered_queryset)()
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        paginator = self.paginator
+        if paginator is None:
+            return None
+
+        apaginate_queryset = getattr(paginator, 'apaginate_queryset', None)
+        if apaginate_queryset is None:
+            return await sync_to_async(paginator.paginate_queryset)(queryset, self.request, view=self)
+        return await apaginate_queryset(queryset, self.request, view=self)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await sync_to_async(self.get_filtered_queryset)()
+
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(await self.aserialize(page, many=True))
+
+        return Response(await self.aserialize([obj async for obj in queryset], many=True))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(await self.aserialize(instance))
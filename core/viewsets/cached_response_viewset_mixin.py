@@ -0,0 +1,92 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from core.cache import get_generation
+
+
+class CachedResponseViewsetMixin:
+    """
+    Caches successful `list`/`retrieve` responses. Authentication and permissions still
+    run on every request; the query and the serialization are skipped on hits.
+
+    Entries are keyed by the generation of `cache_namespace`, so invalidation is a
+    `core.cache.bump_generation(namespace)` call, usually from a model signal.
+    Only use it for resources that look the same to every user.
+    """
+    cache_actions = ('list', 'retrieve')
+    cache_namespace = None
+    cache_alias = 'default'
+    cache_timeout = 300
+
+    def get_cache_namespace(self):
+        return self.cache_namespace or self.queryset.model._meta.label_lower
+
+    def get_response_cache_key(self, request, *args, **kwargs):
+        params = request.query_params
+        fields = sorted(set(params.get('fields', '').split(',')) - {''})
+        query = sorted((k, v) for k in params if k != 'fields' for v in params.getlist(k))
+
+        # The host is part of the key because pagination links are absolute
+        raw_key = repr((
+            self.action,
+            sorted(kwargs.items()),
+            fields,
+            query,
+            request.accepted_media_type,
+            request.get_host(),
+        ))
+        digest = hashlib.md5(raw_key.encode('utf-8')).hexdigest()
+
+        namespace = self.get_cache_namespace()
+        generation = get_generation(namespace, alias=self.cache_alias)
+        return f'response:{namespace}:{generation}:{digest}'
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.cache_actions:
+            return handler(request, *args, **kwargs)
+
+        cache = caches[self.cache_alias]
+        key = self.get_response_cache_key(request, *args, **kwargs)
+
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    async def aget_cached_response(self, handler, request, *args, **kwargs):
+        """
+        get_cached_response() for the async handlers of AsyncReadViewsetMixin.
+        """
+        if self.action not in self.cache_actions:
+            return await handler(request, *args, **kwargs)
+
+        cache = caches[self.cache_alias]
+        key = await sync_to_async(self.get_response_cache_key)(request, *args, **kwargs)
+
+        data = await cache.aget(key)
+        if data is not None:
+            return Response(data)
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            await cache.aset(key, response.data, self.cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aget_cached_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aget_cached_response(super().aretrieve, request, *args, **kwargs)
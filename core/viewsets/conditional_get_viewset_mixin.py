@@ -0,0 +1,170 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetViewsetMixin:
+    """
+    Sends ETag and Last-Modified on `list` and `retrieve`, computed from the
+    `conditional_fields` timestamps instead of the response body. Requests whose
+    If-None-Match / If-Modified-Since still match get a 304 before the response is
+    serialized, and before any row is loaded for `retrieve`.
+
+    `list` validators are the fields of the rows of the requested page, looked up by
+    primary key, plus the pagination links and count, so deletions are noticed too.
+    The page is then reused to build the response.
+    Unpaginated lists fall back to MAX() of each field plus COUNT() of the queryset.
+    Related timestamps (e.g. 'plan__updated_at') cover nested objects that are
+    rendered in the response; with FieldRequestViewsetMixin they are only joined when
+    their relation is a requested field.
+
+    Put it before CachedResponseViewsetMixin; the validators are then cached next to
+    the response, so cache hits stay free of queries.
+    """
+    conditional_actions = ('list', 'retrieve')
+    conditional_fields = ('updated_at',)
+
+    def get_conditional_fields(self):
+        """
+        `conditional_fields` without the related timestamps of relations that are
+        not rendered, e.g. 'user__updated_at' when `?fields=` leaves out `user`.
+        """
+        is_requested_field = getattr(self, 'is_requested_field', None)
+        if is_requested_field is None:
+            return list(self.conditional_fields)
+        return [
+            f for f in self.conditional_fields
+            if LOOKUP_SEP not in f or is_requested_field(f.split(LOOKUP_SEP, 1)[0])
+        ]
+
+    def get_conditional_values(self):
+        """
+        Values identifying the current state of the response, or None when the
+        response must be built normally (e.g. a 404).
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = self.get_conditional_fields()
+
+        if self.action == 'list':
+            return self.get_list_conditional_values(queryset, fields)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            return queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).values_list(*fields).first()
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def get_list_conditional_values(self, queryset, fields):
+        # Exports of StreamingExportViewsetMixin are not paginated
+        is_export_request = getattr(self, 'is_export_request', None)
+        page = None if is_export_request and is_export_request(self.request) else self.paginate_queryset(queryset)
+        # Served by the next paginate_queryset() call when the response is built
+        self.conditional_page = page
+        if page is None:
+            aggregates = {f'max_{i}': Max(f) for i, f in enumerate(fields)}
+            values = queryset.aggregate(count=Count('pk'), **aggregates)
+            return [values[f'max_{i}'] for i in range(len(fields))] + [values['count']]
+
+        pagination = self.get_paginated_response([]).data
+        rows = queryset.filter(pk__in=[obj.pk for obj in page]).order_by('pk').values_list('pk', *fields)
+        return [v for k, v in pagination.items() if k != 'results'] + [v for row in rows for v in row]
+
+    def paginate_queryset(self, queryset):
+        page, self.conditional_page = getattr(self, 'conditional_page', None), None
+        if page is not None:
+            return page
+        return super().paginate_queryset(queryset)
+
+    async def apaginate_queryset(self, queryset):
+        page, self.conditional_page = getattr(self, 'conditional_page', None), None
+        if page is not None:
+            return page
+        return await super().apaginate_queryset(queryset)
+
+    def get_conditional_validators(self, request):
+        get_cache_key = getattr(self, 'get_response_cache_key', None)
+        if get_cache_key is None:
+            return self.build_conditional_validators(request)
+
+        cache = caches[self.cache_alias]
+        key = get_cache_key(request, **self.kwargs) + ':validators'
+        validators = cache.get(key)
+        if validators is None:
+            validators = self.build_conditional_validators(request)
+            cache.set(key, validators, self.cache_timeout)
+        return validators
+
+    def build_conditional_validators(self, request):
+        values = self.get_conditional_values()
+        if values is None:
+            return None, None
+
+        timestamps = [v for v in values if hasattr(v, 'timestamp')]
+        last_modified = int(max(timestamps).timestamp()) if timestamps else None
+
+        raw_etag = repr((self.action, list(values), request.get_full_path(), request.accepted_media_type))
+        etag = 'W/' + quote_etag(hashlib.md5(raw_etag.encode('utf-8')).hexdigest())
+        return etag, last_modified
+
+    def set_conditional_headers(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self.get_conditional_validators(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return self.set_conditional_headers(not_modified, etag, last_modified)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            self.set_conditional_headers(response, etag, last_modified)
+        return response
+
+    async def aget_conditional_response(self, handler, request, *args, **kwargs):
+        """
+        get_conditional_response() for the async handlers of AsyncReadViewsetMixin.
+        """
+        if self.action not in self.conditional_actions:
+            return await handler(request, *args, **kwargs)
+
+        etag, last_modified = await sync_to_async(self.get_conditional_validators)(request)
+        if etag is None:
+            return await handler(request, *args, **kwargs)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return self.set_conditional_headers(not_modified, etag, last_modified)
+
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            self.set_conditional_headers(response, etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().retrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aget_conditional_response(super().alist, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aget_conditional_response(super().aretrieve, request, *args, **kwargs)
@@ -1,4 +1,8 @@
 class FieldRequestViewsetMixin:
+    # Maps a serializer field to the relations it renders, e.g. {'user': ('user',)}.
+    # Relations are only joined when the field is part of the response.
+    related_fields = dict()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.excluded_fields = list()
@@ -8,15 +12,45 @@ class FieldRequestViewsetMixin:
             return
         self.excluded_fields.append(field_name)
 
+    def get_requested_fields(self):
+        request = getattr(self, 'request', None)
+        fields = request.GET.get('fields', []) if request else []
+        if not fields:
+            return list()
+        return [f for f in set(fields.split(',')) if f not in self.excluded_fields]
+
+    def is_requested_field(self, field_name):
+        if field_name in self.excluded_fields:
+            return False
+
+        fields = self.get_requested_fields()
+        return not fields or field_name in fields
+
+    def get_related_fields(self):
+        """
+        Relations that must be joined to render the requested fields.
+        """
+        relations = list()
+        for field_name, field_relations in self.related_fields.items():
+            if self.is_requested_field(field_name):
+                relations.extend(r for r in field_relations if r not in relations)
+        return relations
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        relations = self.get_related_fields()
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset
+
     def get_serializer_context(self):
         """
         Extra context provided to the serializer class.
         """
         context = super().get_serializer_context()
-        fields = self.request.GET.get('fields', []) if self.request else []
+        fields = self.get_requested_fields()
         if fields:
-            cleaned_fields = [f for f in set(fields.split(',')) if f not in self.excluded_fields]
-            context.update({'fields': cleaned_fields})
+            context.update({'fields': fields})
 
         if self.excluded_fields:
             context.update({'excluded_fields': self.excluded_fields})
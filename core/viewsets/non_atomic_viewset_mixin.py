@@ -0,0 +1,38 @@
+from contextlib import ExitStack
+
+from django.db import connections, transaction
+
+
+class NonAtomicViewsetMixin:
+    """
+    Keeps `non_atomic_actions` out of the ATOMIC_REQUESTS transaction, for actions
+    that manage their own transactions (e.g. chunked batch operations) or only read.
+    Django decides per route: a route with such an action is left out entirely, and
+    its other actions open the request transaction themselves.
+    """
+    non_atomic_actions = tuple()
+
+    @classmethod
+    def get_non_atomic_requests(cls, actions):
+        if actions and set(actions.values()) & set(cls.non_atomic_actions):
+            return set(connections)
+        return set()
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        non_atomic_requests = cls.get_non_atomic_requests(actions)
+        if non_atomic_requests:
+            view._non_atomic_requests = non_atomic_requests
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        if action in self.non_atomic_actions or not self.get_non_atomic_requests(self.action_map):
+            return super().dispatch(request, *args, **kwargs)
+
+        with ExitStack() as stack:
+            for alias, settings_dict in connections.settings.items():
+                if settings_dict['ATOMIC_REQUESTS']:
+                    stack.enter_context(transaction.atomic(using=alias))
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,31 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from core.db.routers import end_replica_reads, is_pinned_to_primary, pin_to_primary, use_replica
+
+
+class ReplicaReadViewsetMixin:
+    """
+    Reads `replica_actions` from a replica (see core.db.routers) once the user is
+    authenticated, unless they wrote recently. Successful writes of the viewset pin their
+    user to the primary. Authentication and streamed contents read from the primary.
+    """
+    replica_actions = ('list', 'retrieve')
+
+    def dispatch(self, request, *args, **kwargs):
+        # The replica reads end with the request even when it raises, finalize_response()
+        # being skipped then, not to send the reads of the next request of the thread to it
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            end_replica_reads()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_actions and not is_pinned_to_primary(request.user):
+            use_replica()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        end_replica_reads()
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,70 @@
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+
+from core.renderers import CSVRenderer, NDJSONRenderer
+
+
+class StreamingExportViewsetMixin:
+    """
+    Streams the whole filtered `list`, unpaginated, when the client asks for an export
+    format (`Accept: application/x-ndjson` or `text/csv`, or `?format=ndjson|csv`).
+
+    Rows are read with QuerySet.iterator(), i.e. a server-side cursor on Postgres,
+    and serialized one by one while the response is sent, so memory stays flat
+    whatever the size of the export.
+    """
+    export_renderer_classes = (NDJSONRenderer, CSVRenderer)
+    export_chunk_size = 2000
+    # Rendered rows are sent in blocks of about this many bytes
+    export_buffer_size = 64 * 1024
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if getattr(self, 'action', None) == 'list':
+            renderers += [renderer() for renderer in self.export_renderer_classes]
+        return renderers
+
+    def is_export_request(self, request):
+        return isinstance(getattr(request, 'accepted_renderer', None), self.export_renderer_classes)
+
+    def get_export_filename(self, renderer):
+        return f'{self.basename}.{renderer.format}'
+
+    def iter_export_rows(self, queryset):
+        serializer = self.get_serializer()
+        for instance in queryset.iterator(chunk_size=self.export_chunk_size):
+            yield serializer.to_representation(instance)
+
+    def iter_export_content(self, rows, renderer):
+        buffer = list()
+        size = 0
+        for chunk in renderer.render_rows(rows):
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= self.export_buffer_size:
+                yield b''.join(buffer)
+                buffer, size = list(), 0
+
+        if buffer:
+            yield b''.join(buffer)
+
+    def get_export_response(self, request):
+        # Nothing is read until the response is sent, after the request transaction
+        # is over, so the cursor is held by Postgres for the whole export
+        queryset = self.filter_queryset(self.get_queryset())
+        renderer = request.accepted_renderer
+        content = self.iter_export_content(self.iter_export_rows(queryset), renderer)
+
+        response = StreamingHttpResponse(content, content_type=f'{renderer.media_type}; charset={renderer.charset}')
+        response['Content-Disposition'] = f'attachment; filename="{self.get_export_filename(renderer)}"'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_export_request(request):
+            return super().list(request, *args, **kwargs)
+        return self.get_export_response(request)
+
+    async def alist(self, request, *args, **kwargs):
+        if not self.is_export_request(request):
+            return await super().alist(request, *args, **kwargs)
+        return await sync_to_async(self.get_export_response)(request)
@@ -0,0 +1,18 @@
+"""
+ASGI config for project project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+ASYNC_READ_VIEWS=true serves the read endpoints with async views, an experimental path
+that is off by default (see core.viewsets.AsyncReadViewsetMixin).
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
+"""
+
+import os
+
+from core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+application = get_asgi_application()
@@ -12,19 +12,13 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 
 import base64
 import binascii
-import io
 import json
 import os
+import tempfile
 from pathlib import Path
 
-import environ
-import google.auth
 from decouple import config, Csv
 from django.utils.translation import gettext_lazy as _
-from google.api_core.exceptions import PermissionDenied
-from google.auth.exceptions import DefaultCredentialsError
-from google.cloud import secretmanager
-from google.oauth2 import service_account
 
 from apps.modules.manifest import get_modules
 
@@ -32,10 +26,24 @@ from apps.modules.manifest import get_modules
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# ================================================= SECRETS ============================================================
+# Fills the environment variables not set with the SETTINGS_NAME secret of Google Cloud Secret Manager, cached on disk
+# for SECRET_MANAGER_CACHE_TTL seconds (0 disables the cache). The cache is only read when owned by the current user and
+# private to them. Off by default, on in the release image: looking up the credentials probes the metadata server,
+# which hangs every process start on hosts outside of GCP.
+SETTINGS_NAME = config("SETTINGS_NAME", "django_settings")
+if config("SECRET_MANAGER", cast=bool, default=False):
+    from core.secret_manager import load_secret_settings
+
+    load_secret_settings(
+        SETTINGS_NAME,
+        cache_path=config("SECRET_MANAGER_CACHE_PATH", os.path.join(tempfile.gettempdir(), f"{SETTINGS_NAME}.env")),
+        cache_ttl=config("SECRET_MANAGER_CACHE_TTL", cast=int, default=300),
+    )
+
 # ============================================= APPLICATION SECURITY ===================================================
 # SECURITY WARNING: keep the secret key used in production secret!
 DEBUG = config("DEBUG", cast=bool)
-SETTINGS_NAME = config("SETTINGS_NAME", "django_settings")
 ALLOWED_HOSTS = config("ALLOWED_HOSTS", cast=Csv())
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -98,6 +106,7 @@ THIRD_PARTY_APPS = [
     'drf_spectacular',
 ]
 LOCAL_APPS = [
+    'core',
     'apps.users',
     'apps.applications',
 ]
@@ -108,6 +117,7 @@ INSTALLED_APPS = THIRD_PARTY_APPS + DJANGO_APPS + LOCAL_APPS + MODULES_APPS
 
 # ============================================== WEB APPLICATION =======================================================
 MIDDLEWARE = [
+    'core.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -119,10 +129,35 @@ MIDDLEWARE = [
 
 MIDDLEWARE += ['whitenoise.middleware.WhiteNoiseMiddleware']
 
+# Queries, cache calls, serializing and rendering time of each request, see core.metrics. Reported in a Server-Timing
+# header and at /metrics, where the workers' metrics add up in Redis once flushed, every METRICS_FLUSH_INTERVAL seconds.
+# The header tells any client about the queries of its request, so it is only sent in DEBUG by default. /metrics is
+# only served to requests with a "Bearer METRICS_TOKEN" Authorization header or from METRICS_ALLOWED_IPS.
+METRICS_SERVER_TIMING = config('METRICS_SERVER_TIMING', cast=bool, default=DEBUG)
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', cast=int, default=10)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', cast=Csv(), default='')
+
 SITE_ID = 1
 
 ROOT_URLCONF = 'project.urls'
 WSGI_APPLICATION = 'project.wsgi.application'
+ASGI_APPLICATION = 'project.asgi.application'
+# Experimental: serves the read endpoints with async views, see core.viewsets.AsyncReadViewsetMixin.
+# Slower than the sync views under Django 4.1, benchmark it (make bench_asgi) before turning it on.
+# Turn it on when running under ASGI only: WSGI servers would run an event loop per request.
+ASYNC_READ_VIEWS = config('ASYNC_READ_VIEWS', cast=bool, default=False)
+
+# manage.py serve, see core.prefork.PreforkServer. 0 workers starts one per available CPU.
+SERVER_WORKERS = config('SERVER_WORKERS', cast=int, default=0)
+SERVER_THREADS = config('SERVER_THREADS', cast=int, default=4)
+# Workers are replaced after serving MAX_REQUESTS (plus up to JITTER, so they do not all restart
+# together) or once their resident memory exceeds MAX_MEMORY megabytes. 0 disables either limit.
+SERVER_MAX_REQUESTS = config('SERVER_MAX_REQUESTS', cast=int, default=10000)
+SERVER_MAX_REQUESTS_JITTER = config('SERVER_MAX_REQUESTS_JITTER', cast=int, default=1000)
+SERVER_MAX_MEMORY = config('SERVER_MAX_MEMORY', cast=int, default=512)
+# Seconds given to the workers to finish their requests on shutdown or recycling
+SERVER_GRACEFUL_TIMEOUT = config('SERVER_GRACEFUL_TIMEOUT', cast=int, default=30)
 
 TEMPLATES = [
     {
@@ -172,18 +207,39 @@ CSRF_COOKIE_SECURE = DEBUG is False
 SECURE_HSTS_PRELOAD = DEBUG is False
 
 # ================================================= DATABASES ==========================================================
+# Connections come from a pool of each process, see core.db.backends.postgresql_pool. A request waits up to
+# DB_POOL_TIMEOUT seconds for one once DB_POOL_MAX_SIZE are in use; a max size of 0 disables the pool.
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "core.db.backends.postgresql_pool",
         "HOST": config("DB_DEFAULT_HOST", "postgres"),
         "NAME": config("DB_DEFAULT_NAME", "db"),
         "USER": config("DB_DEFAULT_USER", "postgres"),
         "PASSWORD": config("DB_DEFAULT_PWD", "postgres"),
         "PORT": config("DB_DEFAULT_PORT", cast=int, default=5432),
         "ATOMIC_REQUESTS": True,
+        "POOL": {
+            "MAX_SIZE": config("DB_POOL_MAX_SIZE", cast=int, default=10),
+            "TIMEOUT": config("DB_POOL_TIMEOUT", cast=int, default=10),
+            "MAX_LIFETIME": config("DB_POOL_MAX_LIFETIME", cast=int, default=3600),
+            "CHECK_DELAY": config("DB_POOL_CHECK_DELAY", cast=int, default=30),
+        },
     },
 }
 
+# Read replicas of the default database, same credentials, see core.db.routers.
+# A user who wrote reads from the primary for DATABASE_REPLICA_PIN_SECONDS, to see their writes despite the lag.
+for index, host in enumerate(config("DB_REPLICA_HOSTS", cast=Csv(), default="")):
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "ATOMIC_REQUESTS": False,
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith("replica_")]
+DATABASE_REPLICA_PIN_SECONDS = config("DB_REPLICA_PIN_SECONDS", cast=int, default=5)
+DATABASE_ROUTERS = ["core.db.routers.ReplicaRouter"]
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -301,11 +357,15 @@ CACHES = {
         'BACKEND': 'django_redis.cache.RedisCache',
         'LOCATION': REDIS_URL,
         'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient'
+            # Times the cache calls of the requests
+            'CLIENT_CLASS': 'core.metrics.cache.TimedClient',
+            # Cache is an optimization: requests keep working (uncached) when Redis is down
+            'IGNORE_EXCEPTIONS': True,
         },
         'KEY_PREFIX': 'django_orm'
     }
 }
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
 
 # =========================================================== AWS ======================================================
 # AWS S3 config
@@ -374,22 +434,10 @@ def google_service_account_config():
 
 
 # ========================================================= GOOGLE =====================================================
-try:
-    # Pull secrets from Secret Manager
-    _, project = google.auth.default()
-    client = secretmanager.SecretManagerServiceClient()
-    name = client.secret_version_path(project, SETTINGS_NAME, "latest")
-    payload = client.access_secret_version(name=name).payload.data.decode("UTF-8")
-    config(io.StringIO(payload))
-
-    env = environ.Env()
-    env.read_env(io.StringIO(payload))
-
-except (DefaultCredentialsError, PermissionDenied):
-    pass
-
 GOOGLE_SERVICE_ACCOUNT_CONFIG = google_service_account_config()
 if GOOGLE_SERVICE_ACCOUNT_CONFIG:
+    from google.oauth2 import service_account
+
     GS_CREDENTIALS = service_account.Credentials.from_service_account_info(GOOGLE_SERVICE_ACCOUNT_CONFIG)
 GS_BUCKET_NAME = config("GS_BUCKET_NAME", "")
 if GS_BUCKET_NAME:
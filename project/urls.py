@@ -18,6 +18,8 @@ from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import path, include
 from drf_spectacular.views import SpectacularJSONAPIView, SpectacularSwaggerView
 
+from core.metrics.views import metrics_view
+
 admin.site.site_header = "Sample App - Crowdbotic"
 admin.site.site_title = "Sample App - Crowdbotic Admin Portal"
 admin.site.index_title = "Sample App - Crowdbotic Admin"
@@ -48,6 +50,7 @@ schema_url_patterns = [
 util_urls = [
     path('i18n/', include('django.conf.urls.i18n')),
     path('health/', include('health_check.urls')),
+    path('metrics/', metrics_view, name='metrics'),
 ]
 
 urlpatterns = admin_urls + account_urls + module_urls + schema_url_patterns + util_urls